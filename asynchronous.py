@@ -0,0 +1,123 @@
+"""
+Analysis of a dependency tree through coroutine based callbacks. This module requires Python 3.7+, and is only
+imported by DependencyWrangler.analyse_async.
+"""
+import asyncio
+import inspect
+
+from instrumentation import _clock
+
+
+async def _resolve(value):
+    """
+    Awaits the value returned by a callback, if it is awaitable
+    :param value: (object) the value returned by a callback
+    :return: (object) the resolved value
+    """
+    if inspect.isawaitable(value):
+        return await value
+    return value
+
+
+class _AsyncQuery(object):
+    """
+    The _AsyncQuery class calls the callbacks of a DependencyWrangler on single objects, limiting the amount of calls
+    that are awaited simultaneously
+    """
+
+    def __init__(self, wrangler, concurrency=None):
+        """
+        Initialize the _AsyncQuery class with the wrangler whose callbacks will be called
+        :param wrangler: (DependencyWrangler) the wrangler to query the objects for
+        :param concurrency: (int) the maximum amount of calls to await simultaneously, or None for no limit
+        """
+        super(_AsyncQuery, self).__init__()
+
+        self._wrangler = wrangler
+        self._semaphore = asyncio.Semaphore(concurrency) if concurrency else None
+
+    async def _call(self, name, callback, batch_callback, attribute, item):
+        """
+        Calls the callback on the object, falling back to a single object batch, or the attribute on the object. The
+        time spent awaiting the callback is recorded when the instrumentation of the wrangler has been enabled, which
+        excludes the time spent waiting for the semaphore
+        """
+        if not callback and not batch_callback:
+            return getattr(item, attribute)
+        stats = self._wrangler.stats
+        if self._semaphore is None:
+            start = _clock()
+            value = await _resolve(callback(item) if callback else batch_callback([item]))
+        else:
+            async with self._semaphore:
+                start = _clock()
+                value = await _resolve(callback(item) if callback else batch_callback([item]))
+        if stats is not None:
+            stats.record_callback(name if callback else name + '_batch', _clock() - start)
+        return value if callback else value[0]
+
+    def identifier(self, item):
+        wrangler = self._wrangler
+        return self._call('identifier', wrangler.object_identifier_callback,
+                          wrangler.object_identifier_batch_callback, wrangler.object_identifier_attribute, item)
+
+    def type(self, item):
+        wrangler = self._wrangler
+        return self._call('type', wrangler.object_type_callback, wrangler.object_type_batch_callback,
+                          wrangler.object_type_attribute, item)
+
+    async def upstream(self, item):
+        wrangler = self._wrangler
+        return list(await self._call('upstream', wrangler.object_upstream_callback,
+                                     wrangler.object_upstream_batch_callback, None, item))
+
+    async def downstream(self, item):
+        wrangler = self._wrangler
+        return list(await self._call('downstream', wrangler.object_downstream_callback,
+                                     wrangler.object_downstream_batch_callback, None, item))
+
+
+async def analyse_async(wrangler, item, concurrency=None):
+    """
+    Analyse & constructs the dependency tree from a specified object through callbacks that may be coroutine
+    functions. The tree is queried a level at a time, awaiting the callbacks of all objects within a level
+    concurrently, after which the wrangler defines the items in the same order as *analyse* would have.
+    :param wrangler: (DependencyWrangler) the wrangler to analyse the tree with
+    :param item: (object) the object to analyse the tree from
+    :param concurrency: (int) the maximum amount of callbacks to await simultaneously, or None for no limit
+    :return: (DependencyItem) returns a DependencyItem object that represents the item specified
+    """
+    wrangler.validate()
+    query = _AsyncQuery(wrangler, concurrency)
+
+    async def identify(items):
+        values = await asyncio.gather(*(
+            [query.identifier(dependency) for dependency in items] + [query.type(dependency) for dependency in items]
+        ))
+        return values[:len(items)], values[len(items):]
+
+    # The connections of every object that hasn't been processed yet, keyed by its unique identifier
+    records = dict()
+    items = [item]
+    item_identifiers, item_types = await identify(items)
+    root_identifier = item_identifiers[0]
+    while items:
+        frontier = list()
+        for dependency, item_identifier, item_type in zip(items, item_identifiers, item_types):
+            if item_identifier not in wrangler.items and item_identifier not in records:
+                records[item_identifier] = [dependency, item_type, None, None]
+                frontier.append(item_identifier)
+        if not frontier:
+            break
+        connections = await asyncio.gather(*(
+            [query.upstream(records[item_identifier][0]) for item_identifier in frontier] +
+            [query.downstream(records[item_identifier][0]) for item_identifier in frontier]
+        ))
+        items = [dependency for dependencies in connections for dependency in dependencies]
+        item_identifiers, item_types = await identify(items)
+        offset = 0
+        for index, dependencies in enumerate(connections):
+            record = records[frontier[index % len(frontier)]]
+            record[2 if index < len(frontier) else 3] = item_identifiers[offset:offset + len(dependencies)]
+            offset += len(dependencies)
+    return wrangler._define_records(root_identifier, records)
@@ -0,0 +1,86 @@
+"""
+Compares analysing the upstream dependencies of many ROPs that share most of their upstream tree by calling *analyse*
+on each of them in turn, and by a single call to *analyse_many*.
+
+Run from the root of the repository with:
+    python benchmarks/benchmark_many.py
+"""
+import gc
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from generators import BenchmarkObject, connect
+from wrangler import DependencyWrangler
+
+
+def build_scene(shared, rops):
+    """
+    Builds a chain of *shared* objects, with every fifth object being a Merge, and *rops* ROPs that each depend on a
+    different object along the chain, returning the ROPs
+    """
+    chain = [BenchmarkObject("Node{0}".format(i), "Merge" if i % 5 == 0 else "Basic") for i in range(shared)]
+    for upstream_object, downstream_object in zip(chain[1:], chain):
+        connect(upstream_object, downstream_object)
+    roots = list()
+    for i in range(rops):
+        rop = BenchmarkObject("Rop{0}".format(i), "Rop")
+        connect(chain[i * shared // rops], rop)
+        roots.append(rop)
+    return roots
+
+
+def create_wrangler():
+    return DependencyWrangler(
+        object_class=BenchmarkObject,
+        object_upstream_callback=lambda x: x.upstream,
+        object_downstream_callback=lambda x: x.downstream,
+        object_identifier_attribute="id",
+        object_type_attribute="type",
+        bypass_types=["Merge"]
+    )
+
+
+def summarize(wrangler):
+    return dict(
+        (key, ([x.id for x in value.upstream_dependencies], [x.id for x in value.downstream_dependencies]))
+        for key, value in wrangler.items.items()
+    )
+
+
+def run_loop(roots, **kwargs):
+    wrangler = create_wrangler()
+    for root in roots:
+        wrangler.analyse(root, **kwargs)
+    return wrangler
+
+
+def run_many(roots, **kwargs):
+    wrangler = create_wrangler()
+    wrangler.analyse_many(roots, **kwargs)
+    return wrangler
+
+
+if __name__ == "__main__":
+    for shared, rops in ((2000, 10), (2000, 50), (10000, 50)):
+        roots = build_scene(shared, rops)
+        for name, kwargs in (("both", {}), ("upstream", {"direction": "upstream"})):
+            timings = list()
+            results = list()
+            for function in (run_loop, run_many):
+                # Take the best of a few runs, collecting the trees of earlier runs outside of the timings
+                best = None
+                for _ in range(3):
+                    gc.collect()
+                    start = time.time()
+                    wrangler = function(roots, **kwargs)
+                    timing = time.time() - start
+                    best = timing if best is None else min(best, timing)
+                timings.append(best)
+                results.append(summarize(wrangler))
+            assert results[0] == results[1], "analyse_many built a different tree than analyse"
+            print("{0:>6} shared {1:>3} ROPs {2:<9} analyse {3:>9.4f}s  analyse_many {4:>9.4f}s {5:>8.2f}x".format(
+                shared, rops, name, timings[0], timings[1], timings[0] / timings[1]
+            ))
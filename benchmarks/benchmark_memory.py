@@ -0,0 +1,110 @@
+"""
+Compares the memory use and throughput of the DependencyItem class against the original, __dict__ based class, and
+against the array backed CompactDependencyGraph.
+
+Run from the root of the repository with:
+    python benchmarks/benchmark_memory.py
+"""
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from compact import CompactDependencyGraph
+from item import DependencyItem
+
+
+class DictDependencyItem(object):
+    """
+    The original DependencyItem, which holds its attributes within a __dict__
+    """
+    def __init__(self, id, type, item, bypass=False):
+        self.id = id
+        self.type = type
+        self.object = item
+        self.bypass = bypass
+        self._upstream_dependencies = list()
+        self._downstream_dependencies = list()
+
+    @property
+    def upstream_dependencies(self):
+        return self._upstream_dependencies
+
+    @property
+    def downstream_dependencies(self):
+        return self._downstream_dependencies
+
+    def append_upstream_dependency(self, item):
+        self._upstream_dependencies.append(item)
+
+    def append_downstream_dependency(self, item):
+        self._downstream_dependencies.append(item)
+
+
+class Tree(object):
+    """
+    A stand-in for an analysed DependencyWrangler, holding a chain of items where every item also depends on the item
+    two places upstream of it
+    """
+    def __init__(self, item_class, size):
+        self.items = dict()
+        processed_items = [item_class("Item{0}".format(i), "Basic", None) for i in range(size)]
+        for i, processed_item in enumerate(processed_items):
+            for j in (i + 1, i + 2):
+                if j < size:
+                    processed_item.append_upstream_dependency(processed_items[j])
+                    processed_items[j].append_downstream_dependency(processed_item)
+            self.items[processed_item.id] = processed_item
+
+
+def walk(items):
+    """
+    Touches every dependency of every item, as formatting the tree would
+    """
+    total = 0
+    for _, value in items.items():
+        total += len(value.upstream_dependencies) + len(value.downstream_dependencies)
+    return total
+
+
+def walk_indices(graph):
+    """
+    Touches every dependency of every item through the indices of a CompactDependencyGraph, without creating views
+    """
+    total = 0
+    for index in range(len(graph)):
+        total += len(graph.upstream_indices(index)) + len(graph.downstream_indices(index))
+    return total
+
+
+def measure(name, build, size, walk_function=walk):
+    # Items reference each other, so collect the garbage of the previous measurement before starting
+    gc.collect()
+    start = time.time()
+    items = build(size)
+    build_time = time.time() - start
+    start = time.time()
+    walk_function(items)
+    walk_time = time.time() - start
+    del items
+    gc.collect()
+    tracemalloc.start()
+    items = build(size)
+    gc.collect()
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print("{0:<28} {1:>8} items {2:>10.1f}MB {3:>8.3f}s build {4:>8.3f}s walk".format(
+        name, size, memory / 1024.0 / 1024.0, build_time, walk_time
+    ))
+
+
+if __name__ == "__main__":
+    for size in (100000, 300000):
+        measure("__dict__ DependencyItem", lambda n: Tree(DictDependencyItem, n).items, size)
+        measure("__slots__ DependencyItem", lambda n: Tree(DependencyItem, n).items, size)
+        # The compact graph is measured without the DependencyItem objects it has been created from
+        measure("CompactDependencyGraph", lambda n: CompactDependencyGraph.from_wrangler(Tree(DependencyItem, n)),
+                size, walk_indices)
@@ -0,0 +1,84 @@
+"""
+Compares the analysis of a tree through slow, latency bound callbacks when analysed serially and when analysed in
+parallel with a varying amount of workers.
+
+Run from the root of the repository with:
+    python benchmarks/benchmark_parallel.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from generators import BenchmarkObject, connect
+from wrangler import DependencyWrangler
+
+# The simulated round-trip to a remote scene server for every call
+LATENCY = 0.001
+
+
+def build_tree(depth, branching):
+    """
+    Builds a tree where every object has *branching* objects directly upstream of it, returning the most downstream
+    object
+    """
+    root = BenchmarkObject("0")
+    level = [root]
+    for _ in range(depth):
+        next_level = list()
+        for item in level:
+            for i in range(branching):
+                dependency = BenchmarkObject("{0}.{1}".format(item.id, i), "Merge" if i == 0 else "Basic")
+                connect(dependency, item)
+                next_level.append(dependency)
+        level = next_level
+    return root
+
+
+def slow_upstream(item):
+    time.sleep(LATENCY)
+    return item.upstream
+
+
+def slow_downstream(item):
+    time.sleep(LATENCY)
+    return item.downstream
+
+
+def create_wrangler(max_workers):
+    return DependencyWrangler(
+        object_class=BenchmarkObject,
+        object_upstream_callback=slow_upstream,
+        object_downstream_callback=slow_downstream,
+        object_identifier_attribute="id",
+        object_type_attribute="type",
+        bypass_types=["Merge"],
+        max_workers=max_workers
+    )
+
+
+def summarize(wrangler):
+    return [
+        (key, [x.id for x in value.upstream_dependencies], [x.id for x in value.downstream_dependencies])
+        for key, value in wrangler.items.items()
+    ]
+
+
+if __name__ == "__main__":
+    root = build_tree(depth=4, branching=5)
+    baseline = None
+    results = list()
+    for max_workers in (None, 1, 4, 16, 64):
+        wrangler = create_wrangler(max_workers)
+        start = time.time()
+        wrangler.analyse(root)
+        timing = time.time() - start
+        baseline = baseline or timing
+        print("{0:<20} {1:>6} objects {2:>10.4f}s {3:>8.2f}x".format(
+            "serial" if max_workers is None else "{0} workers".format(max_workers),
+            len(wrangler.analysed_objects), timing, baseline / timing
+        ))
+        if max_workers is not None:
+            results.append(summarize(wrangler))
+    assert all(result == results[0] for result in results), "The parallel results differ between worker counts"
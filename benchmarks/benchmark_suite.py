@@ -0,0 +1,165 @@
+"""
+Measures how the analysis scales across synthetic graphs of different shapes & sizes. For every graph, the time taken
+by *analyse* and by formatting all of *available_objects* is measured, along with the peak memory of both.
+The results are stored in benchmarks/results/<commit>.json, so that the results of two commits can be compared, where
+the comparison exits with a non-zero status when any result has regressed.
+
+Run from the root of the repository with:
+    python benchmarks/benchmark_suite.py
+    python benchmarks/benchmark_suite.py --sizes 1000 10000 100000 1000000 --graphs chain merge_heavy
+    python benchmarks/benchmark_suite.py --compare <commit>
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from generators import GENERATORS, BenchmarkObject, downstream_dependencies, upstream_dependencies
+from wrangler import DependencyWrangler
+
+RESULTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+# Relative slowdowns beyond this are reported as regressions when comparing two commits, by default
+THRESHOLD = 1.1
+
+
+def create_wrangler():
+    return DependencyWrangler(
+        object_class=BenchmarkObject,
+        object_upstream_callback=upstream_dependencies,
+        object_downstream_callback=downstream_dependencies,
+        object_identifier_attribute="id",
+        object_type_attribute="type",
+        bypass_types=["Merge"]
+    )
+
+
+def current_commit(commit=None):
+    """
+    Names a commit the way its results are stored, which is HEAD, including whether it has local changes, by default
+    """
+    arguments = ['git', 'describe', '--always'] + (['--dirty'] if commit is None else [commit])
+    try:
+        return subprocess.check_output(arguments, cwd=ROOT, stderr=subprocess.STDOUT).decode('utf-8').strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown' if commit is None else commit
+
+
+def results_path(commit):
+    """
+    Finds the results stored for a commit, given either the name the results were stored under, or any revision git
+    can resolve, such as a full SHA
+    """
+    path = os.path.join(RESULTS, '{0}.json'.format(commit))
+    if not os.path.exists(path):
+        path = os.path.join(RESULTS, '{0}.json'.format(current_commit(commit)))
+    return path
+
+
+def measure(generator, size, repeat, memory):
+    """
+    Analyses the graph created by the generator, returning the best timings of a few runs and the peak memory
+    """
+    root, objects = GENERATORS[generator](size)
+    analyse_timings = list()
+    available_timings = list()
+    for _ in range(repeat):
+        wrangler = create_wrangler()
+        gc.collect()
+        start = time.perf_counter()
+        wrangler.analyse(root)
+        analyse_timings.append(time.perf_counter() - start)
+        # The available objects are only formatted once they are accessed, so time formatting all of them
+        start = time.perf_counter()
+        wrangler.available_objects.to_dict()
+        available_timings.append(time.perf_counter() - start)
+        assert len(wrangler.items) == len(objects), "Not all objects of the {0} graph were analysed".format(generator)
+        del wrangler
+    result = {
+        'generator': generator,
+        'size': size,
+        'analyse': min(analyse_timings),
+        'available_objects': min(available_timings)
+    }
+    if memory:
+        # Memory is measured in a separate run, as tracing the allocations slows the analysis down considerably
+        gc.collect()
+        tracemalloc.start()
+        wrangler = create_wrangler()
+        wrangler.analyse(root)
+        wrangler.available_objects.to_dict()
+        result['peak_memory'] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result
+
+
+def compare(results, baseline_commit, threshold=THRESHOLD):
+    """
+    Prints the relative change of every result against the results stored for another commit, returning the amount
+    of results that have regressed by more than the threshold
+    """
+    with open(results_path(baseline_commit)) as results_file:
+        baseline = json.load(results_file)
+    baseline_results = dict(((x['generator'], x['size']), x) for x in baseline['results'])
+    regressions = 0
+    for result in results:
+        previous = baseline_results.get((result['generator'], result['size']))
+        if previous is None:
+            continue
+        changes = list()
+        for key in ('analyse', 'available_objects', 'peak_memory'):
+            if key in result and previous.get(key):
+                ratio = float(result[key]) / previous[key]
+                regressions += ratio > threshold
+                changes.append("{0} {1:>6.2f}x{2}".format(key, ratio, " !" if ratio > threshold else "  "))
+        print("{0:<12} {1:>8}  {2}".format(result['generator'], result['size'], "  ".join(changes)))
+    print("{0} regression(s) against {1}".format(regressions, baseline_commit))
+    return regressions
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--graphs', nargs='+', choices=sorted(GENERATORS), default=sorted(GENERATORS))
+    parser.add_argument('--sizes', nargs='+', type=int, default=[1000, 10000, 100000])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--no-memory', dest='memory', action='store_false', help="skip measuring the peak memory")
+    parser.add_argument('--commit', default=None, help="the name to store the results under, HEAD by default")
+    parser.add_argument('--compare', default=None, help="a commit to compare the results against")
+    parser.add_argument('--threshold', type=float, default=THRESHOLD, help="the ratio reported as a regression")
+    arguments = parser.parse_args(arguments)
+
+    results = list()
+    for generator in arguments.graphs:
+        for size in arguments.sizes:
+            result = measure(generator, size, arguments.repeat, arguments.memory)
+            results.append(result)
+            print("{0:<12} {1:>8} analyse {2:>9.4f}s  available_objects {3:>9.4f}s  peak {4}".format(
+                generator, size, result['analyse'], result['available_objects'],
+                "{0:.1f}MiB".format(result['peak_memory'] / 1048576.0) if 'peak_memory' in result else "-"
+            ))
+
+    commit = arguments.commit or current_commit()
+    if not os.path.isdir(RESULTS):
+        os.makedirs(RESULTS)
+    with open(os.path.join(RESULTS, '{0}.json'.format(commit)), 'w') as results_file:
+        json.dump({
+            'commit': commit,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'results': results
+        }, results_file, indent=2)
+    if arguments.compare:
+        return 1 if compare(results, arguments.compare, arguments.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
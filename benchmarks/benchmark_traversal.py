@@ -0,0 +1,157 @@
+"""
+Compares the stack based traversal of DependencyWrangler.analyse against the original recursive implementation, on
+both deep chains and wide fan-outs. The tree built by the current implementation is checked against the expected
+collapse of the bypassed items for every graph, and against the tree of the recursive implementation for the graphs
+without bypassed items, where both implementations build the same tree.
+
+Run from the root of the repository with:
+    python benchmarks/benchmark_traversal.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from generators import BenchmarkObject, connect
+from wrangler import DependencyWrangler
+
+
+def build_chain(size, bypass_every=0):
+    """
+    Builds a single chain of objects, returning the most downstream object
+    """
+    objects = [
+        BenchmarkObject(i, "Merge" if bypass_every and i % bypass_every == 0 else "Basic")
+        for i in range(size)
+    ]
+    for i in range(1, size):
+        connect(objects[i], objects[i - 1])
+    return objects[0]
+
+
+def build_fan_out(size):
+    """
+    Builds a single object that has *size* objects directly upstream of it
+    """
+    root = BenchmarkObject("root")
+    for i in range(size):
+        connect(BenchmarkObject(i), root)
+    return root
+
+
+class RecursiveDependencyWrangler(DependencyWrangler):
+    """
+    The original, recursive implementation of DependencyWrangler.analyse, kept as a reference point. Bypassed items
+    are collapsed whilst the tree is being walked, so the collapsed dependencies can differ from those of the current
+    implementation
+    """
+    def _link_dependency(self, processed_item, dependency_item, append_dependency):
+        if dependency_item.type in self._bypass_types:
+            for sub_dependency in dependency_item.upstream_dependencies:
+                append_dependency(sub_dependency)
+        else:
+            append_dependency(dependency_item)
+
+    def analyse(self, item):
+        self.validate()
+        item_identifier, item_type = self._identify(item)
+        if item_identifier not in self.analysed_objects:
+            processed_item = self._define_item(item_identifier, item_type, item)
+            for dependency in self.object_upstream_callback(item):
+                self._link_dependency(
+                    processed_item, self.analyse(dependency), processed_item.append_upstream_dependency
+                )
+            for dependency in self.object_downstream_callback(item):
+                self._link_dependency(
+                    processed_item, self.analyse(dependency), processed_item.append_downstream_dependency
+                )
+        return self.items[item_identifier]
+
+
+def create_wrangler(wrangler_class, required_types=None):
+    return wrangler_class(
+        object_class=BenchmarkObject,
+        object_upstream_callback=lambda item: item.upstream,
+        object_downstream_callback=lambda item: item.downstream,
+        object_identifier_attribute="id",
+        object_type_attribute="type",
+        bypass_types=None if required_types else ["Merge"],
+        required_types=required_types
+    )
+
+
+def summarize(wrangler):
+    return [
+        (key, value.bypass,
+         [x.id for x in value.upstream_dependencies],
+         [x.id for x in value.downstream_dependencies])
+        for key, value in wrangler.items.items()
+    ]
+
+
+def collapse(item, attribute, bypassed):
+    """
+    Lists the unique identifiers of the nearest objects in one direction that are not being bypassed, walking
+    through the bypassed objects along the same direction, in the order they are first reached
+    """
+    dependencies = list()
+    walked = {item.id}
+    stack = [iter(getattr(item, attribute))]
+    while stack:
+        dependency = next(stack[-1], None)
+        if dependency is None:
+            stack.pop()
+        elif not bypassed(dependency.type):
+            if dependency.id not in dependencies:
+                dependencies.append(dependency.id)
+        elif dependency.id not in walked:
+            walked.add(dependency.id)
+            stack.append(iter(getattr(dependency, attribute)))
+    return dependencies
+
+
+def expected(wrangler):
+    """
+    Summarizes the tree the wrangler is expected to have built, computed from the objects themselves
+    """
+    return [
+        (key, value.bypass,
+         collapse(value.object, 'upstream', wrangler._is_bypassed),
+         collapse(value.object, 'downstream', wrangler._is_bypassed))
+        for key, value in wrangler.items.items()
+    ]
+
+
+def benchmark(name, root, repeat=5, compare=True, required_types=None):
+    """
+    Times both implementations on the graph of the root object. The tree of the current implementation is always
+    checked against the expected tree, and against the tree of the recursive implementation when *compare* is True.
+    The recursive implementation collapsed bypassed items along the upstream side only, and dropped the items that
+    aren't required, so its trees only match for graphs without bypassed items
+    """
+    results = dict()
+    for wrangler_class in (RecursiveDependencyWrangler, DependencyWrangler):
+        wrangler = create_wrangler(wrangler_class, required_types)
+        wrangler.analyse(root)
+        results[wrangler_class.__name__] = summarize(wrangler)
+        timing = min(timeit.repeat(
+            lambda: create_wrangler(wrangler_class, required_types).analyse(root), number=1, repeat=repeat
+        ))
+        print("{0:<28} {1:<28} {2:>10.4f}s".format(name, wrangler_class.__name__, timing))
+    assert results["DependencyWrangler"] == expected(wrangler), \
+        "The collapsed dependencies differ from the expected ones for {0}".format(name)
+    if compare:
+        assert results["RecursiveDependencyWrangler"] == results["DependencyWrangler"], \
+            "The traversal results differ for {0}".format(name)
+
+
+if __name__ == "__main__":
+    # The recursive implementation needs roughly two frames per object within a chain
+    sys.setrecursionlimit(100000)
+    benchmark("chain (5,000)", build_chain(5000))
+    benchmark("chain (20,000)", build_chain(20000))
+    benchmark("bypassed chain (20,000)", build_chain(20000, bypass_every=3), compare=False)
+    benchmark("required chain (20,000)", build_chain(20000, bypass_every=3), compare=False, required_types=["Basic"])
+    benchmark("fan-out (20,000)", build_fan_out(20000))
+    benchmark("fan-out (100,000)", build_fan_out(100000))
@@ -0,0 +1,109 @@
+"""
+Generators of synthetic dependency graphs for the benchmarks. Every generator returns the object to analyse the graph
+from, and the list of all objects within the graph. Objects are connected in both directions, like the nodes of a
+scene would be, and the graphs are generated deterministically for a given seed.
+"""
+import random
+
+
+class BenchmarkObject(object):
+    __slots__ = ('id', 'type', 'upstream', 'downstream')
+
+    def __init__(self, _id, _type="Basic"):
+        self.id = _id
+        self.type = _type
+        self.upstream = []
+        self.downstream = []
+
+
+def upstream_dependencies(item):
+    return item.upstream
+
+
+def downstream_dependencies(item):
+    return item.downstream
+
+
+def connect(upstream_object, downstream_object):
+    downstream_object.upstream.append(upstream_object)
+    upstream_object.downstream.append(downstream_object)
+
+
+def chain(size):
+    """
+    A single chain of objects, where each object depends on the next one, analysed from the most downstream object
+    """
+    objects = [BenchmarkObject("Chain{0}".format(i)) for i in range(size)]
+    for i in range(size - 1):
+        connect(objects[i + 1], objects[i])
+    return objects[0], objects
+
+
+def fan_in(size):
+    """
+    A single object that depends directly on all other objects, such as a ROP merging every render layer
+    """
+    root = BenchmarkObject("FanInRoot", "Rop")
+    objects = [root]
+    for i in range(size - 1):
+        item = BenchmarkObject("FanIn{0}".format(i))
+        connect(item, root)
+        objects.append(item)
+    return root, objects
+
+
+def fan_out(size):
+    """
+    A single object that all other objects depend on directly, such as a shared cache read by every shot
+    """
+    root = BenchmarkObject("FanOutRoot", "Read")
+    objects = [root]
+    for i in range(size - 1):
+        item = BenchmarkObject("FanOut{0}".format(i))
+        connect(root, item)
+        objects.append(item)
+    return root, objects
+
+
+def random_dag(size, degree=3, seed=0, bypass_ratio=0.0, bypass_type="Merge"):
+    """
+    A random, connected and acyclic graph, where each object depends on between 1 and *degree* objects created
+    before it, analysed from the last object. A fraction of the objects is given the bypass type
+    :param size: (int) the amount of objects
+    :param degree: (int) the maximum amount of upstream dependencies of each object
+    :param seed: (int) the seed of the random generator
+    :param bypass_ratio: (float) the fraction of objects, between 0 and 1, that are given the bypass type
+    :param bypass_type: (str) the type of the objects to bypass
+    """
+    generator = random.Random(seed)
+    objects = list()
+    for i in range(size):
+        item = BenchmarkObject(
+            "Random{0}".format(i), bypass_type if i and generator.random() < bypass_ratio else "Basic"
+        )
+        if i:
+            # Always depend on an earlier object, so that the graph stays connected
+            dependencies = set([generator.randrange(i)])
+            for _ in range(generator.randrange(degree)):
+                dependencies.add(generator.randrange(i))
+            for dependency in sorted(dependencies):
+                connect(objects[dependency], item)
+        objects.append(item)
+    return objects[-1], objects
+
+
+def merge_heavy(size, bypass_ratio=0.5, seed=0):
+    """
+    A random graph where a large fraction of the objects are Merges that are bypassed, with Merges depending on
+    several objects each, so that collapsing them fans out
+    """
+    return random_dag(size, degree=4, seed=seed, bypass_ratio=bypass_ratio)
+
+
+GENERATORS = {
+    'chain': chain,
+    'fan_in': fan_in,
+    'fan_out': fan_out,
+    'random_dag': random_dag,
+    'merge_heavy': merge_heavy
+}
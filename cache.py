@@ -0,0 +1,102 @@
+from collections import OrderedDict
+from threading import Lock
+
+
+class CallbackCache(object):
+    """
+    The CallbackCache class wraps a callback that is called on a single object, and remembers the value returned for
+    each object, so that the callback is only called once for every object. Objects are identified by their identity
+    rather than their equality, and are kept alive by the cache for as long as their value is cached. The cache can be
+    shared between threads, although an object may be queried more than once when threads ask for it simultaneously.
+    """
+
+    @property
+    def callback(self):
+        return self._callback
+
+    @property
+    def maxsize(self):
+        return self._maxsize
+
+    @property
+    def hits(self):
+        return self._hits
+
+    @property
+    def misses(self):
+        return self._misses
+
+    @property
+    def convert(self):
+        return self._convert
+
+    def __init__(self, callback, maxsize=None, convert=None):
+        """
+        Initialize the CallbackCache class with the callback to wrap.
+        When a *maxsize* is given, the least recently used values are evicted once the cache holds more values than
+        the *maxsize*, otherwise the cache grows without bounds.
+        When a *convert* function is given, the value returned by the callback is passed through it before it is
+        cached, such as *list* for callbacks that return iterators, which can only be iterated over once.
+        :param callback: (callable) the function to call on an object that isn't cached yet
+        :param maxsize: (int) the maximum amount of values to cache, or None for no limit
+        :param convert: (callable) a function to convert the values returned by the callback with before caching them
+        """
+        super(CallbackCache, self).__init__()
+
+        if maxsize is not None and maxsize < 1:
+            raise ValueError("The maximum size of the cache has to be at least 1.")
+        self._callback = callback
+        self._maxsize = maxsize
+        self._convert = convert
+        self._values = OrderedDict()
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def __len__(self):
+        return len(self._values)
+
+    def __call__(self, item):
+        """
+        Returns the cached value for the object, calling the callback if the object isn't cached yet
+        :param item: (object) the object to call the callback on
+        :return: (object) the value returned by the callback for this object
+        """
+        key = id(item)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is not None:
+                self._hits += 1
+                if self._maxsize is not None:
+                    # Move the entry to the end, as it is now the most recently used one
+                    del self._values[key]
+                    self._values[key] = entry
+                return entry[1]
+            self._misses += 1
+        # The lock isn't held whilst calling the callback, so that other threads can query other objects meanwhile
+        value = self._callback(item)
+        if self._convert is not None:
+            value = self._convert(value)
+        with self._lock:
+            # The object is stored alongside the value, so that its identity can't be re-used while it is cached
+            self._values[key] = (item, value)
+            if self._maxsize is not None and len(self._values) > self._maxsize:
+                self._values.popitem(last=False)
+        return value
+
+    def discard(self, item):
+        """
+        Removes the cached value for the object, if there is one
+        :param item: (object) the object to remove the cached value for
+        """
+        with self._lock:
+            self._values.pop(id(item), None)
+
+    def clear(self):
+        """
+        Removes all cached values and resets the hit & miss counters
+        """
+        with self._lock:
+            self._values.clear()
+            self._hits = 0
+            self._misses = 0
@@ -0,0 +1,114 @@
+import fnmatch
+import re
+
+# The type of compiled regular expressions, which isn't exposed under the same name across Python versions
+_PATTERN_TYPE = type(re.compile(''))
+# Characters that turn a string into a glob pattern, rather than the name of a single type
+_GLOB_CHARACTERS = frozenset('*?[')
+try:
+    _STRING_TYPES = (basestring,)
+except NameError:
+    _STRING_TYPES = (str,)
+
+
+class TypeClassifier(object):
+    """
+    The TypeClassifier class decides whether objects of a given type are bypassed. The bypass or required types are
+    compiled once into a set of exact types and regular expressions for the patterns, and the verdict for each type is
+    cached, so that classifying a type that has been seen before costs a single dictionary lookup.
+    Types can be listed as exact values, as glob patterns such as "Merge*", or as compiled regular expressions, which
+    are matched from the start of the type.
+    """
+
+    @property
+    def bypass_types(self):
+        return self._bypass_types
+
+    @property
+    def required_types(self):
+        return self._required_types
+
+    def __init__(self, bypass_types=None, required_types=None):
+        """
+        Initialize the TypeClassifier class with the types to bypass, or the types that are required. When required
+        types are given, objects of all other types are bypassed
+        :param bypass_types: (list/str) the types, or patterns of types, to bypass
+        :param required_types: (list/str) the types, or patterns of types, that are required
+        """
+        super(TypeClassifier, self).__init__()
+
+        if bypass_types and required_types:
+            raise Exception("Both bypass_types and required_types arguments have been specified.")
+        self._bypass_types = self._listed(bypass_types)
+        self._required_types = self._listed(required_types)
+        # When required types have been given, a matching type is kept rather than bypassed
+        self._required = bool(self._required_types)
+        self._types, self._patterns = self._compile(self._required_types or self._bypass_types)
+        self._verdicts = dict()
+
+    @staticmethod
+    def _listed(types):
+        """
+        Turns a single type into a list holding that type
+        """
+        if types is None:
+            return list()
+        if isinstance(types, _STRING_TYPES + (_PATTERN_TYPE,)) or not hasattr(types, '__iter__'):
+            return [types]
+        return list(types)
+
+    @staticmethod
+    def _compile(types):
+        """
+        Splits the types into a set of exact types, and a list of regular expressions matching the patterns. All glob
+        patterns are combined into a single regular expression
+        :param types: (list) the types, glob patterns & regular expressions
+        :return: (tuple) the set of exact types, and the list of compiled regular expressions
+        """
+        exact_types = set()
+        globs = list()
+        patterns = list()
+        for item_type in types:
+            if isinstance(item_type, _PATTERN_TYPE):
+                patterns.append(item_type)
+            elif isinstance(item_type, _STRING_TYPES) and _GLOB_CHARACTERS.intersection(item_type):
+                globs.append(fnmatch.translate(item_type))
+            else:
+                exact_types.add(item_type)
+        if globs:
+            patterns.insert(0, re.compile('|'.join('(?:{0})'.format(expression) for expression in globs)))
+        return exact_types, patterns
+
+    def matches(self, item_type):
+        """
+        Determines whether the type is one of the listed types, or matches one of the listed patterns, without using
+        the cache of verdicts
+        :param item_type: (object) the type to match
+        :return: (bool) True if the type is listed
+        """
+        try:
+            if item_type in self._types:
+                return True
+        except TypeError:
+            # Unhashable types can't be listed as an exact type
+            pass
+        if not self._patterns:
+            return False
+        if not isinstance(item_type, _STRING_TYPES):
+            item_type = str(item_type)
+        return any(pattern.match(item_type) is not None for pattern in self._patterns)
+
+    def __call__(self, item_type):
+        """
+        Determines whether objects of the type are bypassed
+        :param item_type: (object) the type of the object
+        :return: (bool) True if objects of this type are bypassed
+        """
+        try:
+            return self._verdicts[item_type]
+        except KeyError:
+            verdict = self.matches(item_type) != self._required
+            self._verdicts[item_type] = verdict
+            return verdict
+        except TypeError:
+            return self.matches(item_type) != self._required
@@ -0,0 +1,208 @@
+from array import array
+
+
+class CompactDependencyItem(object):
+    """
+    The CompactDependencyItem is a lightweight view onto a single item within a CompactDependencyGraph, which exposes
+    the same interface as a DependencyItem
+    """
+    __slots__ = ('_graph', '_index')
+
+    @property
+    def index(self):
+        return self._index
+
+    @property
+    def id(self):
+        return self._graph.identifiers[self._index]
+
+    @property
+    def type(self):
+        return self._graph.types[self._index]
+
+    @property
+    def object(self):
+        return self._graph.objects[self._index]
+
+    @property
+    def bypass(self):
+        return bool(self._graph.bypass[self._index])
+
+    @property
+    def upstream_dependencies(self):
+        return [self._graph.item(index) for index in self._graph.upstream_indices(self._index)]
+
+    @property
+    def downstream_dependencies(self):
+        return [self._graph.item(index) for index in self._graph.downstream_indices(self._index)]
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'type': self.type,
+            'item': self.object,
+            'bypass': self.bypass
+        }
+
+    def __init__(self, graph, index):
+        """
+        Initialize the CompactDependencyItem object with the graph and the index of the item within the graph
+        :param graph: (CompactDependencyGraph) the graph that holds the item
+        :param index: (int) the index of the item within the graph
+        """
+        self._graph = graph
+        self._index = index
+
+    def __eq__(self, other):
+        return isinstance(other, CompactDependencyItem) and \
+            other._graph is self._graph and other._index == self._index
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash((id(self._graph), self._index))
+
+
+class CompactDependencyGraph(object):
+    """
+    The CompactDependencyGraph class holds an analysed dependency tree in flat, integer indexed arrays. The upstream &
+    downstream dependencies of all items are stored in compressed sparse row form: the dependencies of the item at
+    *index* are the indices between *offsets[index]* and *offsets[index + 1]*. Items are only materialized as
+    lightweight CompactDependencyItem views when they are accessed.
+    """
+
+    @property
+    def identifiers(self):
+        return self._identifiers
+
+    @property
+    def types(self):
+        return self._types
+
+    @property
+    def objects(self):
+        return self._objects
+
+    @property
+    def bypass(self):
+        return self._bypass
+
+    @property
+    def edge_arrays(self):
+        """
+        Returns the arrays holding the dependencies of all items
+        :return: (tuple) the upstream offsets, upstream indices, downstream offsets and downstream indices
+        """
+        return self._upstream_offsets, self._upstream_indices, self._downstream_offsets, self._downstream_indices
+
+    def __init__(self, identifiers, types, objects, bypass,
+                 upstream_offsets, upstream_indices, downstream_offsets, downstream_indices):
+        """
+        Initialize the CompactDependencyGraph class with the arrays that describe the tree
+        :param identifiers: (sequence) the unique identifier of each item
+        :param types: (sequence) the type of each item
+        :param objects: (sequence) the actual object of each item
+        :param bypass: (sequence) whether each item is being bypassed
+        :param upstream_offsets: (array) the offset of the upstream dependencies of each item, plus the total
+        :param upstream_indices: (array) the indices of the upstream dependencies of all items
+        :param downstream_offsets: (array) the offset of the downstream dependencies of each item, plus the total
+        :param downstream_indices: (array) the indices of the downstream dependencies of all items
+        """
+        super(CompactDependencyGraph, self).__init__()
+
+        self._identifiers = identifiers
+        self._types = types
+        self._objects = objects
+        self._bypass = bypass
+        self._upstream_offsets = upstream_offsets
+        self._upstream_indices = upstream_indices
+        self._downstream_offsets = downstream_offsets
+        self._downstream_indices = downstream_indices
+        self._indices = None
+
+    @classmethod
+    def from_wrangler(cls, wrangler):
+        """
+        Creates a CompactDependencyGraph from the tree analysed by a DependencyWrangler, keeping the order in which
+        the items were processed
+        :param wrangler: (DependencyWrangler) the wrangler that analysed the tree
+        :return: (CompactDependencyGraph) the compact representation of the tree
+        """
+        processed_items = list(wrangler.items.values())
+        indices = dict((processed_item.id, index) for index, processed_item in enumerate(processed_items))
+        upstream_offsets, upstream_indices = array('l', [0]), array('l')
+        downstream_offsets, downstream_indices = array('l', [0]), array('l')
+        for processed_item in processed_items:
+            upstream_indices.extend(indices[x.id] for x in processed_item.upstream_dependencies)
+            upstream_offsets.append(len(upstream_indices))
+            downstream_indices.extend(indices[x.id] for x in processed_item.downstream_dependencies)
+            downstream_offsets.append(len(downstream_indices))
+        return cls(
+            [processed_item.id for processed_item in processed_items],
+            [processed_item.type for processed_item in processed_items],
+            [processed_item.object for processed_item in processed_items],
+            bytearray(bool(processed_item.bypass) for processed_item in processed_items),
+            upstream_offsets, upstream_indices, downstream_offsets, downstream_indices
+        )
+
+    @property
+    def indices(self):
+        """
+        Maps the unique identifier of each item to its index, which is only built once it is first needed
+        :return: (dict) the index of each item, keyed by its unique identifier
+        """
+        if self._indices is None:
+            self._indices = dict((identifier, index) for index, identifier in enumerate(self._identifiers))
+        return self._indices
+
+    def __len__(self):
+        return len(self._identifiers)
+
+    def __contains__(self, identifier):
+        return identifier in self.indices
+
+    def __iter__(self):
+        return iter(self._identifiers)
+
+    def __getitem__(self, identifier):
+        return CompactDependencyItem(self, self.indices[identifier])
+
+    def index(self, identifier):
+        """
+        Returns the index of an item within the graph
+        :param identifier: (object) the unique identifier of the item
+        :return: (int) the index of the item
+        """
+        return self.indices[identifier]
+
+    def item(self, index):
+        """
+        Returns a view onto the item at the index within the graph
+        :param index: (int) the index of the item
+        :return: (CompactDependencyItem) the view onto the item
+        """
+        return CompactDependencyItem(self, index)
+
+    def items(self):
+        """
+        Lists all items within the graph, in the order they were processed
+        :return: (list) tuples of the unique identifier and a view onto each item
+        """
+        return [(identifier, CompactDependencyItem(self, index)) for index, identifier in enumerate(self._identifiers)]
+
+    def upstream_indices(self, index):
+        """
+        Returns the indices of the upstream dependencies of the item at the index, without creating any views
+        :param index: (int) the index of the item
+        :return: (array) the indices of the upstream dependencies
+        """
+        return self._upstream_indices[self._upstream_offsets[index]:self._upstream_offsets[index + 1]]
+
+    def downstream_indices(self, index):
+        """
+        Returns the indices of the downstream dependencies of the item at the index, without creating any views
+        :param index: (int) the index of the item
+        :return: (array) the indices of the downstream dependencies
+        """
+        return self._downstream_indices[self._downstream_offsets[index]:self._downstream_offsets[index + 1]]
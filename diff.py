@@ -0,0 +1,159 @@
+from compact import CompactDependencyGraph
+
+
+def _signature(value):
+    """
+    Hashes a value, falling back to its representation for values that can't be hashed
+    """
+    try:
+        return hash(value)
+    except TypeError:
+        return hash(repr(value))
+
+
+def _records(graph):
+    """
+    Lists the type, bypass flag & unique identifiers of the upstream dependencies of each item within a graph, along
+    with a signature of the item and of its upstream dependencies
+    :param graph: (DependencyWrangler/CompactDependencyGraph) the analysed tree, or a snapshot of it
+    :return: (dict) the type, bypass flag, upstream dependencies, signature & set of upstream dependencies of each
+    item, keyed by its unique identifier, in the order the items were processed
+    """
+    records = dict()
+    if isinstance(graph, CompactDependencyGraph):
+        identifiers = list(graph.identifiers)
+        items = (
+            (identifier, graph.types[index], bool(graph.bypass[index]),
+             [identifiers[x] for x in graph.upstream_indices(index)])
+            for index, identifier in enumerate(identifiers)
+        )
+    else:
+        items = (
+            (key, value.type, bool(value.bypass), [x.id for x in value.upstream_dependencies])
+            for key, value in graph.items.items()
+        )
+    for item_identifier, item_type, bypass, upstream in items:
+        # The order of the dependencies doesn't change the structure of the tree
+        edges = frozenset(upstream)
+        records[item_identifier] = (item_type, bypass, upstream, _signature((item_type, bypass, hash(edges))), edges)
+    return records
+
+
+class GraphDiff(object):
+    """
+    The GraphDiff class holds the differences between two analysed trees: the items that have been added & removed,
+    the items whose type or bypass flag has changed, and the dependencies that have been added & removed. Dependencies
+    are listed as edges of the unique identifier of an item and the unique identifier of its upstream dependency
+    """
+
+    @property
+    def added(self):
+        return self._added
+
+    @property
+    def removed(self):
+        return self._removed
+
+    @property
+    def type_changes(self):
+        return self._type_changes
+
+    @property
+    def bypass_changes(self):
+        return self._bypass_changes
+
+    @property
+    def added_edges(self):
+        return self._added_edges
+
+    @property
+    def removed_edges(self):
+        return self._removed_edges
+
+    @property
+    def changed(self):
+        """
+        Lists the items of the new tree whose structure has changed: the items that have been added, and the items
+        whose type, bypass flag or upstream dependencies have changed
+        :return: (list) unique identifiers of the changed items, in the order they were processed in the new tree
+        """
+        return self._changed
+
+    def __init__(self, added, removed, type_changes, bypass_changes, added_edges, removed_edges, changed):
+        """
+        Initialize the GraphDiff class with the differences between the trees
+        :param added: (list) unique identifiers of the items only within the new tree
+        :param removed: (list) unique identifiers of the items only within the old tree
+        :param type_changes: (dict) the old & new type of each item whose type has changed
+        :param bypass_changes: (dict) the old & new bypass flag of each item whose bypass flag has changed
+        :param added_edges: (list) the edges only within the new tree
+        :param removed_edges: (list) the edges only within the old tree
+        :param changed: (list) unique identifiers of the changed items of the new tree
+        """
+        super(GraphDiff, self).__init__()
+
+        self._added = added
+        self._removed = removed
+        self._type_changes = type_changes
+        self._bypass_changes = bypass_changes
+        self._added_edges = added_edges
+        self._removed_edges = removed_edges
+        self._changed = changed
+
+    def __bool__(self):
+        return bool(self._changed or self._removed or self._removed_edges)
+
+    __nonzero__ = __bool__
+
+    def to_dict(self):
+        return {
+            'added': self._added,
+            'removed': self._removed,
+            'type_changes': self._type_changes,
+            'bypass_changes': self._bypass_changes,
+            'added_edges': self._added_edges,
+            'removed_edges': self._removed_edges,
+            'changed': self._changed
+        }
+
+
+def diff_graphs(old, new):
+    """
+    Compares two analysed trees in linear time. Each item is summarised by a hash of its type, bypass flag and set of
+    upstream dependencies, so that unchanged items are recognised by comparing their hashes, and only the items whose
+    hash differs are compared edge by edge
+    :param old: (DependencyWrangler/CompactDependencyGraph) the old tree, which may be a loaded snapshot
+    :param new: (DependencyWrangler/CompactDependencyGraph) the new tree, which may be a loaded snapshot
+    :return: (GraphDiff) the differences between the trees
+    """
+    old_records = _records(old)
+    new_records = _records(new)
+    removed = [item_identifier for item_identifier in old_records if item_identifier not in new_records]
+    added = list()
+    type_changes = dict()
+    bypass_changes = dict()
+    added_edges = list()
+    removed_edges = list()
+    changed = list()
+    for item_identifier, new_record in new_records.items():
+        old_record = old_records.get(item_identifier)
+        if old_record is None:
+            added.append(item_identifier)
+            changed.append(item_identifier)
+            added_edges.extend((item_identifier, x) for x in new_record[2])
+            continue
+        # Equal signatures are still confirmed, as hashes may collide
+        if old_record[3] == new_record[3] and old_record[0] == new_record[0] and old_record[1] == new_record[1] and \
+                old_record[4] == new_record[4]:
+            continue
+        changed.append(item_identifier)
+        if old_record[0] != new_record[0]:
+            type_changes[item_identifier] = (old_record[0], new_record[0])
+        if old_record[1] != new_record[1]:
+            bypass_changes[item_identifier] = (old_record[1], new_record[1])
+        if old_record[4] != new_record[4]:
+            added_edges.extend((item_identifier, x) for x in new_record[2] if x not in old_record[4])
+            removed_edges.extend((item_identifier, x) for x in old_record[2] if x not in new_record[4])
+    for item_identifier in removed:
+        removed_edges.extend((item_identifier, x) for x in old_records[item_identifier][2])
+    return GraphDiff(added, removed, type_changes, bypass_changes, added_edges, removed_edges, changed)
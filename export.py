@@ -0,0 +1,198 @@
+"""
+Export of an analysed dependency tree as jobs for Thinkbox Deadline. Dependencies that are implied by other
+dependencies are dropped through a transitive reduction, linear chains of items of the same type can be merged into
+a single job, and the jobs are submitted a wave at a time through a single bulk call per wave, so that every job only
+depends on the jobs it directly needs.
+"""
+
+
+class DeadlineJob(object):
+    """
+    The DeadlineJob class represents a single job to submit, which executes one or more items of the tree in order
+    """
+
+    @property
+    def name(self):
+        return self._items[0].id
+
+    @property
+    def items(self):
+        return self._items
+
+    @property
+    def dependencies(self):
+        return self._dependencies
+
+    @property
+    def wave(self):
+        return self._wave
+
+    def __init__(self, item):
+        """
+        Initialize the DeadlineJob class with the first item of the job
+        :param item: (DependencyItem) the first item the job executes
+        """
+        super(DeadlineJob, self).__init__()
+
+        self._items = [item]
+        self._dependencies = list()
+        # Jobs within the same wave only depend on jobs of earlier waves, so they can be submitted together
+        self._wave = 0
+
+    def __repr__(self):
+        return '{0}({1!r})'.format(type(self).__name__, [x.id for x in self._items])
+
+
+def reduce_dependencies(wrangler, items):
+    """
+    Drops the dependencies of each item that are implied by its other dependencies, which is the transitive reduction
+    of the dependencies
+    :param wrangler: (DependencyWrangler) the wrangler that analysed the items
+    :param items: (list) the DependencyItem objects to reduce the dependencies of
+    :return: (dict) the unique identifiers of the remaining upstream dependencies of each item, in their original
+    order, keyed by the unique identifier of the item
+    """
+    query_index = wrangler.query_index
+    reduced = dict()
+    for processed_item in items:
+        dependencies = list()
+        for dependency in processed_item.upstream_dependencies:
+            if dependency.id not in dependencies:
+                dependencies.append(dependency.id)
+        if len(dependencies) > 1:
+            ancestors = [query_index.ancestors(x) for x in dependencies]
+            dependencies = [
+                dependency_identifier for dependency_identifier in dependencies
+                if not any(dependency_identifier in x for x in ancestors)
+            ]
+        reduced[processed_item.id] = dependencies
+    return reduced
+
+
+def build_jobs(wrangler, merge_chains=False):
+    """
+    Turns the items of the analysed tree that are not being bypassed into jobs, where each job only depends on the
+    jobs it directly needs. A DependencyCycleError is raised when the items depend on each other
+    :param wrangler: (DependencyWrangler) the wrangler that analysed the tree
+    :param merge_chains: (bool) merge each item into the job of its only dependency when both are of the same type, and
+    the item is the only item depending on it, so that linear chains of items are executed as a single job
+    :return: (list) the DeadlineJob objects, each after the jobs it depends on
+    """
+    items = list(wrangler.iterate_available_items())
+    reduced = reduce_dependencies(wrangler, items)
+    if merge_chains:
+        dependants = dict((processed_item.id, 0) for processed_item in items)
+        for dependencies in reduced.values():
+            for dependency_identifier in dependencies:
+                dependants[dependency_identifier] += 1
+
+    jobs = list()
+    item_jobs = dict()
+    for processed_item in items:
+        dependencies = reduced[processed_item.id]
+        if merge_chains and len(dependencies) == 1 and dependants[dependencies[0]] == 1 and \
+                wrangler.items[dependencies[0]].type == processed_item.type:
+            job = item_jobs[dependencies[0]]
+            job.items.append(processed_item)
+            item_jobs[processed_item.id] = job
+            continue
+        job = DeadlineJob(processed_item)
+        for dependency_identifier in dependencies:
+            dependency_job = item_jobs[dependency_identifier]
+            if dependency_job not in job.dependencies:
+                job.dependencies.append(dependency_job)
+                job._wave = max(job.wave, dependency_job.wave + 1)
+        item_jobs[processed_item.id] = job
+        jobs.append(job)
+    return jobs
+
+
+def job_payload(job, job_info_callback, plugin_info_callback=None, batch_name=None, job_identifiers=None):
+    """
+    Creates the payload to submit a job with
+    :param job: (DeadlineJob) the job to create the payload for
+    :param job_info_callback: (callable) a function to call on the job to retrieve its job info, such as the plugin
+    :param plugin_info_callback: (callable) a function to call on the job to retrieve its plugin info
+    :param batch_name: (str) the name of the batch to group the jobs under
+    :param job_identifiers: (dict) the Deadline job IDs of the jobs that have been submitted, to depend on
+    :return: (dict) the job info, plugin info & auxiliary files of the job
+    """
+    job_info = dict(job_info_callback(job))
+    job_info.setdefault('Name', str(job.name))
+    if batch_name is not None:
+        job_info.setdefault('BatchName', batch_name)
+    if job.dependencies:
+        job_info['JobDependencies'] = ','.join(
+            job_identifiers[x] if job_identifiers is not None else str(x.name) for x in job.dependencies
+        )
+    return {
+        'JobInfo': job_info,
+        'PluginInfo': dict(plugin_info_callback(job)) if plugin_info_callback else dict(),
+        'AuxFiles': list(),
+        'IdOnly': True
+    }
+
+
+def submit_jobs(connection, jobs, job_info_callback, plugin_info_callback=None, batch_name=None):
+    """
+    Submits the jobs to Deadline a wave at a time, through a single bulk call per wave, so that every job can depend
+    on the Deadline job IDs of the jobs it depends on
+    :param connection: (DeadlineCon) the connection to the Deadline web service, or a LocalDeadlineConnection
+    :param jobs: (list) the DeadlineJob objects to submit, as returned by *build_jobs*
+    :param job_info_callback: (callable) a function to call on each job to retrieve its job info
+    :param plugin_info_callback: (callable) a function to call on each job to retrieve its plugin info
+    :param batch_name: (str) the name of the batch to group the jobs under
+    :return: (dict) the Deadline job ID of each job
+    """
+    waves = list()
+    for job in jobs:
+        while len(waves) <= job.wave:
+            waves.append(list())
+        waves[job.wave].append(job)
+    job_identifiers = dict()
+    for wave in waves:
+        submitted = connection.Jobs.SubmitJobs([
+            job_payload(job, job_info_callback, plugin_info_callback, batch_name, job_identifiers) for job in wave
+        ])
+        for job, result in zip(wave, submitted):
+            job_identifiers[job] = result['_id'] if isinstance(result, dict) else result
+    return job_identifiers
+
+
+class _LocalJobs(object):
+    """
+    Stands in for the Jobs API of a Deadline connection
+    """
+
+    def __init__(self):
+        self.submitted = list()
+        self.calls = 0
+
+    def SubmitJobs(self, jobs=None):
+        self.calls += 1
+        results = list()
+        for job in jobs or ():
+            job_identifier = '{0:024x}'.format(len(self.submitted) + 1)
+            self.submitted.append(dict(job, _id=job_identifier))
+            results.append({'_id': job_identifier})
+        return results
+
+
+class LocalDeadlineConnection(object):
+    """
+    The LocalDeadlineConnection class stands in for a connection to the Deadline web service, recording the jobs that
+    are submitted through it rather than submitting them, so that exports can be tested without a Deadline repository
+    """
+
+    @property
+    def Jobs(self):
+        return self._jobs
+
+    @property
+    def submitted(self):
+        return self._jobs.submitted
+
+    def __init__(self):
+        super(LocalDeadlineConnection, self).__init__()
+
+        self._jobs = _LocalJobs()
@@ -0,0 +1,175 @@
+import time
+from threading import Lock
+
+# The most precise clock available, as time.perf_counter is only available from Python 3.3 onwards
+_clock = getattr(time, 'perf_counter', time.time)
+
+# The events that are recorded, besides a "callback.<name>" event for each call to one of the callbacks
+VISIT = 'visit'
+DUPLICATE = 'duplicate'
+COLLAPSE = 'collapse'
+AVAILABLE_OBJECTS = 'available_objects'
+AVAILABLE_RECORDS = 'available_records'
+_CALLBACK_PREFIX = 'callback.'
+
+
+class AnalysisStats(object):
+    """
+    The AnalysisStats class collects counts & cumulative durations of what a DependencyWrangler spends its time on: the
+    calls to each of the callbacks, the objects visited whilst walking the tree, the visits to objects that had been
+    processed already, the bypassed items that have been collapsed, the building of the available objects and the
+    formatting of their records.
+    Every recorded event is also passed on to the hooks, as *hook(event, count, duration)*, where the duration is None
+    for events that aren't timed, so that the events can be exported to other metrics systems as they happen
+    """
+
+    @property
+    def hooks(self):
+        return self._hooks
+
+    @property
+    def counts(self):
+        return self._counts
+
+    @property
+    def durations(self):
+        return self._durations
+
+    @property
+    def callback_counts(self):
+        """
+        :return: (dict) the amount of calls to each callback, keyed by the name of the callback, such as *upstream* or
+        *upstream_batch*
+        """
+        return self._by_callback(self._counts)
+
+    @property
+    def callback_durations(self):
+        """
+        :return: (dict) the cumulative duration in seconds of the calls to each callback, keyed by the name of the
+        callback
+        """
+        return self._by_callback(self._durations)
+
+    @property
+    def visited(self):
+        return self._counts.get(VISIT, 0)
+
+    @property
+    def duplicates(self):
+        return self._counts.get(DUPLICATE, 0)
+
+    @property
+    def collapses(self):
+        return self._counts.get(COLLAPSE, 0)
+
+    @property
+    def available_objects_builds(self):
+        return self._counts.get(AVAILABLE_OBJECTS, 0)
+
+    @property
+    def available_records(self):
+        return self._counts.get(AVAILABLE_RECORDS, 0)
+
+    @property
+    def available_objects_duration(self):
+        """
+        :return: (float) the cumulative duration in seconds of building the available objects, including the
+        formatting of their records, which only happens once the records are accessed or the tree is about to change
+        """
+        return self._durations.get(AVAILABLE_OBJECTS, 0.0) + self._durations.get(AVAILABLE_RECORDS, 0.0)
+
+    def __init__(self, hooks=None):
+        """
+        Initialize the AnalysisStats class with the hooks to pass the recorded events on to
+        :param hooks: (list) functions to call with the name, count & duration of every recorded event
+        """
+        super(AnalysisStats, self).__init__()
+
+        self._hooks = list(hooks or ())
+        self._counts = dict()
+        self._durations = dict()
+        # Callbacks may be called from the pool of threads of a parallel analysis
+        self._lock = Lock()
+
+    @staticmethod
+    def _by_callback(values):
+        return dict(
+            (event[len(_CALLBACK_PREFIX):], value) for event, value in values.items()
+            if event.startswith(_CALLBACK_PREFIX)
+        )
+
+    def add_hook(self, hook):
+        """
+        Adds a function to call with the name, count & duration of every recorded event
+        :param hook: (callable) the function to add
+        """
+        self._hooks.append(hook)
+
+    def remove_hook(self, hook):
+        """
+        Removes a function that has been added through *add_hook*
+        :param hook: (callable) the function to remove
+        """
+        self._hooks.remove(hook)
+
+    def record(self, event, count=1, duration=None):
+        """
+        Records an event, and passes it on to the hooks
+        :param event: (str) the name of the event
+        :param count: (int) the amount of times the event has occurred
+        :param duration: (float) the time the events took in seconds, or None if the event isn't timed
+        """
+        with self._lock:
+            self._counts[event] = self._counts.get(event, 0) + count
+            if duration is not None:
+                self._durations[event] = self._durations.get(event, 0.0) + duration
+        for hook in self._hooks:
+            hook(event, count, duration)
+
+    def record_callback(self, name, duration):
+        """
+        Records a single call to a callback as a "callback.<name>" event
+        :param name: (str) the name of the callback, such as *upstream* or *upstream_batch*
+        :param duration: (float) the time the call took in seconds
+        """
+        self.record(_CALLBACK_PREFIX + name, 1, duration)
+
+    def timed(self, name, callback):
+        """
+        Wraps a callback, so that every call to it is timed & recorded as a "callback.<name>" event
+        :param name: (str) the name of the callback
+        :param callback: (callable) the callback to wrap
+        :return: (callable) the wrapped callback
+        """
+        def wrapper(*args, **kwargs):
+            start = _clock()
+            try:
+                return callback(*args, **kwargs)
+            finally:
+                self.record_callback(name, _clock() - start)
+        return wrapper
+
+    def reset(self):
+        """
+        Forgets all recorded events, keeping the hooks
+        """
+        with self._lock:
+            self._counts = dict()
+            self._durations = dict()
+
+    def to_dict(self):
+        """
+        :return: (dict) a copy of the recorded counts & durations, in a form that can be exported directly
+        """
+        with self._lock:
+            return {
+                'callback_counts': self.callback_counts,
+                'callback_durations': self.callback_durations,
+                'visited': self.visited,
+                'duplicates': self.duplicates,
+                'collapses': self.collapses,
+                'available_objects_builds': self.available_objects_builds,
+                'available_records': self.available_records,
+                'available_objects_duration': self.available_objects_duration
+            }
@@ -2,6 +2,9 @@ class DependencyItem(object):
     """
     The DependencyItem is a proxy item that represents a real Python object
     """
+    # Trees can hold hundreds of thousands of items, so avoid a __dict__ for each one of them
+    __slots__ = ('id', 'type', 'object', 'bypass', '_upstream_dependencies', '_downstream_dependencies')
+
     @property
     def upstream_dependencies(self):
         return self._upstream_dependencies
@@ -54,4 +57,19 @@ class DependencyItem(object):
         Appends a DependencyItem to the private *_downstream_dependencies* list
         :param item: (object) the DependencyItem to append
         """
-        self._downstream_dependencies.append(item)
\ No newline at end of file
+        self._downstream_dependencies.append(item)
+
+    def remove_dependency(self, item):
+        """
+        Removes a DependencyItem from both the private *_upstream_dependencies* and *_downstream_dependencies* lists
+        :param item: (object) the DependencyItem to remove
+        """
+        self._upstream_dependencies[:] = [x for x in self._upstream_dependencies if x is not item]
+        self._downstream_dependencies[:] = [x for x in self._downstream_dependencies if x is not item]
+
+    def clear_dependencies(self):
+        """
+        Clears both the private *_upstream_dependencies* and *_downstream_dependencies* lists
+        """
+        del self._upstream_dependencies[:]
+        del self._downstream_dependencies[:]
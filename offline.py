@@ -0,0 +1,216 @@
+"""
+Analysis of graphs that have been exported to plain Python data, such as full-facility asset graphs, across a pool of
+processes. The graph is partitioned into its connected components, which don't share any items and can therefore be
+analysed independently, after which the analysed components are merged into a single DependencyWrangler whose tree
+is identical to the one a serial analysis would have built.
+"""
+import multiprocessing
+
+from wrangler import DependencyWrangler
+
+
+class PlainGraph(object):
+    """
+    The PlainGraph class holds a graph as plain, picklable data: the type of each item, and the unique identifiers of
+    the upstream & downstream dependencies of each item. The unique identifiers themselves act as the objects of the
+    graph, and the methods of the class as the callbacks of the DependencyWrangler
+    """
+
+    @property
+    def types(self):
+        return self._types
+
+    def __init__(self, types, upstream, downstream=None):
+        """
+        Initialize the PlainGraph class with the items & dependencies of the graph
+        :param types: (dict) the type of each item, keyed by its unique identifier, in the order the items should be
+        analysed in
+        :param upstream: (dict) the unique identifiers of the upstream dependencies of each item
+        :param downstream: (dict) the unique identifiers of the downstream dependencies of each item, or None to
+        derive them from the upstream dependencies
+        """
+        super(PlainGraph, self).__init__()
+
+        for connections in (upstream, downstream or {}):
+            for item_identifier, dependency_identifiers in connections.items():
+                for dependency_identifier in dependency_identifiers:
+                    if item_identifier not in types or dependency_identifier not in types:
+                        raise ValueError("The edge {0!r} -> {1!r} refers to an unknown item.".format(
+                            item_identifier, dependency_identifier
+                        ))
+        self._types = types
+        self._upstream = upstream
+        if downstream is None:
+            downstream = dict((item_identifier, list()) for item_identifier in types)
+            for item_identifier in types:
+                for dependency_identifier in upstream.get(item_identifier, ()):
+                    downstream[dependency_identifier].append(item_identifier)
+        self._downstream = downstream
+
+    def identifier(self, item_identifier):
+        return item_identifier
+
+    def type(self, item_identifier):
+        return self._types[item_identifier]
+
+    def upstream(self, item_identifier):
+        return self._upstream.get(item_identifier, ())
+
+    def downstream(self, item_identifier):
+        return self._downstream.get(item_identifier, ())
+
+    def subgraph(self, item_identifiers):
+        """
+        Creates a graph of only the given items, keeping the order of the items
+        :param item_identifiers: (list) unique identifiers of the items to keep, which have to include every item
+        they are connected to
+        :return: (PlainGraph) the graph of the items
+        """
+        return PlainGraph(
+            dict((x, self._types[x]) for x in item_identifiers),
+            dict((x, list(self.upstream(x))) for x in item_identifiers),
+            dict((x, list(self.downstream(x))) for x in item_identifiers)
+        )
+
+    def components(self):
+        """
+        Partitions the graph into its connected components
+        :return: (list) unique identifiers of the items within each component, with the components ordered by their
+        first item, and the items of each component in the order of the graph
+        """
+        parents = dict((item_identifier, item_identifier) for item_identifier in self._types)
+
+        def find(item_identifier):
+            root = item_identifier
+            while parents[root] != root:
+                root = parents[root]
+            # Point every item along the way to the root, so that later lookups are shorter
+            while parents[item_identifier] != root:
+                parents[item_identifier], item_identifier = root, parents[item_identifier]
+            return root
+
+        for item_identifier in self._types:
+            for connections in (self.upstream(item_identifier), self.downstream(item_identifier)):
+                for dependency_identifier in connections:
+                    first, second = find(item_identifier), find(dependency_identifier)
+                    if first != second:
+                        parents[second] = first
+        components = dict()
+        ordered = list()
+        for item_identifier in self._types:
+            root = find(item_identifier)
+            if root not in components:
+                components[root] = list()
+                ordered.append(components[root])
+            components[root].append(item_identifier)
+        return ordered
+
+
+def create_wrangler(graph, bypass_types=None, required_types=None):
+    """
+    Creates a DependencyWrangler that analyses a plain graph
+    :param graph: (PlainGraph) the graph to analyse
+    :param bypass_types: (list/str) the types, or patterns of types, to bypass
+    :param required_types: (list/str) the types, or patterns of types, that are required
+    :return: (DependencyWrangler) the wrangler
+    """
+    return DependencyWrangler(
+        object_class=object,
+        object_upstream_callback=graph.upstream,
+        object_downstream_callback=graph.downstream,
+        object_identifier_callback=graph.identifier,
+        object_type_callback=graph.type,
+        bypass_types=bypass_types,
+        required_types=required_types
+    )
+
+
+def shard_components(components, shard_size):
+    """
+    Packs consecutive components into shards of up to the given amount of items, so that many small components are
+    analysed by a single task. Components are never split, so a component with more items than the shard size forms
+    a shard on its own
+    :param components: (list) unique identifiers of the items within each component
+    :param shard_size: (int) the maximum amount of items within a shard
+    :return: (list) unique identifiers of the items within each shard, in the order of the components
+    """
+    if shard_size < 1:
+        raise ValueError("The shard size has to be at least 1.")
+    shards = list()
+    shard = list()
+    for component in components:
+        if shard and len(shard) + len(component) > shard_size:
+            shards.append(shard)
+            shard = list()
+        shard.extend(component)
+    if shard:
+        shards.append(shard)
+    return shards
+
+
+def _analyse(graph, bypass_types, required_types):
+    """
+    Analyses every item of a graph, in the order of the graph
+    :return: (DependencyWrangler) the wrangler that has analysed the graph
+    """
+    wrangler = create_wrangler(graph, bypass_types, required_types)
+    for item_identifier in graph.types:
+        if item_identifier not in wrangler.items:
+            wrangler.analyse(item_identifier)
+    return wrangler
+
+
+def _analyse_shard(arguments):
+    """
+    Analyses a shard of a graph within a worker process
+    :param arguments: (tuple) the graph of the shard, and the bypass & required types
+    :return: (list) the records of the analysed items, see *DependencyWrangler._define_analysed*
+    """
+    wrangler = _analyse(*arguments)
+    return [
+        (key, value.type,
+         wrangler._upstream_identifiers[key], wrangler._downstream_identifiers[key],
+         [x.id for x in value.upstream_dependencies], [x.id for x in value.downstream_dependencies])
+        for key, value in wrangler.items.items()
+    ]
+
+
+def analyse_graph(graph, bypass_types=None, required_types=None, processes=None, shard_size=None):
+    """
+    Analyses every item of a plain graph, analysing its connected components across a pool of processes. The items of
+    the resulting wrangler, including their order, bypass flags, dependencies and numeric IDs, are identical to those
+    of analysing every item of the graph in order within a single process
+    :param graph: (PlainGraph) the graph to analyse
+    :param bypass_types: (list/str) the types, or patterns of types, to bypass
+    :param required_types: (list/str) the types, or patterns of types, that are required
+    :param processes: (int) the amount of worker processes, or None for the amount of CPUs. The graph is analysed
+    within the current process when 1 is given
+    :param shard_size: (int) the maximum amount of items analysed by a single task, packing small components
+    together, or None to hand the components to the workers in chunks, a few chunks per worker
+    :return: (DependencyWrangler) the wrangler holding the analysed graph
+    """
+    if processes is not None and processes < 1:
+        raise ValueError("The amount of processes has to be at least 1.")
+    if processes == 1:
+        return _analyse(graph, bypass_types, required_types)
+
+    components = graph.components()
+    chunksize = 1
+    if shard_size is not None:
+        components = shard_components(components, shard_size)
+    else:
+        # Graphs can consist of thousands of tiny components, which would otherwise be sent to the workers one at a
+        # time. The chunks are sized like those of *multiprocessing.Pool.map*
+        chunksize = max(1, len(components) // ((processes or multiprocessing.cpu_count()) * 4))
+    wrangler = create_wrangler(graph, bypass_types, required_types)
+    pool = multiprocessing.Pool(processes)
+    try:
+        # The results are merged in the order of the components, which is the order a serial analysis defines them in
+        for records in pool.imap(
+                _analyse_shard, ((graph.subgraph(x), bypass_types, required_types) for x in components),
+                chunksize):
+            wrangler._define_analysed(records)
+    finally:
+        pool.close()
+        pool.join()
+    return wrangler
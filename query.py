@@ -0,0 +1,122 @@
+from collections import deque
+
+
+class DependencyIndex(object):
+    """
+    The DependencyIndex class answers reachability questions about an analysed dependency tree, such as which items
+    an item transitively depends on. The dependencies of all items are indexed once as lists of integers, and the
+    ancestors & descendants of each item are only collected once they are first asked for. Collecting the ancestors of
+    an item reuses the ancestors that have been collected for its dependencies before, so that the questions asked about
+    items within the same part of the tree get cheaper as more questions are answered.
+    The index doesn't follow any later changes to the tree, see *DependencyWrangler.query_index*
+    """
+
+    def __init__(self, items):
+        """
+        Initialize the DependencyIndex class with the items of an analysed tree
+        :param items: (iterable) the DependencyItem objects to index
+        """
+        super(DependencyIndex, self).__init__()
+
+        items = list(items)
+        self._identifiers = [processed_item.id for processed_item in items]
+        self._indices = dict((item_identifier, index) for index, item_identifier in enumerate(self._identifiers))
+        indices = self._indices
+        self._upstream = [[indices[x.id] for x in processed_item.upstream_dependencies] for processed_item in items]
+        self._downstream = [[indices[x.id] for x in processed_item.downstream_dependencies] for processed_item in items]
+        self._ancestors = dict()
+        self._descendants = dict()
+
+    def __len__(self):
+        return len(self._identifiers)
+
+    def __contains__(self, item_identifier):
+        return item_identifier in self._indices
+
+    def _closure(self, item_identifier, connections, closures):
+        """
+        Collects the unique identifiers of all items that are reachable from an item by following its connections,
+        reusing the items reachable from the items that have been collected before
+        :param item_identifier: (object) the unique identifier of the item
+        :param connections: (list) the indices of the connections of each item in one direction
+        :param closures: (dict) the reachable items that have been collected before, keyed by the index of the item
+        :return: (frozenset) the unique identifiers of the reachable items, which only includes the item itself when
+        it is part of a cycle
+        """
+        index = self._indices[item_identifier]
+        if index in closures:
+            return closures[index]
+        identifiers = self._identifiers
+        reachable = set()
+        stack = list(connections[index])
+        while stack:
+            dependency_index = stack.pop()
+            dependency_identifier = identifiers[dependency_index]
+            if dependency_identifier in reachable:
+                continue
+            reachable.add(dependency_identifier)
+            if dependency_index in closures:
+                reachable.update(closures[dependency_index])
+            else:
+                stack.extend(connections[dependency_index])
+        closures[index] = frozenset(reachable)
+        return closures[index]
+
+    def ancestors(self, item_identifier):
+        """
+        Lists all items an item depends on, directly or through other items
+        :param item_identifier: (object) the unique identifier of the item
+        :return: (frozenset) the unique identifiers of the upstream items
+        """
+        return self._closure(item_identifier, self._upstream, self._ancestors)
+
+    def descendants(self, item_identifier):
+        """
+        Lists all items that depend on an item, directly or through other items
+        :param item_identifier: (object) the unique identifier of the item
+        :return: (frozenset) the unique identifiers of the downstream items
+        """
+        return self._closure(item_identifier, self._downstream, self._descendants)
+
+    def depends_on(self, item_identifier, dependency_identifier):
+        """
+        Determines whether an item depends on another item, directly or through other items
+        :param item_identifier: (object) the unique identifier of the item
+        :param dependency_identifier: (object) the unique identifier of the possible dependency
+        :return: (bool) True if the item depends on the other item
+        """
+        if dependency_identifier not in self._indices:
+            raise KeyError(dependency_identifier)
+        # Use whichever side has been collected already, before collecting the ancestors of the item
+        dependency_index = self._indices[dependency_identifier]
+        if dependency_index in self._descendants and self._indices[item_identifier] not in self._ancestors:
+            return item_identifier in self._descendants[dependency_index]
+        return dependency_identifier in self.ancestors(item_identifier)
+
+    def shortest_path(self, item_identifier, dependency_identifier):
+        """
+        Finds the shortest chain of upstream dependencies leading from an item to another item
+        :param item_identifier: (object) the unique identifier of the item
+        :param dependency_identifier: (object) the unique identifier of the dependency to find the chain to
+        :return: (list) the unique identifiers of the items along the chain, starting with the item and ending with
+        the dependency, or None if the item doesn't depend on the dependency
+        """
+        start = self._indices[item_identifier]
+        target = self._indices[dependency_identifier]
+        # Walk breadth first, remembering through which item each item has been reached
+        previous = {start: None}
+        queue = deque([start])
+        while queue:
+            index = queue.popleft()
+            for dependency_index in self._upstream[index]:
+                if dependency_index == target:
+                    path = [self._identifiers[target]]
+                    while index is not None:
+                        path.append(self._identifiers[index])
+                        index = previous[index]
+                    path.reverse()
+                    return path
+                if dependency_index not in previous:
+                    previous[dependency_index] = index
+                    queue.append(dependency_index)
+        return None
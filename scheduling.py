@@ -0,0 +1,182 @@
+from collections import deque
+
+
+class DependencyCycleError(Exception):
+    """
+    Raised when the items of a dependency tree can't be scheduled, because they depend on each other
+    """
+
+    @property
+    def cycle(self):
+        return self._cycle
+
+    def __init__(self, cycle):
+        """
+        Initialize the DependencyCycleError with the cycle that has been detected
+        :param cycle: (list) unique identifiers of the items within the cycle, where each item depends on the item
+        before it, and the first item depends on the last item
+        """
+        super(DependencyCycleError, self).__init__(
+            "A dependency cycle has been detected: {0}".format(
+                " -> ".join(str(item_identifier) for item_identifier in cycle + cycle[:1])
+            )
+        )
+        self._cycle = cycle
+
+
+class Schedule(object):
+    """
+    The Schedule class holds the order in which the items of a dependency tree can be executed. Items are grouped into
+    waves, where the items within a wave only depend on items of earlier waves, so that all items within a wave can be
+    executed concurrently.
+    """
+
+    @property
+    def order(self):
+        return self._order
+
+    @property
+    def waves(self):
+        return self._waves
+
+    @property
+    def critical_path(self):
+        return self._critical_path
+
+    @property
+    def critical_path_length(self):
+        return self._critical_path_length
+
+    def __init__(self, waves, critical_path, critical_path_length):
+        """
+        Initialize the Schedule class with the waves of items
+        :param waves: (list) lists of unique identifiers of the items within each wave
+        :param critical_path: (list) unique identifiers of the longest chain of dependent items, from the most upstream
+        item to the most downstream item
+        :param critical_path_length: (object) the total weight of the items along the critical path
+        """
+        super(Schedule, self).__init__()
+
+        self._waves = waves
+        self._order = [item_identifier for wave in waves for item_identifier in wave]
+        self._critical_path = critical_path
+        self._critical_path_length = critical_path_length
+
+
+def _connect(items):
+    """
+    Collects the unique identifiers of the upstream & downstream dependencies of each item, ignoring dependencies that
+    aren't part of the items
+    :param items: (list) the DependencyItem objects to connect
+    :return: (tuple) the upstream and downstream dependencies, keyed by the unique identifier of each item
+    """
+    upstream = dict()
+    downstream = dict()
+    for processed_item in items:
+        upstream[processed_item.id] = list()
+        downstream[processed_item.id] = list()
+    for processed_item in items:
+        for dependency in processed_item.upstream_dependencies:
+            if dependency.id in upstream:
+                upstream[processed_item.id].append(dependency.id)
+                downstream[dependency.id].append(processed_item.id)
+    return upstream, downstream
+
+
+def _find_cycle(upstream, remaining):
+    """
+    Finds a cycle among the items that couldn't be scheduled, by following their upstream dependencies until an item
+    is visited twice
+    :param upstream: (dict) the unique identifiers of the upstream dependencies of each item
+    :param remaining: (set) unique identifiers of the items that couldn't be scheduled
+    :return: (list) unique identifiers of the items within the cycle
+    """
+    path = list()
+    positions = dict()
+    item_identifier = next(iter(remaining))
+    while item_identifier not in positions:
+        positions[item_identifier] = len(path)
+        path.append(item_identifier)
+        # Every item that couldn't be scheduled depends on at least one other item that couldn't be scheduled
+        item_identifier = next(x for x in upstream[item_identifier] if x in remaining)
+    # The path leads upstream, so reverse the cycle to list each item after the item it depends on
+    return list(reversed(path[positions[item_identifier]:]))
+
+
+def schedule_items(items, weight=None):
+    """
+    Schedules the items of a dependency tree in topological order, in O(N+E)
+    :param items: (list) the DependencyItem objects to schedule, in the order they were processed. Upstream
+    dependencies that aren't part of the list are ignored
+    :param weight: (callable) a function returning the estimated duration of an item, used to calculate the length of
+    the critical path. Each item counts as 1 when no function is given
+    :return: (Schedule) the waves, order & critical path of the items
+    """
+    upstream, downstream = _connect(items)
+    # Kahn's algorithm, where each item is placed in the wave after the latest wave of its dependencies
+    waiting = dict((item_identifier, len(dependencies)) for item_identifier, dependencies in upstream.items())
+    ready = [processed_item.id for processed_item in items if not waiting[processed_item.id]]
+    levels = dict()
+    finish = dict()
+    previous = dict()
+    weights = dict((processed_item.id, weight(processed_item) if weight else 1) for processed_item in items)
+    while ready:
+        item_identifier = ready.pop()
+        # The item can only start once the slowest of its dependencies has finished
+        level, start, previous[item_identifier] = 0, 0, None
+        for dependency_identifier in upstream[item_identifier]:
+            level = max(level, levels[dependency_identifier] + 1)
+            if finish[dependency_identifier] > start:
+                start, previous[item_identifier] = finish[dependency_identifier], dependency_identifier
+        levels[item_identifier] = level
+        finish[item_identifier] = start + weights[item_identifier]
+        for dependency_identifier in downstream[item_identifier]:
+            waiting[dependency_identifier] -= 1
+            if not waiting[dependency_identifier]:
+                ready.append(dependency_identifier)
+
+    if len(finish) != len(upstream):
+        raise DependencyCycleError(_find_cycle(upstream, set(upstream).difference(finish)))
+
+    critical_path = list()
+    if finish:
+        item_identifier = max(finish, key=finish.get)
+        critical_path_length = finish[item_identifier]
+        while item_identifier is not None:
+            critical_path.append(item_identifier)
+            item_identifier = previous[item_identifier]
+        critical_path.reverse()
+    else:
+        critical_path_length = 0
+    # Fill the waves in the order the items were processed in, so that the schedule is deterministic
+    waves = [list() for _ in range(max(levels.values()) + 1 if levels else 0)]
+    for processed_item in items:
+        waves[levels[processed_item.id]].append(processed_item.id)
+    return Schedule(waves, critical_path, critical_path_length)
+
+
+def iterate_items(items):
+    """
+    Yields the items of a dependency tree in topological order, one at a time, without grouping them into waves. Items
+    are yielded as soon as all of their dependencies have been yielded, in the order they were processed otherwise.
+    A DependencyCycleError is raised once no more items can be yielded, when the remaining items depend on each other
+    :param items: (list) the DependencyItem objects to iterate, in the order they were processed. Upstream dependencies
+    that aren't part of the list are ignored
+    :return: (generator) the DependencyItem objects, each after its upstream dependencies
+    """
+    upstream, downstream = _connect(items)
+    processed_items = dict((processed_item.id, processed_item) for processed_item in items)
+    waiting = dict((item_identifier, len(dependencies)) for item_identifier, dependencies in upstream.items())
+    ready = deque(processed_item.id for processed_item in items if not waiting[processed_item.id])
+    yielded = 0
+    while ready:
+        item_identifier = ready.popleft()
+        yielded += 1
+        yield processed_items[item_identifier]
+        for dependency_identifier in downstream[item_identifier]:
+            waiting[dependency_identifier] -= 1
+            if not waiting[dependency_identifier]:
+                ready.append(dependency_identifier)
+
+    if yielded != len(upstream):
+        raise DependencyCycleError(_find_cycle(upstream, set(x for x in waiting if waiting[x])))
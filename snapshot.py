@@ -0,0 +1,346 @@
+"""
+Persistent, memory-mappable snapshots of analysed dependency trees. This module requires Python 3, and is only
+imported by DependencyWrangler.save_snapshot or when loading a snapshot.
+
+A snapshot holds the unique identifiers, types, bypass flags and collapsed dependencies of every item, in the order
+the items were processed, but not the actual objects. All sections are stored as little-endian arrays that are
+memory-mapped when the snapshot is loaded, so loading doesn't depend on the size of the tree. Unique identifiers and
+types are stored as JSON, where tuples are stored as arrays and loaded as tuples again.
+"""
+import hashlib
+import json
+import mmap
+import struct
+import sys
+from array import array
+
+from compact import CompactDependencyGraph
+
+_MAGIC = b'DWSNAP01'
+_SECTIONS = (
+    'identifier_offsets', 'identifiers', 'type_offsets', 'types', 'type_indices', 'bypass',
+    'upstream_offsets', 'upstream_indices', 'downstream_offsets', 'downstream_indices'
+)
+# The magic, the content hash, the source hash, the amount of items and the length in bytes of each section
+_HEADER = struct.Struct('<8s32s32sQ{0}Q'.format(len(_SECTIONS)))
+# The typecode of the arrays within each section
+_TYPECODES = {
+    'identifier_offsets': 'Q',
+    'type_offsets': 'Q',
+    'type_indices': 'I',
+    'bypass': 'B',
+    'upstream_offsets': 'Q',
+    'upstream_indices': 'I',
+    'downstream_offsets': 'Q',
+    'downstream_indices': 'I'
+}
+
+
+class SnapshotError(Exception):
+    """
+    Raised when a snapshot can't be loaded, because it is invalid or doesn't match what was expected of it
+    """
+
+
+class StaleSnapshotError(SnapshotError):
+    """
+    Raised when a snapshot has been saved from a different source than the one it is loaded for
+    """
+
+
+def _digest(source_hash):
+    """
+    Condenses the value identifying the source of a snapshot into the 32 bytes stored within the header
+    """
+    if source_hash is None:
+        return b'\0' * 32
+    if not isinstance(source_hash, bytes):
+        source_hash = str(source_hash).encode('utf-8')
+    return hashlib.sha256(source_hash).digest()
+
+
+def _encode_table(values):
+    """
+    Encodes a list of values as JSON, returning the offsets of each value and the encoded values
+    """
+    offsets = array('Q', [0])
+    encoded = list()
+    for value in values:
+        try:
+            encoded.append(json.dumps(value).encode('utf-8'))
+        except TypeError:
+            raise TypeError("Unable to store {0!r} within a snapshot, as it isn't JSON serializable.".format(value))
+        offsets.append(offsets[-1] + len(encoded[-1]))
+    return offsets, b''.join(encoded)
+
+
+def _decode(data):
+    """
+    Decodes a JSON encoded value. JSON turns tuples into arrays, so arrays are decoded as tuples again, as unique
+    identifiers & types have to be hashable
+    """
+    return _tuples(json.loads(data))
+
+
+def _tuples(value):
+    if isinstance(value, list):
+        return tuple(_tuples(x) for x in value)
+    return value
+
+
+def _to_bytes(values):
+    """
+    Converts an array to little-endian bytes
+    """
+    if values.itemsize > 1 and sys.byteorder != 'little':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+class _EncodedTable(object):
+    """
+    The _EncodedTable class is a sequence of JSON encoded values that are only decoded once they are accessed
+    """
+
+    def __init__(self, offsets, data):
+        self._offsets = offsets
+        self._data = data
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        return _decode(bytes(self._data[self._offsets[index]:self._offsets[index + 1]]).decode('utf-8'))
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+
+class _TypeColumn(object):
+    """
+    The _TypeColumn class is a sequence of the type of each item, looked up through the table of distinct types
+    """
+
+    def __init__(self, type_indices, types):
+        self._type_indices = type_indices
+        self._types = types
+
+    def __len__(self):
+        return len(self._type_indices)
+
+    def __getitem__(self, index):
+        return self._types[self._type_indices[index]]
+
+    def __iter__(self):
+        for type_index in self._type_indices:
+            yield self._types[type_index]
+
+
+class _ResolvedObjects(object):
+    """
+    The _ResolvedObjects class is a sequence of the actual object of each item, which are only resolved from their
+    unique identifier once they are accessed
+    """
+
+    def __init__(self, identifiers, object_resolver_callback):
+        self._identifiers = identifiers
+        self._object_resolver_callback = object_resolver_callback
+        self._objects = dict()
+
+    def __len__(self):
+        return len(self._identifiers)
+
+    def __getitem__(self, index):
+        if self._object_resolver_callback is None:
+            return None
+        if index not in self._objects:
+            self._objects[index] = self._object_resolver_callback(self._identifiers[index])
+        return self._objects[index]
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+
+class DependencySnapshot(CompactDependencyGraph):
+    """
+    The DependencySnapshot class is a CompactDependencyGraph that has been loaded from a snapshot. Its arrays are
+    memory-mapped from the file, the unique identifiers are decoded when they are accessed, and the actual objects are
+    resolved from their unique identifier through the resolver callback once they are accessed.
+    """
+
+    @property
+    def content_hash(self):
+        return self._content_hash
+
+    @property
+    def source_hash(self):
+        return self._source_hash
+
+    def __init__(self, content_hash, source_hash, mapping, views, *args):
+        """
+        Initialize the DependencySnapshot class with the hashes from the header, the mapped file and the arrays that
+        describe the tree
+        :param content_hash: (str) the hexadecimal SHA-256 hash of the sections of the snapshot
+        :param source_hash: (bytes) the digest of the value identifying the source of the snapshot
+        :param mapping: (mmap) the memory-mapped file, or None
+        :param views: (list) the memory views onto the mapped file, which have to be released before closing it
+        :param args: (tuple) the arrays that describe the tree, see *CompactDependencyGraph*
+        """
+        super(DependencySnapshot, self).__init__(*args)
+
+        self._content_hash = content_hash
+        self._source_hash = source_hash
+        self._mapping = mapping
+        self._views = views
+
+    def close(self):
+        """
+        Releases the memory-mapped file. The snapshot can no longer be used afterwards
+        """
+        _release(self._mapping, self._views)
+        self._mapping = None
+        self._views = list()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def _release(mapping, views):
+    """
+    Releases the memory views onto a mapped file, in reverse order of their creation, and closes the mapped file
+    """
+    for view in reversed(views):
+        view.release()
+    if mapping is not None:
+        mapping.close()
+
+
+def save_snapshot(graph, path, source_hash=None):
+    """
+    Saves an analysed tree to a snapshot file. The unique identifiers & types of the items have to be JSON
+    serializable
+    :param graph: (CompactDependencyGraph) the compact representation of the tree to save
+    :param path: (str) the path of the file to save the snapshot to
+    :param source_hash: (object) a value identifying the source of the tree, such as the hash of the scene it was
+    analysed from, which can be checked when loading the snapshot
+    :return: (str) the hexadecimal SHA-256 hash of the content of the snapshot
+    """
+    type_table = list()
+    type_positions = dict()
+    type_indices = array('I')
+    for item_type in graph.types:
+        # Types are told apart by their encoding, as values such as 1 & "1" or 1 & True would otherwise share an entry
+        key = json.dumps(item_type)
+        if key not in type_positions:
+            type_positions[key] = len(type_table)
+            type_table.append(item_type)
+        type_indices.append(type_positions[key])
+    upstream_offsets, upstream_indices, downstream_offsets, downstream_indices = graph.edge_arrays
+    identifier_offsets, identifiers = _encode_table(graph.identifiers)
+    type_offsets, types = _encode_table(type_table)
+    sections = {
+        'identifier_offsets': identifier_offsets,
+        'identifiers': identifiers,
+        'type_offsets': type_offsets,
+        'types': types,
+        'type_indices': type_indices,
+        'bypass': array('B', graph.bypass),
+        'upstream_offsets': array('Q', upstream_offsets),
+        'upstream_indices': array('I', upstream_indices),
+        'downstream_offsets': array('Q', downstream_offsets),
+        'downstream_indices': array('I', downstream_indices)
+    }
+    payload = list()
+    lengths = list()
+    for name in _SECTIONS:
+        data = sections[name]
+        data = data if isinstance(data, bytes) else _to_bytes(data)
+        lengths.append(len(data))
+        # Pad every section to 8 bytes, so that the arrays within the mapped file are aligned
+        payload.append(data + b'\0' * (-len(data) % 8))
+    payload = b''.join(payload)
+    content_hash = hashlib.sha256(payload)
+    with open(path, 'wb') as snapshot_file:
+        snapshot_file.write(_HEADER.pack(_MAGIC, content_hash.digest(), _digest(source_hash), len(graph), *lengths))
+        snapshot_file.write(payload)
+    return content_hash.hexdigest()
+
+
+def load_snapshot(path, object_resolver_callback=None, source_hash=None, content_hash=None, verify=False):
+    """
+    Loads a snapshot file, memory-mapping its arrays
+    :param path: (str) the path of the snapshot file
+    :param object_resolver_callback: (callable) a function to call on a unique identifier to retrieve the actual
+    object, once the object of an item is accessed
+    :param source_hash: (object) the value identifying the source the tree is loaded for. A StaleSnapshotError is
+    raised if the snapshot has been saved with a different value
+    :param content_hash: (str) the hexadecimal hash returned when the snapshot was saved. A StaleSnapshotError is
+    raised if the snapshot holds different content
+    :param verify: (bool) re-calculate the hash of the content, raising a SnapshotError if the file is corrupt
+    :return: (DependencySnapshot) the tree held by the snapshot
+    """
+    with open(path, 'rb') as snapshot_file:
+        try:
+            mapping = mmap.mmap(snapshot_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            raise SnapshotError("The snapshot {0} is empty.".format(path))
+    views = list()
+    try:
+        if len(mapping) < _HEADER.size:
+            raise SnapshotError("The snapshot {0} is truncated.".format(path))
+        header = _HEADER.unpack_from(mapping, 0)
+        magic, stored_content_hash, stored_source_hash, item_count = header[:4]
+        if magic != _MAGIC:
+            raise SnapshotError("{0} is not a snapshot, or has been saved by an incompatible version.".format(path))
+        if source_hash is not None and _digest(source_hash) != stored_source_hash:
+            raise StaleSnapshotError("The snapshot {0} has been saved from a different source.".format(path))
+        hexadecimal_hash = ''.join('{0:02x}'.format(x) for x in bytearray(stored_content_hash))
+        if content_hash is not None and content_hash != hexadecimal_hash:
+            raise StaleSnapshotError("The snapshot {0} holds different content than expected.".format(path))
+        views.append(memoryview(mapping))
+        if verify and hashlib.sha256(views[0][_HEADER.size:]).digest() != stored_content_hash:
+            raise SnapshotError("The content of the snapshot {0} is corrupt.".format(path))
+
+        sections = dict()
+        offset = _HEADER.size
+        for name, length in zip(_SECTIONS, header[4:]):
+            if offset + length > len(mapping):
+                raise SnapshotError("The snapshot {0} is truncated.".format(path))
+            data = views[0][offset:offset + length]
+            views.append(data)
+            typecode = _TYPECODES.get(name)
+            if typecode and typecode != 'B' and sys.byteorder != 'little':
+                # The arrays have been stored as little-endian, so they can only be mapped on little-endian machines
+                data = array(typecode, data.tobytes())
+                data.byteswap()
+            elif typecode:
+                data = data.cast(typecode)
+                views.append(data)
+            sections[name] = data
+            offset += length + (-length % 8)
+
+        identifiers = _EncodedTable(sections['identifier_offsets'], sections['identifiers'])
+        types = list(_EncodedTable(sections['type_offsets'], sections['types']))
+        if len(identifiers) != item_count:
+            raise SnapshotError("The snapshot {0} is corrupt.".format(path))
+    except Exception:
+        _release(mapping, views)
+        raise
+
+    return DependencySnapshot(
+        hexadecimal_hash, stored_source_hash, mapping, views,
+        identifiers,
+        _TypeColumn(sections['type_indices'], types),
+        _ResolvedObjects(identifiers, object_resolver_callback),
+        sections['bypass'],
+        sections['upstream_offsets'], sections['upstream_indices'],
+        sections['downstream_offsets'], sections['downstream_indices']
+    )
@@ -0,0 +1,105 @@
+import asyncio
+
+from ..wrangler import DependencyWrangler
+from .test_wrangler import SampleDependencyObject, construct_sample_tree_item, \
+    construct_sample_multi_type_tree_item, construct_sample_deep_tree_item, create_sample_wrangler
+
+
+class ConcurrencyCounter(object):
+    def __init__(self):
+        self.current = 0
+        self.maximum = 0
+
+    async def wrap(self, value):
+        self.current += 1
+        self.maximum = max(self.maximum, self.current)
+        await asyncio.sleep(0)
+        self.current -= 1
+        return value
+
+
+def create_wrangler(counter=None, **kwargs):
+    counter = counter or ConcurrencyCounter()
+    return DependencyWrangler(
+        object_class=SampleDependencyObject,
+        object_upstream_callback=lambda x: counter.wrap(x.upstream_dependencies()),
+        object_downstream_callback=lambda x: counter.wrap(x.downstream_dependencies()),
+        object_identifier_callback=lambda x: counter.wrap(x.id),
+        object_type_callback=lambda x: counter.wrap(x.type),
+        **kwargs
+    )
+
+
+def summarize(wrangler):
+    return [
+        (key, value.type, value.bypass,
+         [x.id for x in value.upstream_dependencies],
+         [x.id for x in value.downstream_dependencies])
+        for key, value in wrangler.items.items()
+    ], dict(
+        (key, (value['numeric_id'], value['dependencies']))
+        for key, value in wrangler.available_objects.items()
+    )
+
+
+class TestAsynchronousAnalysis:
+    def test_async_dependency_wrangler_analysis(self):
+        """
+        Ensure that the analysis through coroutine callbacks builds the same tree as the synchronous analysis
+        """
+        item_names, item = construct_sample_multi_type_tree_item()
+        for kwargs in (dict(), dict(bypass_types=[item_names[2]]), dict(max_workers=2)):
+            wrangler = create_wrangler(**kwargs)
+            root = asyncio.run(wrangler.analyse_async(item))
+
+            expected_wrangler = create_sample_wrangler(**kwargs)
+            expected_wrangler.analyse(item)
+            assert root.id == item_names[0]
+            assert summarize(wrangler) == summarize(expected_wrangler)
+
+    def test_async_dependency_wrangler_concurrency(self):
+        """
+        Ensure that the callbacks of independent objects are awaited concurrently, up to the concurrency limit
+        """
+        root = SampleDependencyObject("AsyncRoot")
+        for i in range(50):
+            item = SampleDependencyObject("AsyncItem{0}".format(i))
+            item.append_downstream_dependency(root)
+            root.append_upstream_dependency(item)
+
+        counter = ConcurrencyCounter()
+        asyncio.run(create_wrangler(counter).analyse_async(root))
+        assert counter.maximum > 10
+
+        counter = ConcurrencyCounter()
+        wrangler = create_wrangler(counter)
+        asyncio.run(wrangler.analyse_async(root, concurrency=4))
+        assert counter.maximum == 4
+        assert len(wrangler.analysed_objects) == 51
+
+    def test_deep_async_dependency_wrangler_analysis(self):
+        """
+        Ensure that the analysis through coroutine callbacks is not limited by the depth of the tree
+        """
+        item_names, item = construct_sample_deep_tree_item(3000)
+        wrangler = create_wrangler()
+        asyncio.run(wrangler.analyse_async(item))
+        assert list(wrangler.analysed_objects) == item_names
+
+    def test_bounded_async_dependency_wrangler_analysis(self):
+        """
+        Ensure that the analysis through coroutine callbacks links the items at the bounds of an earlier bounded
+        analysis to the objects it defines
+        """
+        item_names, item = construct_sample_tree_item()
+        middle = item.upstream_dependencies()[0].upstream_dependencies()[0]
+        wrangler = create_sample_wrangler()
+        wrangler.analyse(middle, direction="upstream")
+        asyncio.run(wrangler.analyse_async(item))
+
+        assert [x.id for x in wrangler.items[item_names[2]].downstream_dependencies] == [item_names[1]]
+        for value in wrangler.items.values():
+            for dependency in value.upstream_dependencies:
+                assert value in dependency.downstream_dependencies
+            for dependency in value.downstream_dependencies:
+                assert value in dependency.upstream_dependencies
@@ -0,0 +1,71 @@
+import pytest
+from ..cache import CallbackCache
+
+
+class TestCallbackCache:
+    def test_callback_cache_hits(self):
+        """
+        Ensure that the callback is only called once for each object, and that the hits & misses are counted
+        """
+        calls = []
+        cache = CallbackCache(lambda x: calls.append(x) or len(calls))
+        first, second = object(), object()
+
+        assert cache(first) == 1
+        assert cache(second) == 2
+        assert cache(first) == 1
+        assert calls == [first, second]
+        assert cache.hits == 1
+        assert cache.misses == 2
+        assert len(cache) == 2
+
+        cache.discard(first)
+        assert cache(first) == 3
+
+        cache.clear()
+        assert len(cache) == 0
+        assert cache.hits == 0
+        assert cache.misses == 0
+
+    def test_callback_cache_identity(self):
+        """
+        Ensure that objects are cached by their identity, rather than their equality
+        """
+        cache = CallbackCache(id)
+        first, second = [], []
+
+        assert cache(first) != cache(second)
+
+    def test_bounded_callback_cache(self):
+        """
+        Ensure that the least recently used values are evicted once the cache is full
+        """
+        calls = []
+        cache = CallbackCache(lambda x: calls.append(x) or x, maxsize=2)
+        items = [object() for _ in range(3)]
+
+        cache(items[0])
+        cache(items[1])
+        cache(items[0])
+        cache(items[2])
+        assert len(cache) == 2
+
+        cache(items[0])
+        assert calls == [items[0], items[1], items[2]]
+        cache(items[1])
+        assert calls == [items[0], items[1], items[2], items[1]]
+
+    def test_converted_callback_cache(self):
+        """
+        Ensure that the values are converted before they are cached, so that iterators can be returned more than once
+        """
+        cache = CallbackCache(lambda x: iter(x), convert=list)
+        item = [1, 2, 3]
+
+        assert cache(item) == item
+        assert cache(item) == item
+        assert cache.hits == 1
+
+    def test_invalid_callback_cache_size(self):
+        with pytest.raises(ValueError):
+            CallbackCache(id, maxsize=0)
@@ -0,0 +1,55 @@
+import re
+
+import pytest
+from ..classifier import TypeClassifier
+
+
+class TestTypeClassifier:
+    def test_bypass_type_classifier(self):
+        """
+        Ensure that exact types, glob patterns and regular expressions are bypassed
+        """
+        classifier = TypeClassifier(bypass_types=["Switch", "Merge*", re.compile("copy", re.IGNORECASE)])
+
+        assert classifier("Switch")
+        assert classifier("Merge")
+        assert classifier("Merge2")
+        assert classifier("Copy")
+        assert not classifier("Switch2")
+        assert not classifier("AMerge")
+        assert not classifier("Read")
+
+    def test_required_type_classifier(self):
+        """
+        Ensure that all types other than the required types are bypassed
+        """
+        classifier = TypeClassifier(required_types=["Write", "rop_*"])
+
+        assert not classifier("Write")
+        assert not classifier("rop_geometry")
+        assert classifier("Merge")
+
+    def test_single_type_classifier(self):
+        """
+        Ensure that a single type is treated as a type, rather than a collection of characters
+        """
+        classifier = TypeClassifier(bypass_types="Merge")
+
+        assert classifier("Merge")
+        assert not classifier("M")
+        assert TypeClassifier(bypass_types=3)(3)
+
+    def test_cached_type_classifier(self):
+        """
+        Ensure that the verdict for each type is cached, and that unhashable types are still classified
+        """
+        classifier = TypeClassifier(bypass_types=["Merge*"])
+
+        assert classifier("Merge") and classifier("Merge")
+        assert list(classifier._verdicts) == ["Merge"]
+        assert not classifier(["Merge"])
+        assert not TypeClassifier()("Merge")
+
+    def test_overspecified_type_classifier(self):
+        with pytest.raises(Exception, match=".*specified"):
+            TypeClassifier(bypass_types=["Merge"], required_types=["Write"])
@@ -0,0 +1,27 @@
+import pytest
+from .test_wrangler import create_analysed_sample_wrangler
+
+
+class TestCompactDependencyGraph:
+    def test_compact_dependency_graph(self):
+        """
+        Ensure that the compact representation of an analysed tree holds the same items and dependencies
+        """
+        item_names, wrangler = create_analysed_sample_wrangler()
+        graph = wrangler.compact()
+
+        assert len(graph) == len(item_names)
+        assert list(graph) == list(wrangler.analysed_objects)
+        for key, value in wrangler.items.items():
+            compact_item = graph[key]
+            assert key in graph
+            assert compact_item == graph.item(graph.index(key))
+            assert compact_item.to_dict() == value.to_dict()
+            assert [x.id for x in compact_item.upstream_dependencies] == \
+                [x.id for x in value.upstream_dependencies]
+            assert [x.id for x in compact_item.downstream_dependencies] == \
+                [x.id for x in value.downstream_dependencies]
+        assert [key for key, _ in graph.items()] == list(graph)
+
+        with pytest.raises(KeyError):
+            graph["Missing"]
@@ -0,0 +1,60 @@
+from ..diff import diff_graphs
+from ..snapshot import load_snapshot
+from .test_wrangler import SampleDependencyObject, construct_sample_multi_type_tree_item, create_sample_wrangler
+
+
+def republish():
+    """
+    Analyses the sample tree, then changes the type of one item, replaces the most upstream item by a new item and
+    analyses the changed tree with a new wrangler
+    """
+    item_names, item = construct_sample_multi_type_tree_item()
+    previous = create_sample_wrangler(bypass_types=[item_names[2]])
+    previous.analyse(item)
+
+    items = dict((key, value.object) for key, value in previous.items.items())
+    items[item_names[1]].type = "Changed"
+    new_item = SampleDependencyObject("MultiTypeItemF", "Basic")
+    items[item_names[3]]._upstream_dependencies = [new_item]
+    new_item.append_downstream_dependency(items[item_names[3]])
+    current = create_sample_wrangler(bypass_types=[item_names[2]])
+    current.analyse(item)
+    return item_names, previous, current
+
+
+class TestGraphDiff:
+    def test_identical_graphs(self):
+        item_names, item = construct_sample_multi_type_tree_item()
+        wrangler = create_sample_wrangler(bypass_types=[item_names[2]])
+        wrangler.analyse(item)
+        difference = diff_graphs(wrangler, wrangler.compact())
+
+        assert not difference
+        assert difference.changed == []
+
+    def test_diff_wranglers(self):
+        """
+        Ensure that added & removed items, changed types and changed dependencies are reported
+        """
+        item_names, previous, current = republish()
+        difference = current.diff(previous)
+
+        assert difference
+        assert difference.added == ["MultiTypeItemF"]
+        assert difference.removed == [item_names[4]]
+        assert difference.type_changes == {item_names[1]: (item_names[1], "Changed")}
+        assert difference.bypass_changes == {}
+        assert sorted(difference.added_edges) == [(item_names[3], "MultiTypeItemF")]
+        assert sorted(difference.removed_edges) == [(item_names[3], item_names[4])]
+        assert difference.changed == [item_names[1], item_names[3], "MultiTypeItemF"]
+
+    def test_diff_snapshot(self, tmp_path):
+        """
+        Ensure that a wrangler can be compared against a snapshot of the previous tree
+        """
+        item_names, previous, current = republish()
+        path = str(tmp_path / "previous.snapshot")
+        previous.save_snapshot(path)
+
+        with load_snapshot(path) as snapshot:
+            assert current.diff(snapshot).to_dict() == current.diff(previous).to_dict()
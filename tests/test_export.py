@@ -0,0 +1,99 @@
+import pytest
+from ..export import LocalDeadlineConnection, build_jobs, job_payload, reduce_dependencies, submit_jobs
+from ..offline import PlainGraph, create_wrangler
+
+
+def construct_export_wrangler(upstream=None):
+    """
+    Analyses a chain of a Read, two Grades & a Write, where the Write depends on the Read both through the chain and
+    directly, and on the last Grade through a bypassed Merge
+    """
+    graph = PlainGraph(
+        {"Read": "Read", "Grade1": "Grade", "Grade2": "Grade", "Merge": "Merge", "Write": "Write"},
+        upstream or {"Grade1": ["Read"], "Grade2": ["Grade1"], "Merge": ["Grade2"], "Write": ["Merge", "Read"]}
+    )
+    wrangler = create_wrangler(graph, bypass_types=["Merge"])
+    wrangler.analyse("Write")
+    return wrangler
+
+
+def job_info(job):
+    return {'Plugin': 'Nuke'}
+
+
+class TestExport:
+    def test_reduce_dependencies(self):
+        """
+        Ensure that dependencies implied by other dependencies are dropped
+        """
+        wrangler = construct_export_wrangler()
+        reduced = reduce_dependencies(wrangler, list(wrangler.iterate_available_items()))
+
+        assert reduced == {"Read": [], "Grade1": ["Read"], "Grade2": ["Grade1"], "Write": ["Grade2"]}
+
+    def test_build_jobs(self):
+        wrangler = construct_export_wrangler()
+        jobs = build_jobs(wrangler)
+
+        assert [job.name for job in jobs] == ["Read", "Grade1", "Grade2", "Write"]
+        assert [[x.name for x in job.dependencies] for job in jobs] == [[], ["Read"], ["Grade1"], ["Grade2"]]
+        assert [job.wave for job in jobs] == [0, 1, 2, 3]
+
+    def test_merge_chains(self):
+        """
+        Ensure that only linear chains of items of the same type are merged into a single job
+        """
+        wrangler = construct_export_wrangler()
+        jobs = build_jobs(wrangler, merge_chains=True)
+
+        assert [[x.id for x in job.items] for job in jobs] == [["Read"], ["Grade1", "Grade2"], ["Write"]]
+        assert [[x.name for x in job.dependencies] for job in jobs] == [[], ["Read"], ["Grade1"]]
+
+        # A Grade that another item depends on as well can't be merged into the chain
+        wrangler = construct_export_wrangler(
+            {"Grade1": ["Read"], "Grade2": ["Grade1"], "Merge": ["Grade2", "Write"], "Write": ["Grade1"]}
+        )
+        jobs = build_jobs(wrangler, merge_chains=True)
+
+        assert sorted([x.id for x in job.items] for job in jobs) == [["Grade1"], ["Grade2"], ["Read"], ["Write"]]
+        assert dict((job.name, [x.name for x in job.dependencies]) for job in jobs) == {
+            "Read": [], "Grade1": ["Read"], "Grade2": ["Grade1"], "Write": ["Grade1"]
+        }
+
+    def test_cycle(self):
+        wrangler = construct_export_wrangler({"Read": ["Write"], "Grade1": ["Read"], "Write": ["Grade1"]})
+
+        # The module is imported both within & outside of the package, so the error is matched by its message
+        with pytest.raises(Exception, match="cycle"):
+            build_jobs(wrangler)
+
+    def test_job_payload(self):
+        jobs = build_jobs(construct_export_wrangler(), merge_chains=True)
+        payload = job_payload(jobs[1], job_info, lambda job: {'WriteNode': job.items[-1].id}, batch_name="Shot")
+
+        assert payload['JobInfo'] == {
+            'Plugin': 'Nuke', 'Name': 'Grade1', 'BatchName': 'Shot', 'JobDependencies': 'Read'
+        }
+        assert payload['PluginInfo'] == {'WriteNode': 'Grade2'}
+
+    def test_submit_jobs(self):
+        """
+        Ensure that the jobs are submitted a wave at a time, depending on the Deadline job IDs of earlier waves
+        """
+        graph = PlainGraph(
+            {"Plate": "Read", "Matte": "Read", "Key": "Keyer", "Comp": "Write"},
+            {"Key": ["Plate"], "Comp": ["Key", "Matte", "Plate"]}
+        )
+        wrangler = create_wrangler(graph)
+        wrangler.analyse("Comp")
+        connection = LocalDeadlineConnection()
+        job_identifiers = submit_jobs(connection, build_jobs(wrangler), job_info)
+
+        assert connection.Jobs.calls == 3
+        assert [x['JobInfo']['Name'] for x in connection.submitted] == ["Plate", "Matte", "Key", "Comp"]
+        identifiers = dict((job.name, value) for job, value in job_identifiers.items())
+        assert connection.submitted[2]['JobInfo']['JobDependencies'] == identifiers["Plate"]
+        assert connection.submitted[3]['JobInfo']['JobDependencies'] == ",".join(
+            [identifiers["Key"], identifiers["Matte"]]
+        )
+        assert "JobDependencies" not in connection.submitted[0]['JobInfo']
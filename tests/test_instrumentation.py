@@ -0,0 +1,86 @@
+from ..instrumentation import AnalysisStats
+from .test_wrangler import SampleDependencyObject, construct_sample_multi_type_tree_item, create_sample_wrangler
+
+
+class TestAnalysisStats:
+    def test_stats_record(self):
+        """
+        Ensure that events are counted & timed, passed on to the hooks, and forgotten on reset
+        """
+        events = []
+        stats = AnalysisStats([lambda *x: events.append(x)])
+        stats.record("visit", 3)
+        stats.record_callback("upstream", 0.5)
+        stats.record_callback("upstream", 0.25)
+
+        assert stats.visited == 3
+        assert stats.callback_counts == {"upstream": 2}
+        assert stats.callback_durations == {"upstream": 0.75}
+        assert events == [("visit", 3, None), ("callback.upstream", 1, 0.5), ("callback.upstream", 1, 0.25)]
+
+        stats.reset()
+        assert stats.to_dict()["callback_counts"] == {}
+        assert stats.hooks
+
+    def test_disabled_instrumentation(self):
+        item_names, item = construct_sample_multi_type_tree_item()
+        wrangler = create_sample_wrangler(bypass_types=[item_names[2]])
+        wrangler.analyse(item)
+
+        assert wrangler.stats is None
+        assert wrangler.object_upstream_callback is SampleDependencyObject.upstream_dependencies
+
+    def test_instrumented_analysis(self):
+        """
+        Ensure that the calls to the callbacks, the visits, the collapses and the building of the available objects
+        are recorded whilst analysing a tree
+        """
+        events = []
+        item_names, item = construct_sample_multi_type_tree_item()
+        wrangler = create_sample_wrangler(
+            bypass_types=[item_names[2]], instrumentation_hooks=[lambda *x: events.append(x)]
+        )
+        wrangler.analyse(item)
+        wrangler.analyse(item)
+        stats = wrangler.stats
+
+        assert stats.callback_counts == {"upstream": len(item_names), "downstream": len(item_names)}
+        assert all(duration >= 0 for duration in stats.callback_durations.values())
+        # Every connection between two items is visited from both items, besides visiting the object itself twice
+        assert stats.visited == 2 * (len(item_names) - 1) + 2
+        assert stats.duplicates == stats.visited - len(item_names)
+        # The bypassed item is collapsed for the items on either side of it
+        assert stats.collapses == 2
+        assert stats.available_objects_builds == 0
+
+        wrangler.available_objects
+        wrangler.available_objects
+        assert stats.available_objects_builds == 1
+        assert stats.available_objects_duration >= 0
+        assert stats.available_records == 0
+
+        duration = stats.available_objects_duration
+        record = wrangler.available_objects[item_names[0]]
+        record['dependencies']
+        record['data']
+        assert stats.available_records == 1
+        wrangler.available_objects.to_dict()
+        assert stats.available_records == len(item_names) - 1
+        assert stats.available_objects_duration > duration
+        assert stats.to_dict()["available_records"] == len(item_names) - 1
+        assert sum(x[1] for x in events if x[0] == "callback.upstream") == len(item_names)
+        assert stats.to_dict()["collapses"] == 2
+
+    def test_instrumented_cached_analysis(self):
+        """
+        Ensure that only the calls that miss the cache of the callbacks are recorded
+        """
+        item_names, item = construct_sample_multi_type_tree_item()
+        wrangler = create_sample_wrangler(
+            bypass_types=[item_names[2]], instrument=True, cache_callbacks=True, object_identifier_callback=lambda x: x.id
+        )
+        wrangler.analyse(item)
+
+        assert wrangler.stats.visited > len(item_names)
+        assert wrangler.stats.callback_counts["identifier"] == len(item_names)
+        assert wrangler.callback_caches["identifier"].misses == len(item_names)
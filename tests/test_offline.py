@@ -0,0 +1,63 @@
+import random
+
+import pytest
+from ..offline import PlainGraph, analyse_graph, shard_components
+
+
+def construct_plain_graph(components, size, seed=0):
+    """
+    Builds a graph of several random components, with the items of the components interleaved, where a third of the
+    items are Merges
+    """
+    generator = random.Random(seed)
+    types = dict()
+    upstream = dict()
+    members = [list() for _ in range(components)]
+    for i in range(components * size):
+        item_identifier = "Item{0}".format(i)
+        component = members[generator.randrange(components)]
+        types[item_identifier] = "Merge" if generator.random() < 0.3 else "Basic"
+        upstream[item_identifier] = sorted(set(generator.choice(component) for _ in range(2))) if component else []
+        component.append(item_identifier)
+    return PlainGraph(types, upstream)
+
+
+def summarize(wrangler):
+    return [
+        (key, value.type, value.bypass, wrangler._numeric_identifiers.get(key),
+         [x.id for x in value.upstream_dependencies], [x.id for x in value.downstream_dependencies])
+        for key, value in wrangler.items.items()
+    ]
+
+
+class TestOfflineAnalysis:
+    def test_components(self):
+        graph = PlainGraph(
+            {"A": "Basic", "B": "Basic", "C": "Basic", "D": "Basic", "E": "Basic"},
+            {"C": ["A"], "E": ["D"], "D": ["C"]}
+        )
+
+        assert graph.components() == [["A", "C", "D", "E"], ["B"]]
+        assert graph.downstream("A") == ["C"]
+        with pytest.raises(ValueError, match="'C' -> 'Missing'"):
+            PlainGraph({"C": "Basic"}, {"C": ["Missing"]})
+        assert shard_components([["A", "B"], ["C"], ["D", "E", "F"], ["G"]], 3) == [
+            ["A", "B", "C"], ["D", "E", "F"], ["G"]
+        ]
+        with pytest.raises(ValueError):
+            shard_components([], 0)
+
+    @pytest.mark.parametrize("shard_size", [None, 50])
+    def test_parallel_analysis(self, shard_size):
+        """
+        Ensure that analysing the components across processes builds the same tree as a serial analysis
+        """
+        graph = construct_plain_graph(components=8, size=25)
+        serial = analyse_graph(graph, bypass_types=["Merge"], processes=1)
+        parallel = analyse_graph(graph, bypass_types=["Merge"], processes=2, shard_size=shard_size)
+
+        assert len(graph.components()) > 1
+        assert summarize(parallel) == summarize(serial)
+        assert parallel.available_objects.keys() == serial.available_objects.keys()
+        for key, value in serial.available_objects.items():
+            assert parallel.available_objects[key]['dependencies'] == value['dependencies']
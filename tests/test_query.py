@@ -0,0 +1,76 @@
+import pytest
+from ..item import DependencyItem
+from ..query import DependencyIndex
+from .test_scheduling import connect, construct_diamond_items
+from .test_wrangler import construct_sample_tree_item, create_analysed_sample_wrangler
+
+
+class TestDependencyIndex:
+    def test_ancestors_and_descendants(self):
+        """
+        Ensure that the items reachable in either direction are collected, reusing the items collected before
+        """
+        index = DependencyIndex(construct_diamond_items())
+
+        assert index.ancestors("Slow") == frozenset(["Right", "Read"])
+        assert index.ancestors("Write") == frozenset(["Left", "Right", "Slow", "Read"])
+        assert index.ancestors("Read") == frozenset()
+        assert index.descendants("Right") == frozenset(["Slow", "Write"])
+        assert index.descendants("Read") == frozenset(["Left", "Right", "Slow", "Write"])
+        with pytest.raises(KeyError):
+            index.ancestors("Missing")
+
+    def test_depends_on(self):
+        index = DependencyIndex(construct_diamond_items())
+
+        assert index.depends_on("Write", "Read")
+        assert not index.depends_on("Read", "Write")
+        assert not index.depends_on("Left", "Right")
+        index.descendants("Right")
+        assert index.depends_on("Slow", "Right")
+        assert not index.depends_on("Left", "Right")
+
+    def test_shortest_path(self):
+        items = construct_diamond_items()
+        shortcut = DependencyItem("Shortcut", "Basic", None)
+        items.append(shortcut)
+        connect(items[0], shortcut)
+        connect(shortcut, items[3])
+        index = DependencyIndex(items)
+
+        assert index.shortest_path("Write", "Read") == ["Write", "Left", "Read"]
+        assert index.shortest_path("Slow", "Read") in (["Slow", "Right", "Read"], ["Slow", "Shortcut", "Read"])
+        assert index.shortest_path("Write", "Slow") == ["Write", "Slow"]
+        assert index.shortest_path("Read", "Write") is None
+
+    def test_cycle(self):
+        """
+        Ensure that items within a cycle are reachable from themselves
+        """
+        items = construct_diamond_items()
+        connect(items[4], items[1])
+        index = DependencyIndex(items)
+
+        assert "Left" in index.ancestors("Left")
+        assert index.depends_on("Left", "Write")
+        assert index.shortest_path("Left", "Left") == ["Left", "Write", "Left"]
+
+    def test_dependency_wrangler_queries(self):
+        """
+        Ensure that the wrangler answers queries through the collapsed dependencies, and indexes the tree again once
+        it has changed
+        """
+        item_names, wrangler = create_analysed_sample_wrangler()
+
+        assert wrangler.ancestors(item_names[0]) == frozenset(item_names[1:2] + item_names[3:])
+        assert wrangler.descendants(item_names[4]) == frozenset(item_names[:2] + item_names[3:4])
+        assert wrangler.depends_on(item_names[1], item_names[4])
+        assert not wrangler.depends_on(item_names[1], item_names[2])
+        assert wrangler.shortest_path(item_names[0], item_names[3]) == [item_names[0], item_names[1], item_names[3]]
+        query_index = wrangler.query_index
+        assert wrangler.query_index is query_index
+
+        other_names, other_item = construct_sample_tree_item()
+        wrangler.analyse(other_item)
+        assert wrangler.query_index is not query_index
+        assert wrangler.ancestors(other_names[0]) == frozenset(other_names[1:])
@@ -0,0 +1,87 @@
+import pytest
+from ..item import DependencyItem
+from ..scheduling import DependencyCycleError, iterate_items, schedule_items
+from .test_wrangler import create_analysed_sample_wrangler
+
+
+def connect(upstream_item, downstream_item):
+    downstream_item.append_upstream_dependency(upstream_item)
+    upstream_item.append_downstream_dependency(downstream_item)
+
+
+def construct_diamond_items():
+    items = [DependencyItem(item_name, "Basic", None) for item_name in ["Read", "Left", "Right", "Slow", "Write"]]
+    connect(items[0], items[1])
+    connect(items[0], items[2])
+    connect(items[2], items[3])
+    connect(items[1], items[4])
+    connect(items[3], items[4])
+    return items
+
+
+class TestScheduling:
+    def test_schedule_waves(self):
+        """
+        Ensure that items are grouped into waves after their dependencies, in the order they were processed
+        """
+        schedule = schedule_items(construct_diamond_items())
+
+        assert schedule.waves == [["Read"], ["Left", "Right"], ["Slow"], ["Write"]]
+        assert schedule.order == ["Read", "Left", "Right", "Slow", "Write"]
+        assert schedule.critical_path == ["Read", "Right", "Slow", "Write"]
+        assert schedule.critical_path_length == 4
+
+    def test_weighted_schedule(self):
+        """
+        Ensure that the critical path follows the estimated durations of the items
+        """
+        durations = {"Read": 1, "Left": 10, "Right": 2, "Slow": 3, "Write": 1}
+        schedule = schedule_items(construct_diamond_items(), weight=lambda x: durations[x.id])
+
+        assert schedule.critical_path == ["Read", "Left", "Write"]
+        assert schedule.critical_path_length == 12
+
+    def test_empty_schedule(self):
+        schedule = schedule_items([])
+
+        assert schedule.waves == []
+        assert schedule.critical_path == []
+        assert schedule.critical_path_length == 0
+
+    def test_schedule_cycle(self):
+        """
+        Ensure that a cycle between items is reported, with the items in dependency order
+        """
+        items = construct_diamond_items()
+        connect(items[4], items[1])
+
+        with pytest.raises(DependencyCycleError, match="cycle") as error:
+            schedule_items(items)
+        cycle = error.value.cycle
+        assert sorted(cycle) == ["Left", "Write"]
+        assert "{0} -> {1} -> {0}".format(*cycle) in str(error.value)
+
+    def test_iterate_items(self):
+        """
+        Ensure that items are yielded after their dependencies, and that a cycle is only reported once no more items
+        can be yielded
+        """
+        assert [x.id for x in iterate_items(construct_diamond_items())] == ["Read", "Left", "Right", "Slow", "Write"]
+
+        items = construct_diamond_items()
+        connect(items[4], items[1])
+        iterator = iterate_items(items)
+        assert [x.id for x in [next(iterator), next(iterator)]] == ["Read", "Right"]
+        with pytest.raises(DependencyCycleError) as error:
+            list(iterator)
+        assert sorted(error.value.cycle) == ["Left", "Write"]
+
+    def test_dependency_wrangler_schedule(self):
+        """
+        Ensure that the wrangler only schedules the items that are not being bypassed
+        """
+        item_names, wrangler = create_analysed_sample_wrangler()
+        schedule = wrangler.schedule()
+
+        assert schedule.order == [item_names[4], item_names[3], item_names[1], item_names[0]]
+        assert schedule.critical_path_length == 4
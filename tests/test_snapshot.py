@@ -0,0 +1,102 @@
+import os
+
+import pytest
+from ..snapshot import SnapshotError, StaleSnapshotError, load_snapshot
+from ..wrangler import DependencyWrangler
+from .test_wrangler import create_analysed_sample_wrangler
+
+
+class TestSnapshot:
+    def test_snapshot_roundtrip(self, tmp_path):
+        """
+        Ensure that a snapshot holds the same items & dependencies, and only resolves the objects once accessed
+        """
+        item_names, wrangler = create_analysed_sample_wrangler()
+        path = str(tmp_path / "tree.snapshot")
+        content_hash = wrangler.save_snapshot(path, source_hash="scene-v1")
+
+        resolved = []
+        objects = dict((key, value.object) for key, value in wrangler.items.items())
+        with load_snapshot(path, lambda x: resolved.append(x) or objects[x], source_hash="scene-v1",
+                           content_hash=content_hash, verify=True) as snapshot:
+            assert snapshot.content_hash == content_hash
+            assert list(snapshot) == list(wrangler.analysed_objects)
+            for key, value in wrangler.items.items():
+                snapshot_item = snapshot[key]
+                assert snapshot_item.type == value.type
+                assert snapshot_item.bypass == value.bypass
+                assert [x.id for x in snapshot_item.upstream_dependencies] == \
+                    [x.id for x in value.upstream_dependencies]
+                assert [x.id for x in snapshot_item.downstream_dependencies] == \
+                    [x.id for x in value.downstream_dependencies]
+            assert resolved == []
+            assert snapshot[list(objects)[1]].object is list(objects.values())[1]
+            assert resolved == [list(objects)[1]]
+
+    def test_tuple_snapshot(self, tmp_path):
+        """
+        Ensure that tuple identifiers & types are loaded as tuples, so that they can be looked up and compared
+        """
+        types = {("Geo", 1): ("Sop", "v1"), ("Geo", 2): ("Sop", "v1"), ("Rop", 1): ("Rop", "v2")}
+        wrangler = DependencyWrangler.from_edges(types, [(("Rop", 1), ("Geo", 2)), (("Geo", 2), ("Geo", 1))])
+        path = str(tmp_path / "tree.snapshot")
+        wrangler.save_snapshot(path)
+
+        with load_snapshot(path) as snapshot:
+            assert list(snapshot.identifiers) == list(types)
+            assert snapshot[("Rop", 1)].type == ("Rop", "v2")
+            assert [x.id for x in snapshot[("Rop", 1)].upstream_dependencies] == [("Geo", 2)]
+            assert not wrangler.diff(snapshot)
+
+    def test_mixed_type_snapshot(self, tmp_path):
+        """
+        Ensure that types which are equal, or encode to the same string, are kept apart in the snapshot
+        """
+        types = {"a": "1", "b": 1, "c": "null", "d": None, "e": True, "f": 1.0}
+        wrangler = DependencyWrangler.from_edges(types, [("b", "a"), ("d", "c")])
+        path = str(tmp_path / "tree.snapshot")
+        wrangler.save_snapshot(path)
+
+        with load_snapshot(path) as snapshot:
+            assert [(type(snapshot[x].type), snapshot[x].type) for x in types] == \
+                [(type(x), x) for x in types.values()]
+            assert not wrangler.diff(snapshot).type_changes
+
+    def test_stale_snapshot(self, tmp_path):
+        """
+        Ensure that a snapshot saved from a different source, or holding different content, is detected
+        """
+        path = str(tmp_path / "tree.snapshot")
+        create_analysed_sample_wrangler()[1].save_snapshot(path, source_hash="scene-v1")
+
+        with pytest.raises(StaleSnapshotError):
+            load_snapshot(path, source_hash="scene-v2")
+        with pytest.raises(StaleSnapshotError):
+            load_snapshot(path, content_hash="0" * 64)
+
+    def test_corrupt_snapshot(self, tmp_path):
+        """
+        Ensure that corrupt, truncated and foreign files are rejected
+        """
+        path = str(tmp_path / "tree.snapshot")
+        create_analysed_sample_wrangler()[1].save_snapshot(path)
+        with open(path, "rb") as snapshot_file:
+            data = bytearray(snapshot_file.read())
+
+        data[-1] ^= 0xff
+        with open(path, "wb") as snapshot_file:
+            snapshot_file.write(data)
+        load_snapshot(path).close()
+        with pytest.raises(SnapshotError, match="corrupt"):
+            load_snapshot(path, verify=True)
+
+        with open(path, "wb") as snapshot_file:
+            snapshot_file.write(data[:len(data) // 2])
+        with pytest.raises(SnapshotError, match="truncated"):
+            load_snapshot(path)
+
+        with open(path, "wb") as snapshot_file:
+            snapshot_file.write(b"not a snapshot" * 20)
+        with pytest.raises(SnapshotError, match="not a snapshot"):
+            load_snapshot(path)
+        os.remove(path)
@@ -0,0 +1,95 @@
+import pytest
+from .test_wrangler import SampleDependencyObject, construct_sample_tree_item, create_analysed_sample_wrangler
+
+
+class TestAvailableObjects:
+    def test_lazy_records(self):
+        """
+        Ensure that records are only created once they are accessed, and are cached afterwards
+        """
+        item_names, wrangler = create_analysed_sample_wrangler()
+        available_objects = wrangler.available_objects
+
+        assert available_objects._records == {}
+        assert list(available_objects) == item_names[:2] + item_names[3:]
+        assert item_names[2] not in available_objects
+        with pytest.raises(KeyError):
+            available_objects[item_names[2]]
+
+        record = available_objects[item_names[1]]
+        assert list(available_objects._records) == [item_names[1]]
+        assert available_objects[item_names[1]] is record
+        assert record['numeric_id'] == record.numeric_id == 1
+        assert record._dependencies is None
+        assert record['dependencies'] == [{'id': item_names[3], 'numeric_id': 2}]
+        assert record['data']['bypass'] is False
+        assert record['item'] is wrangler.items[item_names[1]]
+        with pytest.raises(TypeError):
+            record['numeric_id'] = 5
+
+    def test_plain_records(self):
+        item_names, wrangler = create_analysed_sample_wrangler()
+        plain = wrangler.available_objects.to_dict()
+
+        assert type(plain[item_names[0]]) is dict
+        assert plain[item_names[0]]['dependencies'] == [{'id': item_names[1], 'numeric_id': 1}]
+        assert plain == dict(wrangler.available_objects)
+
+    def test_released_records(self):
+        """
+        Ensure that available objects that have been handed out keep their items once the tree changes
+        """
+        item_names, wrangler = create_analysed_sample_wrangler()
+        available_objects = wrangler.available_objects
+        other_names, other_item = construct_sample_tree_item()
+        wrangler.analyse(other_item)
+
+        assert len(available_objects) == len(item_names) - 1
+        assert other_names[0] not in available_objects
+        assert wrangler.available_objects[other_names[0]]['numeric_id'] == len(item_names) - 1
+
+    def test_reanalysed_records(self):
+        """
+        Ensure that available objects that have been handed out keep describing the tree as it was once it has been
+        reanalysed, including records that haven't been accessed before
+        """
+        item_names, wrangler = create_analysed_sample_wrangler()
+        available_objects = wrangler.available_objects
+        record = available_objects[item_names[0]]
+        changed = wrangler.items[item_names[1]].object
+        added = SampleDependencyObject("Added")
+        changed.append_upstream_dependency(added)
+        added.append_downstream_dependency(changed)
+        wrangler.invalidate([item_names[1]])
+        wrangler.reanalyse()
+
+        assert available_objects[item_names[1]]['dependencies'] == [{'id': item_names[3], 'numeric_id': 2}]
+        assert record['dependencies'] == [{'id': item_names[1], 'numeric_id': 1}]
+        assert "Added" not in available_objects
+        assert [x['id'] for x in wrangler.available_objects[item_names[1]]['dependencies']] == [item_names[3], "Added"]
+
+    def test_held_records(self):
+        """
+        Ensure that records keep describing the tree as it was whilst they are held on their own, that only the
+        records of the items that change are formatted, and that mappings that are no longer held aren't kept up to date
+        """
+        item_names, wrangler = create_analysed_sample_wrangler()
+        record = wrangler.available_objects[item_names[1]]
+        changed = wrangler.items[item_names[1]].object
+        added = SampleDependencyObject("Added")
+        changed.append_upstream_dependency(added)
+        added.append_downstream_dependency(changed)
+        wrangler.invalidate([item_names[1]])
+        wrangler.reanalyse()
+
+        assert record['dependencies'] == [{'id': item_names[3], 'numeric_id': 2}]
+        assert record._available_objects is None
+        available_objects = wrangler.available_objects
+        wrangler.analyse(SampleDependencyObject("Other"))
+        assert available_objects._frozen == {}
+        assert "Other" not in available_objects
+
+        del record, available_objects
+        wrangler.available_objects[item_names[0]]
+        wrangler.analyse(SampleDependencyObject("Another"))
+        assert wrangler._held_available_objects() == []
@@ -1,3 +1,5 @@
+import sys
+
 import pytest
 from ..wrangler import DependencyWrangler
 
@@ -63,6 +65,50 @@ def construct_sample_multi_type_tree_item():
 
     return (item_names, items[0])
 
+def construct_sample_deep_tree_item(depth):
+    items = [
+        SampleDependencyObject("DeepItem{0}".format(i))
+        for i in range(depth)
+    ]
+
+    for i in range(len(items)):
+        if i != 0:
+            items[i].append_downstream_dependency(items[i-1])
+        if i < len(items)-1:
+            items[i].append_upstream_dependency(items[i+1])
+
+    return ([item.id for item in items], items[0])
+
+def construct_sample_wide_tree_item(width):
+    root = SampleDependencyObject("WideRoot")
+    item_names = []
+    for i in range(width):
+        item = SampleDependencyObject("WideItem{0}".format(i))
+        item.append_downstream_dependency(root)
+        root.append_upstream_dependency(item)
+        item_names.append(item.id)
+
+    return (item_names, root)
+
+def create_sample_wrangler(**kwargs):
+    return DependencyWrangler(
+        object_class=SampleDependencyObject,
+        object_upstream_callback=SampleDependencyObject.upstream_dependencies,
+        object_downstream_callback=SampleDependencyObject.downstream_dependencies,
+        object_identifier_attribute="id",
+        object_type_attribute="type",
+        **kwargs
+    )
+
+def create_analysed_sample_wrangler(**kwargs):
+    """
+    Analyses the sample multi type tree, bypassing the type of its third item
+    """
+    item_names, item = construct_sample_multi_type_tree_item()
+    wrangler = create_sample_wrangler(bypass_types=[item_names[2]], **kwargs)
+    wrangler.analyse(item)
+    return (item_names, wrangler)
+
 class TestDependencyWrangler:
     def test_empty_dependency_wrangler_class_creation(self):
         """
@@ -290,4 +336,515 @@ class TestDependencyWrangler:
             assert bypass_item_type not in processed_item.upstream_dependencies
             assert bypass_item_type not in processed_item.downstream_dependencies
 
-        assert wrangler.available_objects == bypass_item_type
\ No newline at end of file
+        assert wrangler.available_objects == bypass_item_type
+
+    def test_deep_dependency_wrangler_analysis(self):
+        """
+        Ensure that the analysis of a dependency tree that is far deeper than the recursion limit completes, and that
+        every item is linked to its neighbours
+        """
+        wrangler = self.test_dependency_wrangler_class_creation()
+        item_names, item = construct_sample_deep_tree_item(sys.getrecursionlimit() * 5)
+        root = wrangler.analyse(item)
+
+        assert root.id == item_names[0]
+        assert len(wrangler.analysed_objects) == len(item_names)
+        for i in range(len(item_names)):
+            item_name = item_names[i]
+            if i != 0:
+                assert [x.id for x in wrangler.items[item_name].downstream_dependencies] == [item_names[i-1]]
+            if i < len(item_names) - 1:
+                assert [x.id for x in wrangler.items[item_name].upstream_dependencies] == [item_names[i+1]]
+
+    def test_wide_dependency_wrangler_analysis(self):
+        """
+        Ensure that the analysis of a dependency tree with a wide fan-out keeps the order of the dependencies
+        """
+        wrangler = self.test_dependency_wrangler_class_creation()
+        item_names, item = construct_sample_wide_tree_item(1000)
+        root = wrangler.analyse(item)
+
+        assert [x.id for x in root.upstream_dependencies] == item_names
+        for item_name in item_names:
+            assert [x.id for x in wrangler.items[item_name].downstream_dependencies] == [root.id]
+
+    def test_dependency_wrangler_available_objects(self):
+        """
+        Ensure that the numeric IDs follow the order in which the items were processed, and that the available
+        objects are only rebuilt once the dependency tree has changed
+        """
+        item_names, item = construct_sample_multi_type_tree_item()
+        wrangler = self.test_dependency_wrangler_bypassed_class_creation([item_names[2]])
+        wrangler.analyse(item)
+
+        available_objects = wrangler.available_objects
+        available_names = [item_name for item_name in item_names if item_name != item_names[2]]
+        assert sorted(available_objects) == sorted(available_names)
+        for numeric_id, item_name in enumerate(available_names):
+            assert available_objects[item_name]['numeric_id'] == numeric_id
+            for dependency in available_objects[item_name]['dependencies']:
+                assert dependency['numeric_id'] == available_names.index(dependency['id'])
+        assert wrangler.available_objects is available_objects
+
+        wrangler.analyse(item)
+        assert wrangler.available_objects is available_objects
+
+        other_names, other_item = construct_sample_tree_item()
+        wrangler.analyse(other_item)
+        assert wrangler.available_objects is not available_objects
+        for numeric_id, item_name in enumerate(available_names + other_names):
+            assert wrangler.available_objects[item_name]['numeric_id'] == numeric_id
+
+    def test_dependency_wrangler_iterate_available_objects(self):
+        """
+        Ensure that the available objects are streamed in topological order, with the same information as
+        available_objects
+        """
+        item_names, item = construct_sample_multi_type_tree_item()
+        wrangler = self.test_dependency_wrangler_bypassed_class_creation([item_names[2]])
+        wrangler.analyse(item)
+
+        iterator = wrangler.iterate_available_objects()
+        assert wrangler._available_objects is None
+        streamed = list()
+        for key, value in iterator:
+            for dependency in value['dependencies']:
+                assert dependency['id'] in streamed
+            streamed.append(key)
+            assert value == wrangler.available_objects[key]
+        assert sorted(streamed) == sorted(wrangler.available_objects)
+        assert [x.id for x in wrangler.iterate_available_items()] == streamed
+
+    def summarize_dependency_tree(self, wrangler):
+        return dict(
+            (key, (value.type, value.bypass,
+                   [x.id for x in value.upstream_dependencies],
+                   [x.id for x in value.downstream_dependencies]))
+            for key, value in wrangler.items.items()
+        )
+
+    def summarize_available_objects(self, wrangler):
+        return dict(
+            (key, (value['numeric_id'], value['dependencies']))
+            for key, value in wrangler.available_objects.items()
+        )
+
+    def test_incremental_dependency_wrangler_analysis(self):
+        """
+        Ensure that re-analysing invalidated items only queries the changed objects, and produces the same tree as
+        analysing the changed tree from scratch
+        """
+        item_names, item = construct_sample_multi_type_tree_item()
+        bypass_item_type = "Merge"
+        wrangler = self.test_dependency_wrangler_bypassed_class_creation([bypass_item_type])
+        wrangler.analyse(item)
+        items = dict((key, value.object) for key, value in wrangler.items.items())
+
+        queried = []
+        upstream_callback = wrangler._callbacks['upstream']
+        wrangler._callbacks['upstream'] = lambda x: queried.append(x.id) or upstream_callback(x)
+
+        # Bypass the middle item, and insert a new item between the last two items
+        items[item_names[2]].type = bypass_item_type
+        new_item = SampleDependencyObject("MultiTypeItemF", bypass_item_type)
+        items[item_names[3]]._upstream_dependencies = [new_item]
+        items[item_names[4]]._downstream_dependencies = [new_item]
+        new_item.append_upstream_dependency(items[item_names[4]])
+        new_item.append_downstream_dependency(items[item_names[3]])
+
+        wrangler.invalidate([item_names[2], item_names[3], item_names[4]])
+        rebuilt = wrangler.reanalyse()
+
+        assert sorted(queried) == sorted([item_names[2], item_names[3], item_names[4], new_item.id])
+        assert item_names[0] not in rebuilt
+        assert wrangler.items[item_names[1]].upstream_dependencies[0].id == item_names[3]
+        assert wrangler.items[item_names[3]].upstream_dependencies[0].id == item_names[4]
+
+        fresh_wrangler = self.test_dependency_wrangler_bypassed_class_creation([bypass_item_type])
+        fresh_wrangler.analyse(item)
+        assert self.summarize_dependency_tree(wrangler) == self.summarize_dependency_tree(fresh_wrangler)
+        assert self.summarize_available_objects(wrangler) == self.summarize_available_objects(fresh_wrangler)
+
+        # Remove the inserted item again, reconnecting its neighbours
+        items[item_names[3]]._upstream_dependencies = [items[item_names[4]]]
+        items[item_names[4]]._downstream_dependencies = [items[item_names[3]]]
+        wrangler.invalidate([new_item.id], removed=True)
+        wrangler.reanalyse()
+
+        assert new_item.id not in wrangler.analysed_objects
+        fresh_wrangler = self.test_dependency_wrangler_bypassed_class_creation([bypass_item_type])
+        fresh_wrangler.analyse(item)
+        assert self.summarize_dependency_tree(wrangler) == self.summarize_dependency_tree(fresh_wrangler)
+        assert self.summarize_available_objects(wrangler) == self.summarize_available_objects(fresh_wrangler)
+
+    def test_removed_dependency_wrangler_analysis(self):
+        """
+        Ensure that removed items are unlinked straight away, so that the tree can be queried before it is
+        reanalysed, and that the numeric IDs stay unique meanwhile
+        """
+        item_names, item = construct_sample_deep_tree_item(3)
+        wrangler = self.test_dependency_wrangler_class_creation()
+        wrangler.analyse(item)
+        removed = item.upstream_dependencies().pop()
+        removed.upstream_dependencies().pop().downstream_dependencies().remove(removed)
+        wrangler.invalidate([item_names[1]], removed=True)
+        new_item = SampleDependencyObject("NewDeepItem")
+        wrangler.analyse(new_item)
+
+        numeric_identifiers = [value['numeric_id'] for value in wrangler.available_objects.values()]
+        assert sorted(numeric_identifiers) == list(range(len(wrangler.available_objects)))
+        assert item_names[1] not in wrangler.available_objects
+        assert wrangler.available_objects[item_names[0]]['dependencies'] == []
+        assert wrangler.items[item_names[2]].downstream_dependencies == []
+        assert wrangler.ancestors(item_names[0]) == set()
+        assert not wrangler.depends_on(item_names[0], item_names[2])
+
+        wrangler.reanalyse()
+        expected_wrangler = self.test_dependency_wrangler_class_creation()
+        for expected_item in (item, wrangler.items[item_names[2]].object, new_item):
+            expected_wrangler.analyse(expected_item)
+        assert self.summarize_available_objects(wrangler) == self.summarize_available_objects(expected_wrangler)
+
+    def test_bounded_dependency_wrangler_analysis(self):
+        """
+        Ensure that a bounded analysis only queries the objects within its bounds, and that a later analysis walks
+        past the bounds to produce the same tree as an unbounded analysis
+        """
+        item_names, item = construct_sample_tree_item()
+        middle = item.upstream_dependencies()[0].upstream_dependencies()[0]
+        wrangler = self.test_dependency_wrangler_class_creation()
+
+        wrangler.analyse(middle, direction="upstream")
+        assert sorted(wrangler.items) == item_names[2:]
+        assert [x.id for x in wrangler.items[item_names[3]].downstream_dependencies] == [item_names[2]]
+        assert wrangler.items[item_names[2]].downstream_dependencies == []
+
+        wrangler.analyse(middle, max_depth=1)
+        assert sorted(wrangler.items) == item_names[1:]
+        assert [x.id for x in wrangler.items[item_names[1]].upstream_dependencies] == [item_names[2]]
+        assert wrangler.items[item_names[1]].downstream_dependencies == []
+
+        wrangler.analyse(middle)
+        expected_wrangler = self.test_dependency_wrangler_class_creation()
+        expected_wrangler.analyse(item)
+        assert self.summarize_dependency_tree(wrangler) == self.summarize_dependency_tree(expected_wrangler)
+
+        with pytest.raises(ValueError):
+            wrangler.analyse(item, direction="sideways")
+        with pytest.raises(ValueError):
+            wrangler.analyse(item, max_depth=-1)
+
+    def test_bounded_reanalysed_dependency_wrangler_analysis(self):
+        """
+        Ensure that the items at the bounds of a bounded analysis are linked to the objects a later unbounded pass
+        connects to them, in both directions
+        """
+        item_names, item = construct_sample_deep_tree_item(5)
+        middle = item.upstream_dependencies()[0].upstream_dependencies()[0]
+        bound = middle.upstream_dependencies()[0].upstream_dependencies()[0]
+        wrangler = self.test_dependency_wrangler_class_creation()
+        wrangler.analyse(middle, direction="upstream")
+
+        bound.append_downstream_dependency(middle)
+        middle.append_upstream_dependency(bound)
+        wrangler.invalidate([middle.id])
+        wrangler.reanalyse()
+
+        assert [x.id for x in wrangler.items[middle.id].upstream_dependencies] == item_names[3:]
+        assert [x.id for x in wrangler.items[bound.id].downstream_dependencies] == item_names[2:4][::-1]
+
+        wrangler.analyse(item)
+        expected_wrangler = self.test_dependency_wrangler_class_creation()
+        expected_wrangler.analyse(item)
+        assert self.summarize_dependency_tree(wrangler) == self.summarize_dependency_tree(expected_wrangler)
+
+    def test_stopped_dependency_wrangler_analysis(self):
+        """
+        Ensure that the analysis doesn't walk past the items the stop callback returns True for, whilst bypassed
+        items are still collapsed
+        """
+        item_names, item = construct_sample_multi_type_tree_item()
+        wrangler = self.test_dependency_wrangler_bypassed_class_creation([item_names[2]])
+        root = wrangler.analyse(item, direction="upstream", stop_callback=lambda x: x.type == item_names[3])
+
+        assert sorted(wrangler.items) == item_names[:4]
+        assert [x.id for x in root.upstream_dependencies] == [item_names[1]]
+        assert [x.id for x in wrangler.items[item_names[1]].upstream_dependencies] == [item_names[3]]
+        assert [x.id for x in wrangler.items[item_names[3]].downstream_dependencies] == [item_names[1]]
+        assert wrangler.items[item_names[3]].upstream_dependencies == []
+
+    def test_many_dependency_wrangler_analysis(self):
+        """
+        Ensure that analysing several objects at once builds the same tree as analysing them one at a time, and that
+        each view only holds the items reachable from its object
+        """
+        item_names, item = construct_sample_tree_item()
+        middle = item.upstream_dependencies()[0].upstream_dependencies()[0]
+        wrangler = self.test_dependency_wrangler_class_creation()
+        views = wrangler.analyse_many([middle, item], direction="upstream")
+
+        assert [view.item.id for view in views] == [item_names[2], item_names[0]]
+        assert sorted(views[0]) == item_names[2:]
+        assert sorted(views[1]) == item_names
+        assert views[1][item_names[3]] is wrangler.items[item_names[3]]
+        assert sorted(views[0].available_objects) == item_names[2:]
+
+        expected_wrangler = self.test_dependency_wrangler_class_creation()
+        expected_wrangler.analyse(middle, direction="upstream")
+        expected_wrangler.analyse(item, direction="upstream")
+        assert self.summarize_dependency_tree(wrangler) == self.summarize_dependency_tree(expected_wrangler)
+
+        wrangler = self.test_dependency_wrangler_class_creation()
+        views = wrangler.analyse_many([item, middle])
+        assert len(views[0]) == len(views[1]) == len(item_names)
+
+    def test_many_stopped_dependency_wrangler_analysis(self):
+        """
+        Ensure that an object another object's walk has stopped at is still walked from when analysing several objects
+        """
+        geometry = SampleDependencyObject("Geo", "Geo")
+        rops = [SampleDependencyObject("RopA", "Rop"), SampleDependencyObject("RopB", "Rop")]
+        for downstream_item, upstream_item in ((rops[0], rops[1]), (rops[1], geometry)):
+            downstream_item.append_upstream_dependency(upstream_item)
+            upstream_item.append_downstream_dependency(downstream_item)
+
+        wrangler = self.test_dependency_wrangler_class_creation()
+        views = wrangler.analyse_many(rops, direction="upstream", stop_callback=lambda x: x.type == "Rop")
+
+        assert [x.id for x in wrangler.items["RopA"].upstream_dependencies] == ["RopB"]
+        assert [x.id for x in wrangler.items["RopB"].upstream_dependencies] == ["Geo"]
+        assert sorted(views[1]) == ["Geo", "RopB"]
+
+    def test_cached_dependency_wrangler_analysis(self):
+        """
+        Ensure that each object is only queried once when the callbacks are cached, and that the caches are
+        invalidated alongside the items
+        """
+        queried = dict(identifier=[], type=[], upstream=[], downstream=[])
+        wrangler = DependencyWrangler(
+            object_class=SampleDependencyObject,
+            object_upstream_callback=lambda x: queried['upstream'].append(x.id) or x.upstream_dependencies(),
+            object_downstream_callback=lambda x: queried['downstream'].append(x.id) or x.downstream_dependencies(),
+            object_identifier_callback=lambda x: queried['identifier'].append(x.id) or x.id,
+            object_type_callback=lambda x: queried['type'].append(x.id) or x.type,
+            object_identifier_attribute="id",
+            object_type_attribute="type",
+            cache_callbacks=True
+        )
+        item_names, item = construct_sample_tree_item()
+        wrangler.analyse(item)
+
+        for name, item_queried in queried.items():
+            assert sorted(item_queried) == sorted(item_names)
+            assert wrangler.callback_caches[name].misses == len(item_names)
+        assert wrangler.callback_caches['identifier'].hits > 0
+
+        wrangler.invalidate([item_names[0]])
+        wrangler.reanalyse()
+        assert queried['upstream'].count(item_names[0]) == 2
+        assert queried['upstream'].count(item_names[1]) == 1
+
+        wrangler.clear_callback_caches()
+        assert wrangler.callback_caches['identifier'].hits == 0
+
+        wrangler = DependencyWrangler(
+            object_class=SampleDependencyObject,
+            object_upstream_callback=lambda x: iter(x.upstream_dependencies()),
+            object_downstream_callback=lambda x: iter(x.downstream_dependencies()),
+            object_identifier_attribute="id",
+            object_type_attribute="type",
+            cache_callbacks=True
+        )
+        wrangler.analyse(item)
+        wrangler.invalidate([item_names[1]])
+        wrangler.reanalyse()
+        assert list(wrangler.callback_caches['upstream'](item)) == item.upstream_dependencies()
+        expected_wrangler = self.test_dependency_wrangler_class_creation()
+        expected_wrangler.analyse(item)
+        assert self.summarize_dependency_tree(wrangler) == self.summarize_dependency_tree(expected_wrangler)
+
+    def test_batched_dependency_wrangler_analysis(self):
+        """
+        Ensure that the analysis through batch callbacks queries each level of the tree at once, and builds the same
+        tree as the analysis through the callbacks for a single object
+        """
+        calls = dict(identifier=[], type=[], upstream=[], downstream=[])
+        wrangler = DependencyWrangler(
+            object_class=SampleDependencyObject,
+            object_upstream_batch_callback=lambda x: calls['upstream'].append(len(x)) or [
+                item.upstream_dependencies() for item in x
+            ],
+            object_downstream_batch_callback=lambda x: calls['downstream'].append(len(x)) or [
+                item.downstream_dependencies() for item in x
+            ],
+            object_identifier_batch_callback=lambda x: calls['identifier'].append(len(x)) or [item.id for item in x],
+            object_type_batch_callback=lambda x: calls['type'].append(len(x)) or [item.type for item in x],
+            bypass_types=["MultiTypeItemC"]
+        )
+        item_names, item = construct_sample_multi_type_tree_item()
+        root = wrangler.analyse(item)
+
+        assert root.id == item_names[0]
+        assert calls['upstream'] == [1] * len(item_names)
+        assert calls['downstream'] == [1] * len(item_names)
+        assert len(calls['identifier']) == len(item_names) + 1
+
+        expected_wrangler = self.test_dependency_wrangler_bypassed_class_creation(["MultiTypeItemC"])
+        expected_wrangler.analyse(item)
+        assert self.summarize_dependency_tree(wrangler) == self.summarize_dependency_tree(expected_wrangler)
+
+        item_names, item = construct_sample_wide_tree_item(10)
+        wrangler.analyse(item)
+        assert calls['upstream'][-2:] == [1, 10]
+
+    def test_parallel_dependency_wrangler_analysis(self):
+        """
+        Ensure that the analysis in parallel builds the same tree, in the same order, regardless of the amount of
+        workers
+        """
+        root = SampleDependencyObject("ParallelRoot")
+        for i in range(20):
+            branch = SampleDependencyObject("ParallelBranch{0}".format(i), "Merge" if i % 3 == 0 else "Basic")
+            branch.append_downstream_dependency(root)
+            root.append_upstream_dependency(branch)
+            for j in range(5):
+                leaf = SampleDependencyObject("ParallelLeaf{0}".format(j))
+                leaf.append_downstream_dependency(branch)
+                branch.append_upstream_dependency(leaf)
+
+        summaries = []
+        for max_workers in (1, 2, 8):
+            wrangler = create_sample_wrangler(bypass_types=["Merge"], max_workers=max_workers)
+            wrangler.analyse(root)
+            summaries.append((
+                list(wrangler.analysed_objects),
+                self.summarize_dependency_tree(wrangler),
+                self.summarize_available_objects(wrangler)
+            ))
+
+        assert summaries[0] == summaries[1] == summaries[2]
+        assert len(summaries[0][0]) == 26
+
+        with pytest.raises(ValueError):
+            DependencyWrangler(max_workers=0)
+
+    def test_pattern_bypassed_dependency_wrangler_analysis(self):
+        """
+        Ensure that items are bypassed when their type matches a glob pattern
+        """
+        item_names, item = construct_sample_multi_type_tree_item()
+        wrangler = self.test_dependency_wrangler_bypassed_class_creation(["*C", "*D"])
+        wrangler.analyse(item)
+
+        assert sorted(wrangler.available_objects) == sorted([item_names[0], item_names[1], item_names[4]])
+        assert [x.id for x in wrangler.items[item_names[1]].upstream_dependencies] == [item_names[4]]
+
+    def test_collapsed_dependency_wrangler_analysis(self):
+        """
+        Ensure that chains of bypassed items are collapsed into the nearest items that are not bypassed, without
+        duplicating dependencies, including when the bypassed items form a cycle
+        """
+        def connect(upstream_item, downstream_item):
+            downstream_item.append_upstream_dependency(upstream_item)
+            upstream_item.append_downstream_dependency(downstream_item)
+
+        read = SampleDependencyObject("Read")
+        other_read = SampleDependencyObject("OtherRead")
+        merges = [SampleDependencyObject("Merge{0}".format(i), "Merge") for i in range(4)]
+        write = SampleDependencyObject("Write")
+        other_write = SampleDependencyObject("OtherWrite")
+        connect(read, merges[0])
+        connect(read, merges[1])
+        connect(merges[0], merges[2])
+        connect(merges[1], merges[2])
+        connect(merges[2], write)
+        connect(merges[1], write)
+        connect(merges[2], other_write)
+        # A cycle between bypassed items, which also pulls in a second read
+        connect(merges[3], merges[1])
+        connect(merges[1], merges[3])
+        connect(other_read, merges[3])
+
+        wrangler = self.test_dependency_wrangler_bypassed_class_creation(["Merge"])
+        wrangler.analyse(write)
+
+        assert [x.id for x in wrangler.items["Write"].upstream_dependencies] == ["Read", "OtherRead"]
+        assert [x.id for x in wrangler.items["OtherWrite"].upstream_dependencies] == ["Read", "OtherRead"]
+        assert [x.id for x in wrangler.items["Read"].downstream_dependencies] == ["Write", "OtherWrite"]
+        assert [x.id for x in wrangler.items["OtherRead"].downstream_dependencies] == ["Write", "OtherWrite"]
+        assert [x.id for x in wrangler.items["Merge0"].upstream_dependencies] == ["Read"]
+        for merge in merges[1:]:
+            assert [x.id for x in wrangler.items[merge.id].upstream_dependencies] == ["Read", "OtherRead"]
+
+    def test_collapsed_required_dependency_wrangler_analysis(self):
+        """
+        Ensure that items that aren't required are collapsed like bypassed items, along the direction of each
+        dependency, rather than being dropped
+        """
+        item_names, item = construct_sample_multi_type_tree_item()
+        wrangler = self.test_dependency_wrangler_required_class_creation([item_names[0], item_names[4]])
+        wrangler.analyse(item)
+
+        assert [x.id for x in wrangler.items[item_names[0]].upstream_dependencies] == [item_names[4]]
+        assert wrangler.items[item_names[0]].downstream_dependencies == []
+        assert [x.id for x in wrangler.items[item_names[4]].downstream_dependencies] == [item_names[0]]
+        assert [x.id for x in wrangler.items[item_names[2]].upstream_dependencies] == [item_names[4]]
+        assert [x.id for x in wrangler.items[item_names[2]].downstream_dependencies] == [item_names[0]]
+
+    def test_from_edges(self):
+        """
+        Ensure that a tree built from plain edges is linked the same way as the tree analysed through the callbacks
+        """
+        from ..offline import analyse_graph
+        from .test_offline import construct_plain_graph
+
+        graph = construct_plain_graph(4, 50)
+        edges = [(x, dependency) for x in graph.types for dependency in graph.upstream(x)]
+        wrangler = DependencyWrangler.from_edges(graph.types, edges, bypass_types=["Merge"])
+        analysed = analyse_graph(graph, bypass_types=["Merge"], processes=1)
+
+        def summarize(summarized):
+            return dict(
+                (key, (value.type, value.bypass, [x.id for x in value.upstream_dependencies],
+                       [x.id for x in value.downstream_dependencies]))
+                for key, value in summarized.items.items()
+            )
+
+        assert list(wrangler.items) == list(graph.types)
+        assert summarize(wrangler) == summarize(analysed)
+        assert list(wrangler.available_objects) == [x for x in graph.types if graph.types[x] != "Merge"]
+
+        # The items can be reanalysed once their type changes
+        graph.types["Item0"] = "Merge"
+        wrangler.invalidate(["Item0"])
+        wrangler.reanalyse()
+        assert wrangler.items["Item0"].bypass
+
+    def test_from_edges_required_types(self):
+        types = {"Read": "Read", "Merge": "Merge", "Grade": "Grade", "Write": "Write"}
+        edges = [("Merge", "Read"), ("Grade", "Merge"), ("Grade", "Merge"), ("Write", "Grade"), ("Write", "Read")]
+        wrangler = DependencyWrangler.from_edges(types, edges, required_types=["Read", "Write"])
+
+        assert [key for key, value in wrangler.items.items() if not value.bypass] == ["Read", "Write"]
+        assert [x.id for x in wrangler.items["Write"].upstream_dependencies] == ["Read"]
+        assert [x.id for x in wrangler.items["Read"].downstream_dependencies] == ["Write"]
+        assert [x.id for x in wrangler.items["Grade"].upstream_dependencies] == ["Read"]
+        with pytest.raises(ValueError):
+            DependencyWrangler.from_edges(types, [("Write", "Missing")])
+
+    def test_from_edge_array(self):
+        numpy = pytest.importorskip("numpy")
+        types = {"Read": "Read", "Merge": "Merge", "Grade": "Grade", "Write": "Write"}
+        edges = [("Merge", "Read"), ("Grade", "Merge"), ("Write", "Grade"), ("Write", "Read")]
+        indices = dict((key, index) for index, key in enumerate(types))
+        array = numpy.array([[indices[x], indices[y]] for x, y in edges], dtype=numpy.uint32)
+        wrangler = DependencyWrangler.from_edges(types, array, bypass_types=["Merge"])
+        expected = DependencyWrangler.from_edges(types, edges, bypass_types=["Merge"])
+
+        for key, value in expected.items.items():
+            assert [x.id for x in wrangler.items[key].upstream_dependencies] == \
+                [x.id for x in value.upstream_dependencies]
+            assert [x.id for x in wrangler.items[key].downstream_dependencies] == \
+                [x.id for x in value.downstream_dependencies]
+        with pytest.raises(ValueError):
+            DependencyWrangler.from_edges(types, numpy.array([[0, 4]]))
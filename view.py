@@ -0,0 +1,306 @@
+import weakref
+
+from instrumentation import AVAILABLE_RECORDS, _clock
+
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+
+
+class AnalysisView(Mapping):
+    """
+    The AnalysisView class is a read-only view onto the part of the dependency tree of a DependencyWrangler that is
+    reachable from a single object, as returned for each object by *DependencyWrangler.analyse_many*. All views share
+    the tree of the wrangler, and the items within a view are only collected once the view is first accessed
+    """
+
+    @property
+    def item(self):
+        return self._wrangler.items[self._item_identifier]
+
+    @property
+    def direction(self):
+        return self._direction
+
+    @property
+    def available_objects(self):
+        """
+        Returns the information about the items within the view that are not being bypassed, as listed by
+        *DependencyWrangler.available_objects*
+        :return: (dict) information about each item within the view
+        """
+        available_objects = self._wrangler.available_objects
+        return dict((key, available_objects[key]) for key, value in self.items() if not value.bypass)
+
+    def __init__(self, wrangler, item_identifier, direction='both'):
+        """
+        Initialize the AnalysisView class with the wrangler that holds the tree, and the object to view the tree from
+        :param wrangler: (DependencyWrangler) the wrangler that has analysed the tree
+        :param item_identifier: (object) the unique identifier of the object to view the tree from
+        :param direction: (str) the direction in which dependencies are followed from the object: 'upstream',
+        'downstream' or 'both'
+        """
+        super(AnalysisView, self).__init__()
+
+        self._wrangler = wrangler
+        self._item_identifier = item_identifier
+        self._direction = direction
+        self._items = None
+
+    def _collect(self):
+        """
+        Collects the items reachable from the object by following the dependencies of the items, breadth first
+        :return: (dict) the DependencyItem objects within the view, keyed by their unique identifier
+        """
+        if self._items is None:
+            root = self.item
+            self._items = {root.id: root}
+            level = [root]
+            while level:
+                next_level = list()
+                for processed_item in level:
+                    dependencies = list()
+                    if self._direction != 'downstream':
+                        dependencies.extend(processed_item.upstream_dependencies)
+                    if self._direction != 'upstream':
+                        dependencies.extend(processed_item.downstream_dependencies)
+                    for dependency in dependencies:
+                        if dependency.id not in self._items:
+                            self._items[dependency.id] = dependency
+                            next_level.append(dependency)
+                level = next_level
+        return self._items
+
+    def __getitem__(self, item_identifier):
+        return self._collect()[item_identifier]
+
+    def __iter__(self):
+        return iter(self._collect())
+
+    def __len__(self):
+        return len(self._collect())
+
+
+class DependencyRecord(Mapping):
+    """
+    The DependencyRecord class is a read-only record of a single dependency of an available object, holding the unique
+    identifier and numeric ID of the dependency under the *id* and *numeric_id* keys
+    """
+    __slots__ = ('_id', '_numeric_id')
+    _keys = ('id', 'numeric_id')
+
+    @property
+    def id(self):
+        return self._id
+
+    @property
+    def numeric_id(self):
+        return self._numeric_id
+
+    def __init__(self, item_identifier, numeric_identifier):
+        self._id = item_identifier
+        self._numeric_id = numeric_identifier
+
+    def __getitem__(self, key):
+        if key == 'id':
+            return self._id
+        if key == 'numeric_id':
+            return self._numeric_id
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class AvailableRecord(Mapping):
+    """
+    The AvailableRecord class is a read-only record of an available object, holding the DependencyItem object, its
+    numeric ID, the records of its dependencies and the information of the item itself under the *item*,
+    *numeric_id*, *dependencies* and *data* keys. The dependencies & information are only formatted once they are
+    first accessed, or once the item is about to change, see *_freeze*
+    """
+    __slots__ = ('_item', '_numeric_id', '_numeric_identifiers', '_available_objects', '_dependencies', '_data',
+                 '__weakref__')
+    _keys = ('item', 'numeric_id', 'dependencies', 'data')
+
+    @property
+    def item(self):
+        return self._item
+
+    @property
+    def numeric_id(self):
+        return self._numeric_id
+
+    @property
+    def dependencies(self):
+        if self._dependencies is None:
+            self._format()
+        return self._dependencies
+
+    @property
+    def data(self):
+        if self._data is None:
+            self._format()
+        return self._data
+
+    def __init__(self, item, available_objects):
+        """
+        Initialize the AvailableRecord class with the item, and the available objects it is listed by. The record
+        keeps the available objects alive, so that the wrangler keeps the record describing the item as it was
+        :param item: (DependencyItem) the item the record describes
+        :param available_objects: (AvailableObjects) the available objects that list the item
+        """
+        self._item = item
+        self._numeric_identifiers = available_objects._numeric_identifiers
+        self._numeric_id = self._numeric_identifiers[item.id]
+        self._available_objects = available_objects
+        self._dependencies = None
+        self._data = None
+
+    def _format(self, timed=True):
+        """
+        Formats the dependencies & information of the record. The time spent is recorded when the instrumentation of
+        the wrangler has been enabled
+        :param timed: (bool) False when the time spent is recorded for a whole batch of records instead
+        """
+        stats = self._available_objects._stats if timed else None
+        if stats is not None:
+            start = _clock()
+        numeric_identifiers = self._numeric_identifiers
+        self._dependencies = [
+            DependencyRecord(dependency.id, numeric_identifiers[dependency.id])
+            for dependency in self._item.upstream_dependencies
+        ]
+        self._data = self._item.to_dict()
+        if stats is not None:
+            stats.record(AVAILABLE_RECORDS, 1, _clock() - start)
+
+    def _freeze(self):
+        """
+        Formats the dependencies & information of the record before the item changes, so that the record keeps
+        describing the item as it was, after which the record no longer refers to the available objects
+        :return: (bool) True if the record had to be formatted
+        """
+        formatted = self._dependencies is None
+        if formatted:
+            self._format(False)
+        self._numeric_identifiers = None
+        self._available_objects = None
+        return formatted
+
+    def __getitem__(self, key):
+        if key not in self._keys:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+    def to_dict(self):
+        """
+        :return: (dict) the record as plain, nested dictionaries
+        """
+        return {
+            'item': self._item,
+            'numeric_id': self.numeric_id,
+            'dependencies': [dict(dependency) for dependency in self.dependencies],
+            'data': self.data
+        }
+
+
+class AvailableObjects(Mapping):
+    """
+    The AvailableObjects class is a read-only mapping of the items of a DependencyWrangler that are not being
+    bypassed, in the order they were processed. The record of each item is only created once it is first accessed,
+    so that looking up a single item doesn't depend on the size of the tree
+    """
+
+    def __init__(self, dependency_tree, numeric_identifiers, stats=None):
+        """
+        Initialize the AvailableObjects class with the tree, and the numeric IDs of the items that are not being
+        bypassed, which the wrangler doesn't change whilst the mapping is alive. The wrangler freezes the records of
+        the items that are about to change instead, see *_freeze*
+        :param dependency_tree: (dict) the DependencyItem objects of the tree, keyed by their unique identifier
+        :param numeric_identifiers: (dict) the numeric ID of each available object, keyed by its unique identifier
+        :param stats: (AnalysisStats) the stats to record the formatting of the records in, or None
+        """
+        super(AvailableObjects, self).__init__()
+
+        self._dependency_tree = dependency_tree
+        self._numeric_identifiers = numeric_identifiers
+        self._stats = stats
+        # Records keep the mapping alive, so they are only cached whilst they are held, except for the frozen records,
+        # which no longer refer to the mapping
+        self._records = weakref.WeakValueDictionary()
+        self._frozen = dict()
+
+    def __getitem__(self, item_identifier):
+        record = self._frozen.get(item_identifier)
+        if record is None:
+            record = self._records.get(item_identifier)
+        if record is None:
+            if item_identifier not in self._numeric_identifiers:
+                raise KeyError(item_identifier)
+            record = AvailableRecord(self._dependency_tree[item_identifier], self)
+            self._records[item_identifier] = record
+        return record
+
+    def _freeze(self, item_identifiers):
+        """
+        Creates & formats the records of the items that are about to change, so that the mapping keeps describing the
+        tree as it was, see *AvailableRecord._freeze*
+        :param item_identifiers: (iterable) unique identifiers of the items that are about to change
+        """
+        start = _clock()
+        formatted = 0
+        for item_identifier in item_identifiers:
+            if item_identifier in self._frozen or item_identifier not in self._numeric_identifiers:
+                continue
+            record = self[item_identifier]
+            formatted += record._freeze()
+            self._frozen[item_identifier] = record
+        if formatted and self._stats is not None:
+            self._stats.record(AVAILABLE_RECORDS, formatted, _clock() - start)
+
+    def __contains__(self, item_identifier):
+        return item_identifier in self._numeric_identifiers
+
+    def __iter__(self):
+        return iter(self._numeric_identifiers)
+
+    def __len__(self):
+        return len(self._numeric_identifiers)
+
+    def __repr__(self):
+        return '{0}({1!r})'.format(type(self).__name__, list(self))
+
+    def to_dict(self):
+        """
+        Formats the records of all items as plain, nested dictionaries, as *available_objects* used to return them
+        :return: (dict) the records of all items, keyed by their unique identifier
+        """
+        start = _clock()
+        formatted = 0
+        plain = dict()
+        for key in self:
+            record = self[key]
+            if record._dependencies is None:
+                record._format(False)
+                formatted += 1
+            plain[key] = record.to_dict()
+        if formatted and self._stats is not None:
+            self._stats.record(AVAILABLE_RECORDS, formatted, _clock() - start)
+        return plain
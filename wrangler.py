@@ -1,4 +1,24 @@
+import gc
+import weakref
+
+from cache import CallbackCache
+from classifier import TypeClassifier
+from compact import CompactDependencyGraph
+from diff import diff_graphs
+from instrumentation import AVAILABLE_OBJECTS, COLLAPSE, DUPLICATE, VISIT, AnalysisStats, _clock
 from item import DependencyItem
+from query import DependencyIndex
+from scheduling import iterate_items, schedule_items
+from view import AnalysisView, AvailableObjects
+
+# Marks the end of a dependency iterator during the traversal
+_EXHAUSTED = object()
+# The directions in which the connections of each object are walked for each direction of analysis
+_DIRECTIONS = {
+    'upstream': ('upstream',),
+    'downstream': ('downstream',),
+    'both': ('upstream', 'downstream')
+}
 
 class DependencyWrangler(object):
     """
@@ -34,6 +54,44 @@ class DependencyWrangler(object):
     def object_type_callback(self):
         return self._object_type_callback
 
+    @property
+    def object_upstream_batch_callback(self):
+        return self._object_upstream_batch_callback
+
+    @property
+    def object_downstream_batch_callback(self):
+        return self._object_downstream_batch_callback
+
+    @property
+    def object_identifier_batch_callback(self):
+        return self._object_identifier_batch_callback
+
+    @property
+    def object_type_batch_callback(self):
+        return self._object_type_batch_callback
+
+    @property
+    def classifier(self):
+        return self._classifier
+
+    @property
+    def callback_caches(self):
+        """
+        Lists the caches wrapped around the callbacks, when caching of the callbacks has been enabled
+        :return: (dict) the CallbackCache objects, keyed by the name of the callback they wrap: *identifier*, *type*,
+        *upstream* or *downstream*
+        """
+        return self._callback_caches
+
+    @property
+    def stats(self):
+        """
+        Returns the calls to the callbacks and the work done whilst analysing the tree, when the instrumentation has
+        been enabled
+        :return: (AnalysisStats) the recorded counts & durations, or None if the instrumentation is disabled
+        """
+        return self._stats
+
     @property
     def analysed_objects(self):
         """
@@ -48,32 +106,105 @@ class DependencyWrangler(object):
         """
         Returns all items that have been processed by this instance of the DependencyWranger class that are not being
         bypassed
-        :return: (dict) information about each processed item, including dependencies, unique identifiers and
-        formatted dependencies
-        """
-        # Create IDs for each item within the DependencyTree, by using the list of keys, and associating their index
-        # as their numeric ID
-        object_id_list = [key for key,value in self._dependency_tree.items() if not value.bypass]
-        return {
-            # Set the key to the unique identifier of the object within the iteration
-            key: {
-                # Set the item key/value pair to the DependencyItem object
-                'item': value,
-                # Extract the numeric id for this item
-                'numeric_id': object_id_list.index(key),
-                # Convert dependency objects within the DependencyItem object to the unique identifier
-                'dependencies': [
-                    {'id': item.id, 'numeric_id': object_id_list.index(item.id)}
-                    for item in value.upstream_dependencies
-                ],
-                # Extract additional information from the DependencyItem object itself
-                'data': value.to_dict()
-            }
-            # Loop through all items within the dependency tree
-            for key,value in self._dependency_tree.items()
-            # Only add to the dictionary if the item in the iteration is not being bypassed
-            if not value.bypass
-        }
+        :return: (AvailableObjects) a read-only mapping of information about each processed item, including
+        dependencies, unique identifiers and formatted dependencies. The information about each item is only
+        formatted once it is accessed. The same mapping is returned until the dependency tree changes. A mapping that
+        is still held, or whose records are still held, keeps describing the tree as it was, as the records of the
+        items are formatted before the items change
+        """
+        # The result is only rebuilt when the dependency tree has changed since it was last built
+        if self._available_objects is None:
+            start = _clock()
+            # Items have been removed since the numeric IDs were last assigned
+            if self._renumber:
+                self._index_numeric_identifiers()
+            self._available_objects = AvailableObjects(self._dependency_tree, self._numeric_identifiers, self._stats)
+            if self._stats is not None:
+                self._stats.record(AVAILABLE_OBJECTS, 1, _clock() - start)
+        return self._available_objects
+
+    def _release_available_objects(self, item_identifiers=()):
+        """
+        Forgets the available objects before the tree changes. The mappings that have been handed out are only
+        tracked whilst they are held, in which case the records of the items that are about to change are formatted
+        first, so that the mappings keep describing the tree as it was
+        :param item_identifiers: (iterable) unique identifiers of the items that are about to change
+        """
+        if self._available_objects is not None:
+            # The mapping is dropped straight away if it isn't held anywhere else
+            self._handed_out.append(weakref.ref(self._available_objects))
+            self._available_objects = None
+        if self._handed_out and item_identifiers:
+            item_identifiers = list(item_identifiers)
+            for available_objects in self._held_available_objects():
+                available_objects._freeze(item_identifiers)
+
+    def _held_available_objects(self):
+        """
+        Lists the mappings handed out by *available_objects* before the tree last changed that are still held, and
+        forgets the mappings that are no longer held
+        :return: (list) the AvailableObjects objects that are still held
+        """
+        held = [x() for x in self._handed_out]
+        self._handed_out = [x for x, y in zip(self._handed_out, held) if y is not None]
+        return [x for x in held if x is not None]
+
+    def _own_numeric_identifiers(self):
+        """
+        Copies the numeric IDs before they change, when they are shared with a mapping that is still held, as the
+        mappings that have been handed out keep referring to them
+        """
+        numeric_identifiers = self._numeric_identifiers
+        if self._handed_out and \
+                any(x._numeric_identifiers is numeric_identifiers for x in self._held_available_objects()):
+            self._numeric_identifiers = dict(numeric_identifiers)
+
+    @property
+    def query_index(self):
+        """
+        Returns the index answering reachability questions about the analysed tree, which is only built once it is
+        first needed, and built again once the dependency tree has changed
+        :return: (DependencyIndex) the index of the tree
+        """
+        if self._query_index is None:
+            self._query_index = DependencyIndex(self._dependency_tree.values())
+        return self._query_index
+
+    def depends_on(self, item_identifier, dependency_identifier):
+        """
+        Determines whether an item depends on another item, directly or through other items. Bypassed items are
+        collapsed, so items never depend on them
+        :param item_identifier: (object) the unique identifier of the item
+        :param dependency_identifier: (object) the unique identifier of the possible dependency
+        :return: (bool) True if the item depends on the other item
+        """
+        return self.query_index.depends_on(item_identifier, dependency_identifier)
+
+    def ancestors(self, item_identifier):
+        """
+        Lists all items an item depends on, directly or through other items
+        :param item_identifier: (object) the unique identifier of the item
+        :return: (frozenset) the unique identifiers of the upstream items
+        """
+        return self.query_index.ancestors(item_identifier)
+
+    def descendants(self, item_identifier):
+        """
+        Lists all items that depend on an item, directly or through other items
+        :param item_identifier: (object) the unique identifier of the item
+        :return: (frozenset) the unique identifiers of the downstream items
+        """
+        return self.query_index.descendants(item_identifier)
+
+    def shortest_path(self, item_identifier, dependency_identifier):
+        """
+        Finds the shortest chain of upstream dependencies leading from an item to another item
+        :param item_identifier: (object) the unique identifier of the item
+        :param dependency_identifier: (object) the unique identifier of the dependency to find the chain to
+        :return: (list) the unique identifiers of the items along the chain, or None if the item doesn't depend on
+        the dependency
+        """
+        return self.query_index.shortest_path(item_identifier, dependency_identifier)
 
     @property
     def items(self):
@@ -93,6 +224,15 @@ class DependencyWrangler(object):
                  object_identifier_attribute=None,
                  bypass_types=None,
                  required_types=None,
+                 cache_callbacks=False,
+                 cache_size=None,
+                 object_upstream_batch_callback=None,
+                 object_downstream_batch_callback=None,
+                 object_identifier_batch_callback=None,
+                 object_type_batch_callback=None,
+                 max_workers=None,
+                 instrument=False,
+                 instrumentation_hooks=None,
                  *args, **kwargs):
         """
         Initialize the DependencyWrangler class with the required attributes.
@@ -112,7 +252,28 @@ class DependencyWrangler(object):
         dependencies
         :param object_identifier_attribute: (object) The attribute on all objects that contains the unique id
         :param object_type_attribute: (object) The attribute on all objects that contains the type
-        :param bypass_types: (list/str) List of strings defining types of objects to bypass when analysing the tree
+        :param bypass_types: (list/str) List of strings defining types of objects to bypass when analysing the tree.
+        Types may also be given as glob patterns, such as "Merge*", or as compiled regular expressions
+        :param required_types: (list/str) List of strings defining the only types of objects to keep when analysing the
+        tree, with the same patterns as *bypass_types*
+        :param cache_callbacks: (bool) Remember the values returned by the callbacks for each object, so that each
+        object is only queried once
+        :param cache_size: (int) The maximum amount of objects to remember the values of for each callback, or None
+        for no limit
+        :param object_upstream_batch_callback: (callable) A function to call on a list of objects to retrieve a list of
+        upstream dependencies for each object
+        :param object_downstream_batch_callback: (callable) A function to call on a list of objects to retrieve a list
+        of downstream dependencies for each object
+        :param object_identifier_batch_callback: (callable) A function to call on a list of objects to retrieve the
+        unique id of each object
+        :param object_type_batch_callback: (callable) A function to call on a list of objects to retrieve the type of
+        each object
+        :param max_workers: (int) The amount of threads to query the objects within each level of the tree with, when
+        the tree should be analysed in parallel
+        :param instrument: (bool) Record the calls to the callbacks and the work done whilst analysing the tree, which
+        are available through *stats*
+        :param instrumentation_hooks: (list) Functions to call with the name, count & duration of every recorded event,
+        see *AnalysisStats*. Specifying any hooks enables the instrumentation
         :param args: (tuple) additional arguments to pass to the *object* initialization function
         :param kwargs: (dict) additional key/value pairs to pass to the *object* initialization function
         """
@@ -126,12 +287,67 @@ class DependencyWrangler(object):
         self._object_identifier_callback = object_identifier_callback
         self._object_type_callback = object_type_callback
 
+        # When any of the batch callbacks has been specified, the tree is analysed a level at a time, so that each level
+        # of the tree is queried through a single call to each callback. The same applies when the tree is analysed in
+        # parallel, where the objects within each level are queried by a pool of threads
+        self._object_upstream_batch_callback = object_upstream_batch_callback
+        self._object_downstream_batch_callback = object_downstream_batch_callback
+        self._object_identifier_batch_callback = object_identifier_batch_callback
+        self._object_type_batch_callback = object_type_batch_callback
+        if max_workers is not None and max_workers < 1:
+            raise ValueError("The amount of workers has to be at least 1.")
+        self._max_workers = max_workers
+        self._executor = None
+        self._by_level = bool(
+            object_upstream_batch_callback or object_downstream_batch_callback or
+            object_identifier_batch_callback or object_type_batch_callback or max_workers
+        )
+
+        self._stats = AnalysisStats(instrumentation_hooks) if instrument or instrumentation_hooks else None
+        self._callback_caches = dict()
+        # The functions that are called in place of each callback, which time and/or cache the callback when the
+        # instrumentation and/or caching of the callbacks has been enabled. Only the values of single objects are cached
+        self._callbacks = dict()
+        for name, callback in (('identifier', object_identifier_callback),
+                               ('type', object_type_callback),
+                               ('upstream', object_upstream_callback),
+                               ('downstream', object_downstream_callback),
+                               ('identifier_batch', object_identifier_batch_callback),
+                               ('type_batch', object_type_batch_callback),
+                               ('upstream_batch', object_upstream_batch_callback),
+                               ('downstream_batch', object_downstream_batch_callback)):
+            if callback and self._stats is not None:
+                callback = self._stats.timed(name, callback)
+            if callback and cache_callbacks and not name.endswith('_batch'):
+                # The connections may be returned as iterators, which could only be iterated over once when cached as-is
+                callback = self._callback_caches[name] = CallbackCache(
+                    callback, cache_size, list if name in _DIRECTIONS['both'] else None
+                )
+            self._callbacks[name] = callback
+
         self._dependency_tree = dict()
+        # The unique identifiers of the objects each item is connected to, as returned by the callbacks, so that items
+        # can be re-linked without calling back into the objects themselves
+        self._upstream_identifiers = dict()
+        self._downstream_identifiers = dict()
+        self._stale_identifiers = set()
+        # The directions in which the connections of each item haven't been queried yet, for items at the bounds of a
+        # bounded analysis
+        self._partial_identifiers = dict()
+        # Numeric IDs are handed out to items that are not being bypassed, in the order they are processed. The next ID
+        # to hand out only ever grows until the IDs are re-assigned, so that they stay unique whilst items are removed
+        self._numeric_identifiers = dict()
+        self._next_numeric_identifier = 0
+        self._renumber = False
+        self._available_objects = None
+        # Weak references to the mappings handed out by available_objects before the tree last changed
+        self._handed_out = list()
+        self._query_index = None
 
-        if bypass_types and required_types:
-            raise Exception("Both bypass_types and required_types arguments have been specified.")
-        self._bypass_types = bypass_types or list()
-        self._required_types = required_types or list()
+        # The bypass & required types are compiled once, so that classifying each item is a single lookup
+        self._classifier = TypeClassifier(bypass_types, required_types)
+        self._bypass_types = self._classifier.bypass_types
+        self._required_types = self._classifier.required_types
 
     def validate(self):
         """
@@ -146,28 +362,84 @@ class DependencyWrangler(object):
                 "A metaclass hasn't been specified"
             )
 
-        if not self.object_downstream_callback:
+        if not (self.object_downstream_callback or self.object_downstream_batch_callback):
             raise AttributeError(
                 "A callback for obtaining downstream dependencies has not been specified."
             )
 
-        if not self.object_upstream_callback:
+        if not (self.object_upstream_callback or self.object_upstream_batch_callback):
             raise AttributeError(
                 "A callback for obtaining upstream dependencies has not been specified"
             )
 
-        if not self.object_identifier_attribute:
+        if not (self.object_identifier_attribute or self.object_identifier_callback or
+                self.object_identifier_batch_callback):
             raise AttributeError(
                 "The attribute name pointing to the unique identifier has not been specified"
             )
 
-        if not self.object_type_attribute:
+        if not (self.object_type_attribute or self.object_type_callback or self.object_type_batch_callback):
             raise AttributeError(
                 "The attribute name pointing to the type has not been specified"
             )
 
         return True
 
+    @classmethod
+    def from_edges(cls, types, edges, bypass_types=None, required_types=None, **kwargs):
+        """
+        Creates a DependencyWrangler holding a tree that has been exported as plain data, such as JSON or CSV edge
+        lists, without wrapping the records into objects and calling back into each of them. All items are defined at
+        once in the order of *types*, with the unique identifier of each item acting as its object. Each type is only
+        classified once, and only the items connected to bypassed items have their dependencies collapsed, whilst the
+        dependencies of all other items are taken from their connections as they are.
+        The callbacks of the wrangler read the connections of the items from the tree itself, so that the items can be
+        invalidated & reanalysed afterwards, picking up changes to the types
+        :param types: (dict) the type of each item, keyed by its unique identifier, in the order the items should be
+        processed in
+        :param edges: (iterable) pairs of the unique identifier of an item and the unique identifier of one of its
+        upstream dependencies, or a NumPy integer array of shape (n, 2) holding the indices of both items within
+        *types* instead, which are grouped by item through NumPy
+        :param bypass_types: (list/str) the types, or patterns of types, to bypass
+        :param required_types: (list/str) the types, or patterns of types, that are required
+        :param kwargs: (dict) additional arguments to initialize the wrangler with, such as *instrument*
+        :return: (DependencyWrangler) the wrangler holding the tree
+        """
+        wrangler = cls(
+            object_class=object,
+            object_upstream_callback=lambda item: wrangler._upstream_identifiers.get(item, ()),
+            object_downstream_callback=lambda item: wrangler._downstream_identifiers.get(item, ()),
+            object_identifier_callback=lambda item: item,
+            object_type_callback=types.get,
+            bypass_types=bypass_types,
+            required_types=required_types,
+            **kwargs
+        )
+        # Millions of lists & items are created at once, none of which can be garbage yet, so the garbage collector
+        # would repeatedly walk all of them for nothing
+        collecting = gc.isenabled()
+        gc.disable()
+        try:
+            item_identifiers = list(types)
+            if hasattr(edges, 'dtype') and edges.dtype.kind in 'iu':
+                upstream, downstream = _group_edge_array(edges, item_identifiers)
+            else:
+                upstream, downstream = _group_edges(edges, item_identifiers)
+            wrangler._define_plain(types, item_identifiers, upstream, downstream)
+        finally:
+            if collecting:
+                gc.enable()
+        return wrangler
+
+    def _is_bypassed(self, item_type):
+        """
+        Determines whether objects of the given type are bypassed, either because the type matches the bypass
+        types, or because it doesn't match the required types
+        :param item_type: (object) the type of the object
+        :return: (bool) True if objects of this type are bypassed
+        """
+        return self._classifier(item_type)
+
     def _define_item(self, item_identifier, item_type, item):
         """
         Creates a DependencyItem object which contains both the upstream and downstream dependencies
@@ -177,54 +449,932 @@ class DependencyWrangler(object):
         :param item: (object) the actual object that the DependencyItem object will represent
         :return: (DependencyObject) the internal object representing the actual object
         """
-        item_bypassed = \
-            (item_type in self._bypass_types) or \
-            (self._required_types and item_type not in self._required_types)
+        item_bypassed = self._is_bypassed(item_type)
         processed_item = DependencyItem(item_identifier, item_type, item, item_bypassed)
         self._dependency_tree[item_identifier] = processed_item
+        self._upstream_identifiers[item_identifier] = list()
+        self._downstream_identifiers[item_identifier] = list()
+        self._release_available_objects()
+        if not item_bypassed:
+            self._own_numeric_identifiers()
+            self._numeric_identifiers[item_identifier] = self._next_numeric_identifier
+            self._next_numeric_identifier += 1
         return processed_item
 
-    def analyse(self, item):
+    def _remove_item(self, item_identifier):
         """
-        Analyse & constructs the dependency tree from a specified object. This function will use the callbacks defined
-        this class to obtain the upstream and downstream dependencies against the actual object itself.
-        :param item: (object) the object to analyse the tree from
-        :return: (DependencyItem) returns a DependencyItem object that represents the item specified
+        Removes a DependencyItem object, and the unique identifiers of its connections, from the internal list of
+        processed objects. The item is unlinked from the items that depend on it straight away, so that they no longer
+        refer to it before they are re-linked
+        :param item_identifier: (object) unique name of the object to remove
+        :return: (list) unique identifiers of the objects that were connected to the removed object
+        """
+        processed_item = self._dependency_tree[item_identifier]
+        dependencies = processed_item.upstream_dependencies + processed_item.downstream_dependencies
+        self._release_available_objects([item_identifier] + [x.id for x in dependencies])
+        for dependency_item in dependencies:
+            dependency_item.remove_dependency(processed_item)
+        del self._dependency_tree[item_identifier]
+        self.clear_callback_caches([processed_item.object])
+        neighbours = self._upstream_identifiers.pop(item_identifier) + \
+            self._downstream_identifiers.pop(item_identifier)
+        if not processed_item.bypass:
+            self._own_numeric_identifiers()
+            del self._numeric_identifiers[item_identifier]
+            self._renumber = True
+        self._stale_identifiers.discard(item_identifier)
+        self._partial_identifiers.pop(item_identifier, None)
+        self._query_index = None
+        return neighbours
+
+    def _index_numeric_identifiers(self):
+        """
+        Re-assigns the numeric IDs of all items that are not being bypassed, in the order they were processed
+        """
+        self._numeric_identifiers = dict()
+        for key, value in self._dependency_tree.items():
+            if not value.bypass:
+                self._numeric_identifiers[key] = len(self._numeric_identifiers)
+        self._next_numeric_identifier = len(self._numeric_identifiers)
+        self._renumber = False
+
+    def _identify(self, item):
+        """
+        Extracts the unique identifier & type from the specified item, using the callbacks if they have been
+        specified, or the attributes otherwise
+        :param item: (object) the actual object to identify
+        :return: (tuple) the unique identifier and the type of the object
         """
-        # Run validation to ensure that this instance of the DependencyWrangler is populated correctly
-        self.validate()
-        # Extract the unique identifier & type from the specified item
         if self.object_identifier_callback:
-            item_identifier = self.object_identifier_callback(item)
+            item_identifier = self._callbacks['identifier'](item)
+        elif self.object_identifier_batch_callback:
+            item_identifier = self._callbacks['identifier_batch']([item])[0]
         else:
             item_identifier = getattr(item, self.object_identifier_attribute)
         if self.object_type_callback:
-            item_type = self.object_type_callback(item)
+            item_type = self._callbacks['type'](item)
+        elif self.object_type_batch_callback:
+            item_type = self._callbacks['type_batch']([item])[0]
         else:
             item_type = getattr(item, self.object_type_attribute)
-        # Only process this object if it hasn't been processed already. This would be the case when working upwards
-        # through a tree, and making our way back down to catch any lingering dependencies in a more complex dependency
-        # tree
-        if item_identifier not in self.analysed_objects:
-            # Create an internal item that represents the real item that is currently within the iteration
-            processed_item = self._define_item(item_identifier, item_type, item)
-            # Loop through upstream dependencies and re-call this analyse function
-            for dependency in self.object_upstream_callback(item):
-                dependency_item = self.analyse(dependency)
-                if dependency_item.type in self._bypass_types \
-                    or (self._required_types and dependency_item.type in self._required_types):
-                      for sub_dependency in dependency_item.upstream_dependencies:
-                        processed_item.append_upstream_dependency(sub_dependency)
-                elif not self._required_types or dependency_item.type in self._required_types:
-                    processed_item.append_upstream_dependency(dependency_item)
-            # Loop through downstream dependencies and re-call this analyse function
-            for dependency in self.object_downstream_callback(item):
-                dependency_item = self.analyse(dependency)
-                if dependency_item.type in self._bypass_types \
-                        or (self._required_types and dependency_item.type in self._required_types):
-                          for sub_dependency in dependency_item.upstream_dependencies:
-                              processed_item.append_downstream_dependency(sub_dependency)
-                elif not self._required_types or dependency_item.type in self._required_types:
-                    processed_item.append_downstream_dependency(dependency_item)
+        return item_identifier, item_type
+
+    def _identify_batch(self, items):
+        """
+        Extracts the unique identifiers & types from a list of items, using the batch callbacks if they have been
+        specified, or identifying the items one at a time, or in parallel, otherwise
+        :param items: (list) the actual objects to identify
+        :return: (tuple) the list of unique identifiers and the list of types of the objects
+        """
+        if not items:
+            return list(), list()
+        identified = None
+        if self.object_identifier_batch_callback:
+            item_identifiers = list(self._callbacks['identifier_batch'](items))
+        else:
+            identified = self._map(self._identify, items)
+            item_identifiers = [item_identifier for item_identifier, _ in identified]
+        if self.object_type_batch_callback:
+            item_types = list(self._callbacks['type_batch'](items))
+        else:
+            identified = identified or self._map(self._identify, items)
+            item_types = [item_type for _, item_type in identified]
+        return item_identifiers, item_types
+
+    def _query_upstream(self, item):
+        """
+        Obtains the upstream dependencies of an object through the upstream callback, or its cache
+        :param item: (object) the actual object to query
+        :return: (list) the objects upstream of the object
+        """
+        if not self.object_upstream_callback:
+            return self._callbacks['upstream_batch']([item])[0]
+        return self._callbacks['upstream'](item)
+
+    def _query_downstream(self, item):
+        """
+        Obtains the downstream dependencies of an object through the downstream callback, or its cache
+        :param item: (object) the actual object to query
+        :return: (list) the objects downstream of the object
+        """
+        if not self.object_downstream_callback:
+            return self._callbacks['downstream_batch']([item])[0]
+        return self._callbacks['downstream'](item)
+
+    def _map(self, callback, items):
+        """
+        Calls the callback on each of the objects, using the pool of threads of the current analysis if there is one
+        :param callback: (callable) the function to call on each object
+        :param items: (list) the actual objects to call the function on
+        :return: (list) the values returned by the function, in the same order as the objects
+        """
+        if self._executor is None or len(items) < 2:
+            return [callback(item) for item in items]
+        return list(self._executor.map(callback, items))
+
+    def _query_upstream_batch(self, items):
+        """
+        Obtains the upstream dependencies of a list of objects through the upstream batch callback if it has been
+        specified, or by querying the objects one at a time, or in parallel, otherwise
+        :param items: (list) the actual objects to query
+        :return: (list) a list of the objects upstream of each object
+        """
+        if self.object_upstream_batch_callback:
+            return [list(dependencies) for dependencies in self._callbacks['upstream_batch'](items)]
+        return self._map(lambda item: list(self._query_upstream(item)), items)
+
+    def _query_downstream_batch(self, items):
+        """
+        Obtains the downstream dependencies of a list of objects through the downstream batch callback if it has been
+        specified, or by querying the objects one at a time, or in parallel, otherwise
+        :param items: (list) the actual objects to query
+        :return: (list) a list of the objects downstream of each object
+        """
+        if self.object_downstream_batch_callback:
+            return [list(dependencies) for dependencies in self._callbacks['downstream_batch'](items)]
+        return self._map(lambda item: list(self._query_downstream(item)), items)
+
+    def clear_callback_caches(self, items=None):
+        """
+        Forgets the values returned by the callbacks, so that the objects are queried again
+        :param items: (iterable) the objects to forget the values of, or None to forget the values of all objects and
+        reset the hit & miss counters
+        """
+        for callback_cache in self._callback_caches.values():
+            if items is None:
+                callback_cache.clear()
+            else:
+                for item in items:
+                    callback_cache.discard(item)
+
+    def _collapse(self, item_identifier, upstream, collapsed):
+        """
+        Lists the dependencies of an item in the given direction, without duplicates. Bypassed dependencies are
+        collapsed, so that the item inherits the nearest dependencies of the bypassed item in the same direction that
+        are not being bypassed instead. The collapsed dependencies of each bypassed item are remembered, so that chains
+        of bypassed items are only walked once for all items depending on them
+        :param item_identifier: (object) unique name of the item to list the dependencies for
+        :param upstream: (bool) True to list the upstream dependencies, False to list the downstream dependencies
+        :param collapsed: (dict) the collapsed dependencies of the bypassed items in the given direction, keyed by the
+        unique name of the bypassed item
+        :return: (list) the DependencyItem objects that are not being bypassed
+        """
+        connections = self._upstream_identifiers if upstream else self._downstream_identifiers
+        # Each frame holds the unique name of the item, the connections left to walk, the dependencies found so far,
+        # the unique names of those dependencies and whether the dependencies are complete
+        stack = [[item_identifier, iter(connections[item_identifier]), list(), set(), True]]
+        walking = {item_identifier: 0}
+        collapses = 0
+        while True:
+            frame = stack[-1]
+            dependency_identifier = next(frame[1], _EXHAUSTED)
+            if dependency_identifier is _EXHAUSTED:
+                stack.pop()
+                del walking[frame[0]]
+                if frame[4] and self._dependency_tree[frame[0]].bypass:
+                    collapsed[frame[0]] = frame[2]
+                if not stack:
+                    if collapses and self._stats is not None:
+                        self._stats.record(COLLAPSE, collapses)
+                    return frame[2]
+                inherited = frame[2]
+                frame = stack[-1]
+            else:
+                dependency_item = self._dependency_tree.get(dependency_identifier)
+                if dependency_item is None:
+                    continue
+                if not dependency_item.bypass:
+                    inherited = (dependency_item,)
+                elif dependency_identifier in collapsed:
+                    collapses += 1
+                    inherited = collapsed[dependency_identifier]
+                elif dependency_identifier in walking:
+                    # The bypassed items form a cycle, so the items walked since the start of the cycle miss the
+                    # dependencies of the item that started it, and can't be remembered
+                    for cycle_frame in stack[walking[dependency_identifier] + 1:]:
+                        cycle_frame[4] = False
+                    continue
+                else:
+                    collapses += 1
+                    walking[dependency_identifier] = len(stack)
+                    stack.append([dependency_identifier, iter(connections[dependency_identifier]), list(), set(), True])
+                    continue
+            for dependency_item in inherited:
+                if dependency_item.id not in frame[3]:
+                    frame[3].add(dependency_item.id)
+                    frame[2].append(dependency_item)
+
+    def _close_bypassed(self, affected, bypassed):
+        """
+        Adds the items that are connected to the affected items through bypassed items to the affected items. These
+        items have inherited their dependencies through the bypassed items, so they have to be re-linked as well
+        :param affected: (set) unique identifiers of the items that have to be re-linked, which is updated in place
+        :param bypassed: (set) unique identifiers of bypassed items whose connections have changed
+        """
+        bypassed = list(bypassed)
+        bypassed.extend(
+            item_identifier for item_identifier in affected if self._dependency_tree[item_identifier].bypass
+        )
+        while bypassed:
+            item_identifier = bypassed.pop()
+            for connections in (self._upstream_identifiers, self._downstream_identifiers):
+                for dependency_identifier in connections[item_identifier]:
+                    dependency_item = self._dependency_tree.get(dependency_identifier)
+                    if dependency_item is None or dependency_identifier in affected:
+                        continue
+                    affected.add(dependency_identifier)
+                    if dependency_item.bypass:
+                        bypassed.append(dependency_identifier)
+
+    def _link_items(self, item_identifiers):
+        """
+        (Re)builds the upstream & downstream dependencies of the given items from the connections that were recorded
+        whilst analysing the tree
+        :param item_identifiers: (iterable) unique names of the items to link
+        """
+        item_identifiers = list(item_identifiers)
+        if not item_identifiers:
+            return
+        # The dependencies are about to change, so the reachability of the items has to be indexed again
+        self._query_index = None
+        self._release_available_objects(item_identifiers)
+        upstream_collapsed = dict()
+        downstream_collapsed = dict()
+        for item_identifier in item_identifiers:
+            processed_item = self._dependency_tree[item_identifier]
+            processed_item.clear_dependencies()
+            for dependency_item in self._collapse(item_identifier, True, upstream_collapsed):
+                processed_item.append_upstream_dependency(dependency_item)
+            for dependency_item in self._collapse(item_identifier, False, downstream_collapsed):
+                processed_item.append_downstream_dependency(dependency_item)
+
+    def _enter(self, item, stack, defined):
+        """
+        Visits an object during the traversal. Objects that haven't been processed yet are defined and pushed onto
+        the traversal stack, so that their upstream dependencies are walked next
+        :param item: (object) the object to visit
+        :param stack: (list) the traversal stack of the current analysis
+        :param defined: (list) unique identifiers of the objects defined during the current analysis
+        :return: (object) the unique identifier of the object
+        """
+        item_identifier, item_type = self._identify(item)
+        if item_identifier not in self._dependency_tree:
+            self._define_item(item_identifier, item_type, item)
+            defined.append(item_identifier)
+            # Each frame holds the real object, the dependencies left to walk and the list to record their unique
+            # identifiers in. The unique identifier of the object is kept until its upstream dependencies are walked
+            stack.append([
+                item, iter(self._query_upstream(item)), self._upstream_identifiers[item_identifier],
+                item_identifier
+            ])
+        return item_identifier
+
+    def _pooled(self, function, *args):
+        """
+        Calls the function with a pool of threads available to query the objects with, when the tree should be
+        analysed in parallel
+        :param function: (callable) the function to call
+        :param args: (tuple) the arguments to call the function with
+        :return: (object) the value returned by the function
+        """
+        if not self._max_workers or self._executor is not None:
+            return function(*args)
+        # The concurrent.futures module is only part of the standard library from Python 3.2 onwards
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            self._executor = executor
+            try:
+                return function(*args)
+            finally:
+                self._executor = None
+
+    def _traverse(self, item):
+        """
+        Walks the tree from the specified object, and defines every object that hasn't been processed yet along with
+        the unique identifiers of its connections. The tree is walked depth first, unless batch callbacks have been
+        specified or the tree is analysed in parallel, in which case it is walked a level at a time
+        :param item: (object) the object to walk the tree from
+        :return: (tuple) the unique identifier of the object, and the unique identifiers of all objects that have been
+        defined during the walk
+        """
+        if self._by_level:
+            return self._traverse_levels(item)
+        return self._traverse_depth(item)
+
+    def _traverse_depth(self, item):
+        """
+        Walks the tree depth first from the specified object, using an explicit stack rather than recursion
+        :param item: (object) the object to walk the tree from
+        :return: (tuple) the unique identifier of the object, and the unique identifiers of all objects that have been
+        defined during the walk
+        """
+        stack = list()
+        defined = list()
+        item_identifier = self._enter(item, stack, defined)
+        while stack:
+            frame = stack[-1]
+            dependency = next(frame[1], _EXHAUSTED)
+            if dependency is not _EXHAUSTED:
+                frame[2].append(self._enter(dependency, stack, defined))
+            # Once the upstream dependencies have been walked, move on to the downstream dependencies
+            elif frame[3] is not None:
+                frame[1] = iter(self._query_downstream(frame[0]))
+                frame[2] = self._downstream_identifiers[frame[3]]
+                frame[3] = None
+            else:
+                stack.pop()
+        if self._stats is not None:
+            self._record_visits(defined)
+        return item_identifier, defined
+
+    def _record_visits(self, defined, visited=None):
+        """
+        Records the objects that have been visited whilst walking the tree, and how many of them had been processed
+        already, when the instrumentation has been enabled
+        :param defined: (list) unique identifiers of the objects that have been defined during the walk
+        :param visited: (int) the amount of objects that have been visited, or None to count the object the tree has
+        been walked from and every connection of the objects that have been defined
+        """
+        if visited is None:
+            visited = 1 + sum(
+                len(self._upstream_identifiers[x]) + len(self._downstream_identifiers[x]) for x in defined
+            )
+        self._stats.record(VISIT, visited)
+        self._stats.record(DUPLICATE, visited - len(defined))
+
+    def _traverse_levels(self, item):
+        """
+        Walks the tree breadth first from the specified object, a level at a time, and defines every object that
+        hasn't been processed yet along with the unique identifiers of its connections. Each level of the tree is
+        queried through a single call to each of the batch callbacks, or by the pool of threads of the analysis.
+        Objects are always defined by the calling thread, in the order of the level they are in
+        :param item: (object) the object to walk the tree from
+        :return: (tuple) the unique identifier of the object, and the unique identifiers of all objects that have been
+        defined during the walk
+        """
+        defined = list()
+        items = [item]
+        item_identifiers, item_types = self._identify_batch(items)
+        root_identifier = item_identifiers[0]
+        while items:
+            # Define the objects within this level that haven't been processed yet
+            frontier = list()
+            frontier_identifiers = list()
+            for dependency, item_identifier, item_type in zip(items, item_identifiers, item_types):
+                if item_identifier not in self._dependency_tree:
+                    self._define_item(item_identifier, item_type, dependency)
+                    defined.append(item_identifier)
+                    frontier.append(dependency)
+                    frontier_identifiers.append(item_identifier)
+            if not frontier:
+                break
+            # Query the connections of the whole level at once, and identify them as the next level
+            upstream = self._query_upstream_batch(frontier)
+            downstream = self._query_downstream_batch(frontier)
+            items = [dependency for dependencies in upstream + downstream for dependency in dependencies]
+            item_identifiers, item_types = self._identify_batch(items)
+            offset = 0
+            for connections, level_dependencies in ((self._upstream_identifiers, upstream),
+                                                    (self._downstream_identifiers, downstream)):
+                for item_identifier, dependencies in zip(frontier_identifiers, level_dependencies):
+                    connections[item_identifier].extend(item_identifiers[offset:offset + len(dependencies)])
+                    offset += len(dependencies)
+        if self._stats is not None:
+            self._record_visits(defined)
+        return root_identifier, defined
+
+    def _traverse_bounded(self, item, direction, max_depth, stop_callback, visited=None):
+        """
+        Walks the tree breadth first from the specified object, like *_traverse_levels*, within the given bounds.
+        Objects at the bounds are defined without querying their connections, and the directions that haven't been
+        queried are remembered, so that a later analysis can walk past them. Objects that have been processed already
+        are walked through the connections that were recorded for them, querying only the directions they are missing.
+        Connections that haven't been queried are mirrored from the objects that have been queried, so that the links
+        between the items are the same in both directions
+        :param item: (object) the object to walk the tree from
+        :param direction: (str) the direction to walk the tree in: 'upstream', 'downstream' or 'both'
+        :param max_depth: (int) the maximum amount of connections between the object and the objects that are walked,
+        or None for no limit
+        :param stop_callback: (callable) a function to call on each DependencyItem, other than the one of the object
+        itself, returning True to not walk past the item
+        :param visited: (dict) the depth at which each object has been walked past, shared between the walks of several
+        objects within the same bounds, so that objects are only walked again when they are reached at a lower depth.
+        Objects the walk has stopped at aren't recorded, and the object itself is always walked, as another walk may
+        have stopped at it
+        :return: (tuple) the unique identifier of the object, and the unique identifiers of all items that have to
+        be (re)linked
+        """
+        defined = list()
+        queried = list()
+        visited = dict() if visited is None else visited
+        # The objects this walk has stopped at, which it would stop at again when reaching them a second time
+        stopped = set()
+        depth = 0
+        visits = 0
+        items = [item]
+        item_identifiers, item_types = self._identify_batch(items)
+        root_identifier = item_identifiers[0]
+        while items:
+            visits += len(items)
+            frontier = {'upstream': ([], []), 'downstream': ([], [])}
+            known = list()
+            for dependency, item_identifier, item_type in zip(items, item_identifiers, item_types):
+                if item_identifier in stopped:
+                    continue
+                # Without a maximum depth, the depth at which an object is reached doesn't change how it is walked
+                if depth and item_identifier in visited and (max_depth is None or visited[item_identifier] <= depth):
+                    continue
+                processed_item = self._dependency_tree.get(item_identifier)
+                if processed_item is None:
+                    processed_item = self._define_item(item_identifier, item_type, dependency)
+                    self._partial_identifiers[item_identifier] = set(_DIRECTIONS['both'])
+                    defined.append(item_identifier)
+                if (max_depth is not None and depth >= max_depth) or \
+                        (depth and stop_callback is not None and stop_callback(processed_item)):
+                    stopped.add(item_identifier)
+                    continue
+                visited[item_identifier] = depth
+                partial = self._partial_identifiers.get(item_identifier, ())
+                for item_direction in _DIRECTIONS[direction]:
+                    if item_direction in partial:
+                        frontier[item_direction][0].append(processed_item.object)
+                        frontier[item_direction][1].append(item_identifier)
+                    else:
+                        connections = self._upstream_identifiers if item_direction == 'upstream' else \
+                            self._downstream_identifiers
+                        known.extend(x for x in connections[item_identifier] if x in self._dependency_tree)
+            # Query the missing connections of the whole level at once, and identify them as the next level
+            upstream = self._query_upstream_batch(frontier['upstream'][0]) if frontier['upstream'][0] else []
+            downstream = self._query_downstream_batch(frontier['downstream'][0]) if frontier['downstream'][0] else []
+            items = [dependency for dependencies in upstream + downstream for dependency in dependencies]
+            item_identifiers, item_types = self._identify_batch(items)
+            offset = 0
+            for item_direction, level_dependencies in (('upstream', upstream), ('downstream', downstream)):
+                connections = self._upstream_identifiers if item_direction == 'upstream' else \
+                    self._downstream_identifiers
+                for item_identifier, dependencies in zip(frontier[item_direction][1], level_dependencies):
+                    connections[item_identifier] = item_identifiers[offset:offset + len(dependencies)]
+                    offset += len(dependencies)
+                    partial = self._partial_identifiers[item_identifier]
+                    partial.discard(item_direction)
+                    if not partial:
+                        del self._partial_identifiers[item_identifier]
+                    queried.append((item_identifier, item_direction))
+            # Objects that have been processed already are walked without querying them again
+            items.extend(self._dependency_tree[x].object for x in known)
+            item_identifiers.extend(known)
+            item_types.extend(self._dependency_tree[x].type for x in known)
+            depth += 1
+
+        affected = set(defined)
+        bypassed = set()
+        for item_identifier, item_direction in queried:
+            affected.add(item_identifier)
+            if self._dependency_tree[item_identifier].bypass:
+                bypassed.add(item_identifier)
+        self._mirror_partial(queried, affected, bypassed)
+        self._close_bypassed(affected, bypassed)
+        if self._stats is not None:
+            self._record_visits(defined, visits)
+        return root_identifier, affected
+
+    def _mirror_partial(self, queried, affected, bypassed):
+        """
+        Mirrors the connections that have been queried onto the items at the bounds of a bounded analysis, which
+        haven't queried the opposite direction yet, so that the links between the items are the same in both directions
+        :param queried: (iterable) the unique identifier of each item, and the direction its connections have been
+        queried in
+        :param affected: (set) unique identifiers of the items that have to be (re)linked, which is updated in place
+        :param bypassed: (set) unique identifiers of the bypassed items whose connections have changed, which is updated
+        in place
+        """
+        if not self._partial_identifiers:
+            return
+        for item_identifier, item_direction in queried:
+            opposite, connections, opposite_connections = \
+                ('downstream', self._upstream_identifiers, self._downstream_identifiers) \
+                if item_direction == 'upstream' else \
+                ('upstream', self._downstream_identifiers, self._upstream_identifiers)
+            for dependency_identifier in connections[item_identifier]:
+                if opposite not in self._partial_identifiers.get(dependency_identifier, ()):
+                    continue
+                if item_identifier not in opposite_connections[dependency_identifier]:
+                    opposite_connections[dependency_identifier].append(item_identifier)
+                    affected.add(dependency_identifier)
+                    if self._dependency_tree[dependency_identifier].bypass:
+                        bypassed.add(dependency_identifier)
+
+    def _define_records(self, item_identifier, records):
+        """
+        Defines the objects that have been queried up front, in the same order as they would have been defined when
+        walking the tree through the callbacks, and links them
+        :param item_identifier: (object) unique name of the object the tree has been walked from
+        :param records: (dict) the object, type, upstream and downstream unique identifiers of every object that
+        hasn't been processed yet, keyed by the unique identifier of the object
+        :return: (DependencyItem) the DependencyItem object that represents the object the tree has been walked from
+        """
+        def define(record_identifier):
+            record = records[record_identifier]
+            self._define_item(record_identifier, record[1], record[0])
+            self._upstream_identifiers[record_identifier].extend(record[2])
+            self._downstream_identifiers[record_identifier].extend(record[3])
+            defined.append(record_identifier)
+
+        defined = list()
+        if self._by_level:
+            # The records have been queried a level at a time, so they are already in the right order
+            for record_identifier in records:
+                define(record_identifier)
+        elif item_identifier not in self._dependency_tree:
+            # Replay the depth first walk of *_traverse_depth* over the unique identifiers of the records
+            define(item_identifier)
+            stack = [[iter(records[item_identifier][2]), item_identifier]]
+            while stack:
+                frame = stack[-1]
+                dependency_identifier = next(frame[0], _EXHAUSTED)
+                if dependency_identifier is not _EXHAUSTED:
+                    if dependency_identifier not in self._dependency_tree:
+                        define(dependency_identifier)
+                        stack.append([iter(records[dependency_identifier][2]), dependency_identifier])
+                elif frame[1] is not None:
+                    frame[0] = iter(records[frame[1]][3])
+                    frame[1] = None
+                else:
+                    stack.pop()
+        if self._stats is not None:
+            self._record_visits(defined)
+        # Items at the bounds of an earlier bounded analysis may be connected to the items that have been defined
+        affected = set(defined)
+        bypassed = set()
+        self._mirror_partial(((x, y) for x in defined for y in _DIRECTIONS['both']), affected, bypassed)
+        if len(affected) > len(defined):
+            self._close_bypassed(affected, bypassed)
+            defined.extend(affected.difference(defined))
+        self._link_items(defined)
+        return self.items[item_identifier]
+
+    def _define_analysed(self, records):
+        """
+        Defines items that have been analysed by another wrangler, such as the wrangler of a worker process, along
+        with the unique identifiers of their connections and their linked dependencies, so that they don't have to be
+        linked again. The items are defined in the order of the records
+        :param records: (list) the unique identifier, type, the unique identifiers of the upstream & downstream
+        connections and the unique identifiers of the upstream & downstream dependencies of each item, where the
+        object of each item is its unique identifier
+        """
+        for item_identifier, item_type, upstream, downstream, _, _ in records:
+            self._define_item(item_identifier, item_type, item_identifier)
+            self._upstream_identifiers[item_identifier].extend(upstream)
+            self._downstream_identifiers[item_identifier].extend(downstream)
+        for item_identifier, _, _, _, upstream_dependencies, downstream_dependencies in records:
+            processed_item = self._dependency_tree[item_identifier]
+            for dependency_identifier in upstream_dependencies:
+                processed_item.append_upstream_dependency(self._dependency_tree[dependency_identifier])
+            for dependency_identifier in downstream_dependencies:
+                processed_item.append_downstream_dependency(self._dependency_tree[dependency_identifier])
+        self._query_index = None
+
+    def _define_plain(self, types, item_identifiers, upstream, downstream):
+        """
+        Defines & links all items of a tree given as plain data, see *from_edges*
+        :param types: (dict) the type of each item, keyed by its unique identifier
+        :param item_identifiers: (list) unique identifiers of the items, in the order to define them in
+        :param upstream: (list) unique identifiers of the upstream connections of each item
+        :param downstream: (list) unique identifiers of the downstream connections of each item
+        """
+        # Classify each type once, rather than once for each item
+        verdicts = dict((item_type, self._is_bypassed(item_type)) for item_type in set(types.values()))
+        tree = self._dependency_tree
+        bypassed = set()
+        for item_identifier in item_identifiers:
+            item_type = types[item_identifier]
+            item_bypassed = verdicts[item_type]
+            tree[item_identifier] = DependencyItem(item_identifier, item_type, item_identifier, item_bypassed)
+            if item_bypassed:
+                bypassed.add(item_identifier)
+            else:
+                self._numeric_identifiers[item_identifier] = len(self._numeric_identifiers)
+        self._next_numeric_identifier = len(self._numeric_identifiers)
+        self._upstream_identifiers.update(zip(item_identifiers, upstream))
+        self._downstream_identifiers.update(zip(item_identifiers, downstream))
+        if self._stats is not None:
+            self._record_visits(item_identifiers, len(item_identifiers))
+
+        for is_upstream, connections in ((True, self._upstream_identifiers), (False, self._downstream_identifiers)):
+            collapsed = dict()
+            for item_identifier, item_connections in connections.items():
+                if not item_connections:
+                    continue
+                processed_item = tree[item_identifier]
+                dependencies = processed_item.upstream_dependencies if is_upstream else \
+                    processed_item.downstream_dependencies
+                if bypassed and not bypassed.isdisjoint(item_connections):
+                    dependencies.extend(self._collapse(item_identifier, is_upstream, collapsed))
+                elif len(item_connections) == 1 or len(set(item_connections)) == len(item_connections):
+                    dependencies.extend(map(tree.__getitem__, item_connections))
+                else:
+                    seen = set()
+                    for dependency_identifier in item_connections:
+                        if dependency_identifier not in seen:
+                            seen.add(dependency_identifier)
+                            dependencies.append(tree[dependency_identifier])
+
+    def analyse_async(self, item, concurrency=None):
+        """
+        Analyse & constructs the dependency tree from a specified object, like *analyse*, through callbacks that may
+        be coroutine functions. The callbacks of objects within the same level of the tree are awaited concurrently,
+        whilst the resulting tree is the same as the one *analyse* would have built. Requires Python 3.7+
+        :param item: (object) the object to analyse the tree from
+        :param concurrency: (int) the maximum amount of callbacks to await simultaneously, or None for no limit
+        :return: (coroutine) a coroutine that returns a DependencyItem object that represents the item specified
+        """
+        from asynchronous import analyse_async
+        return analyse_async(self, item, concurrency)
+
+    def analyse(self, item, direction='both', max_depth=None, stop_callback=None):
+        """
+        Analyse & constructs the dependency tree from a specified object. This function will use the callbacks defined
+        this class to obtain the upstream and downstream dependencies against the actual object itself.
+        The tree is walked depth first using an explicit stack rather than recursion, so there is no limit on the
+        depth of the tree that can be analysed. When batch callbacks have been specified, or the tree is analysed in
+        parallel, the tree is walked a level at a time instead, in which case the items are processed, and numbered,
+        in breadth first order regardless of the amount of workers.
+        The analysis can be bounded to only the objects that are needed, such as the upstream dependencies of a single
+        object, in which case the tree is always walked a level at a time. Objects at the bounds are defined, but
+        their connections aren't queried until a later analysis walks past them. Any analysis after a bounded analysis
+        is walked a level at a time as well, until the connections of all objects have been queried.
+        :param item: (object) the object to analyse the tree from
+        :param direction: (str) the direction to walk the tree in from the object: 'upstream', 'downstream' or 'both'
+        :param max_depth: (int) the maximum amount of connections between the object and the objects that are
+        analysed, or None for no limit
+        :param stop_callback: (callable) a function to call on each DependencyItem, other than the one of the object
+        itself, returning True to not walk past the item, for example based on its type or unique identifier. The
+        item itself is still analysed
+        :return: (DependencyItem) returns a DependencyItem object that represents the item specified
+        """
+        # Run validation to ensure that this instance of the DependencyWrangler is populated correctly
+        self.validate()
+        item_identifier, = self._pooled(self._analyse_items, [item], direction, max_depth, stop_callback)
         # Return the item that has been created and or referenced in this iteration
-        return self.items[item_identifier]
\ No newline at end of file
+        return self.items[item_identifier]
+
+    def analyse_many(self, items, direction='both', max_depth=None, stop_callback=None):
+        """
+        Analyse & constructs the dependency tree from each of the specified objects, like *analyse*. The wrangler is
+        only validated once, all objects share the tree of processed objects, so that objects reached from an earlier
+        object aren't walked again, and the items are only linked once all objects have been walked
+        :param items: (iterable) the objects to analyse the tree from
+        :param direction: (str) the direction to walk the tree in from each object, see *analyse*
+        :param max_depth: (int) the maximum amount of connections between each object and the objects that are
+        analysed, see *analyse*
+        :param stop_callback: (callable) a function to call on each DependencyItem, returning True to not walk past
+        the item, see *analyse*
+        :return: (list) an AnalysisView for each object, in the order the objects were given, holding the items that
+        are reachable from the object in the given direction
+        """
+        self.validate()
+        item_identifiers = self._pooled(self._analyse_items, list(items), direction, max_depth, stop_callback)
+        return [AnalysisView(self, item_identifier, direction) for item_identifier in item_identifiers]
+
+    def _analyse_items(self, items, direction, max_depth, stop_callback):
+        """
+        Walks the tree from each of the objects, and links the items that have been defined or changed once all
+        objects have been walked, see *analyse*
+        :return: (list) the unique identifier of each object
+        """
+        if direction not in _DIRECTIONS:
+            raise ValueError("The direction has to be one of: {0}.".format(", ".join(sorted(_DIRECTIONS))))
+        if max_depth is not None and max_depth < 0:
+            raise ValueError("The maximum depth can't be negative.")
+        item_identifiers = list()
+        affected = list()
+        linked = set()
+        visited = dict()
+        for item in items:
+            if direction != 'both' or max_depth is not None or stop_callback is not None or \
+                    self._partial_identifiers:
+                item_identifier, item_affected = self._traverse_bounded(
+                    item, direction, max_depth, stop_callback, visited
+                )
+                item_identifiers.append(item_identifier)
+                # Items may have been affected by several of the objects, but only have to be linked once
+                for affected_identifier in item_affected:
+                    if affected_identifier not in linked:
+                        linked.add(affected_identifier)
+                        affected.append(affected_identifier)
+                continue
+            # Only objects that haven't been processed already are defined. This would be the case when working
+            # upwards through a tree, and making our way back down to catch any lingering dependencies in a more
+            # complex dependency tree
+            item_identifier, defined = self._traverse(item)
+            item_identifiers.append(item_identifier)
+            affected.extend(defined)
+        self._link_items(affected)
+        return item_identifiers
+
+    def schedule(self, weight=None):
+        """
+        Schedules the items that are not being bypassed in topological order, grouping them into waves of items that
+        only depend on items of earlier waves and can therefore be executed concurrently. A DependencyCycleError is
+        raised, listing the items within the cycle, when the items depend on each other
+        :param weight: (callable) a function returning the estimated duration of a DependencyItem, used to calculate
+        the length of the critical path. Each item counts as 1 when no function is given
+        :return: (Schedule) the waves, order & critical path of the items
+        """
+        return schedule_items([value for value in self._dependency_tree.values() if not value.bypass], weight)
+
+    def iterate_available_items(self):
+        """
+        Yields the items that are not being bypassed one at a time in topological order, so that each item is yielded
+        after all of its upstream dependencies. A DependencyCycleError is raised once the remaining items depend on
+        each other. The tree should not be changed whilst iterating
+        :return: (generator) the DependencyItem objects that are not being bypassed
+        """
+        return iterate_items([value for value in self._dependency_tree.values() if not value.bypass])
+
+    def iterate_available_objects(self):
+        """
+        Yields the information about the items that are not being bypassed one at a time in topological order, as
+        listed by *available_objects*. Each record is only formatted once it is requested, rather than formatting the
+        information of all items up front, so that it can be consumed whilst the rest of the tree is being formatted
+        :return: (generator) tuples of the unique identifier and the information about each item
+        """
+        available_objects = self.available_objects
+        for value in self.iterate_available_items():
+            yield value.id, available_objects[value.id]
+
+    def compact(self):
+        """
+        Creates a compact, array backed copy of the analysed tree, which uses far less memory than the DependencyItem
+        objects for large trees. The copy doesn't follow any later changes to the tree
+        :return: (CompactDependencyGraph) the compact representation of the tree
+        """
+        return CompactDependencyGraph.from_wrangler(self)
+
+    def save_snapshot(self, path, source_hash=None):
+        """
+        Saves the analysed tree to a snapshot file, without the actual objects, which can be loaded again through
+        *snapshot.load_snapshot*. The unique identifiers & types of the items have to be JSON serializable. Requires
+        Python 3
+        :param path: (str) the path of the file to save the snapshot to
+        :param source_hash: (object) a value identifying the source of the tree, such as the hash of the scene it was
+        analysed from, so that a stale snapshot can be detected when it is loaded
+        :return: (str) the hexadecimal SHA-256 hash of the content of the snapshot
+        """
+        from snapshot import save_snapshot
+        return save_snapshot(self.compact(), path, source_hash)
+
+    def diff(self, previous):
+        """
+        Compares the analysed tree against a previously analysed tree, such as the tree of the scene before it was
+        republished, in linear time
+        :param previous: (DependencyWrangler/CompactDependencyGraph) the previously analysed tree, which may be a
+        loaded snapshot
+        :return: (GraphDiff) the differences from the previous tree to this tree
+        """
+        return diff_graphs(previous, self)
+
+    def invalidate(self, item_identifiers, removed=False):
+        """
+        Marks processed items as changed, so that the next call to *reanalyse* queries their objects again. Every
+        object whose type or connections have changed should be invalidated. Items of objects that no longer exist
+        should be invalidated as removed, in which case they are dropped & unlinked from the items depending on them
+        straight away, and the items they were connected to are marked as changed instead
+        :param item_identifiers: (iterable) unique names of the changed items
+        :param removed: (bool) True if the objects of the items no longer exist
+        """
+        for item_identifier in item_identifiers:
+            if item_identifier not in self._dependency_tree:
+                continue
+            if removed:
+                self._stale_identifiers.update(self._remove_item(item_identifier))
+            else:
+                self._stale_identifiers.add(item_identifier)
+
+    def reanalyse(self):
+        """
+        Re-analyses the items that have been invalidated. Only the objects of the invalidated items, and of any
+        objects that have been connected to them since, are queried through the callbacks. The dependencies of the
+        invalidated items and of the items connected to them, including those connected through bypassed items, are
+        then rebuilt, whilst the rest of the tree is kept intact
+        :return: (set) unique identifiers of the items that have been rebuilt
+        """
+        self.validate()
+        return self._pooled(self._reanalyse)
+
+    def _reanalyse(self):
+        """
+        Re-analyses the items that have been invalidated, see *reanalyse*
+        :return: (set) unique identifiers of the items that have been rebuilt
+        """
+        stale_identifiers = [
+            item_identifier for item_identifier in self._stale_identifiers
+            if item_identifier in self._dependency_tree
+        ]
+        self._stale_identifiers = set()
+        queried = set()
+        all_defined = set()
+        affected = set()
+        bypassed = set()
+        while stale_identifiers:
+            item_identifier = stale_identifiers.pop()
+            if item_identifier in queried or item_identifier not in self._dependency_tree:
+                continue
+            queried.add(item_identifier)
+            processed_item = self._dependency_tree[item_identifier]
+            if processed_item.bypass:
+                bypassed.add(item_identifier)
+            # Items that were connected to this item before it changed have to be re-linked as well
+            affected.update(self._upstream_identifiers[item_identifier])
+            affected.update(self._downstream_identifiers[item_identifier])
+            defined = list()
+            # The object has changed, so the values remembered for it are no longer valid
+            self.clear_callback_caches([processed_item.object])
+            new_identifier, new_type = self._identify(processed_item.object)
+            if new_identifier != item_identifier:
+                # The object has been renamed, so drop the item & analyse the object as a new one
+                stale_identifiers.extend(self._remove_item(item_identifier))
+                defined.extend(self._traverse(processed_item.object)[1])
+            else:
+                affected.add(item_identifier)
+                new_bypass = self._is_bypassed(new_type)
+                if new_bypass != processed_item.bypass:
+                    self._renumber = True
+                # The type of the item changes in place
+                self._release_available_objects([item_identifier])
+                processed_item.type = new_type
+                processed_item.bypass = new_bypass
+                for connections, callback in (
+                        (self._upstream_identifiers, self._query_upstream),
+                        (self._downstream_identifiers, self._query_downstream)):
+                    item_connections = list()
+                    for dependency in callback(processed_item.object):
+                        dependency_identifier, dependency_defined = self._traverse(dependency)
+                        item_connections.append(dependency_identifier)
+                        defined.extend(dependency_defined)
+                    connections[item_identifier] = item_connections
+                self._partial_identifiers.pop(item_identifier, None)
+            # Objects that existed before may have been connected to the newly defined items, so query them as well
+            all_defined.update(defined)
+            for defined_identifier in defined:
+                affected.add(defined_identifier)
+                stale_identifiers.extend(self._upstream_identifiers[defined_identifier])
+                stale_identifiers.extend(self._downstream_identifiers[defined_identifier])
+            affected.update(self._upstream_identifiers.get(new_identifier, ()))
+            affected.update(self._downstream_identifiers.get(new_identifier, ()))
+        affected.intersection_update(self._dependency_tree)
+        bypassed.intersection_update(self._dependency_tree)
+        # Items at the bounds of an earlier bounded analysis may be connected to the items that have been queried
+        self._mirror_partial(
+            ((x, y) for x in queried.union(all_defined) if x in self._dependency_tree for y in _DIRECTIONS['both']),
+            affected, bypassed
+        )
+        self._close_bypassed(affected, bypassed)
+        if self._renumber:
+            self._index_numeric_identifiers()
+        self._link_items(affected)
+        return affected
+
+
+def _group_edges(edges, item_identifiers):
+    """
+    Groups pairs of unique identifiers by item, in the order of the pairs
+    :param edges: (iterable) pairs of the unique identifier of an item and the unique identifier of its upstream
+    dependency
+    :param item_identifiers: (list) unique identifiers of all items
+    :return: (tuple) unique identifiers of the upstream & downstream connections of each item
+    """
+    indices = dict((item_identifier, index) for index, item_identifier in enumerate(item_identifiers))
+    upstream = [list() for _ in item_identifiers]
+    downstream = [list() for _ in item_identifiers]
+    for item_identifier, dependency_identifier in edges:
+        if item_identifier not in indices or dependency_identifier not in indices:
+            raise ValueError("The edge {0!r} -> {1!r} refers to an unknown item.".format(
+                item_identifier, dependency_identifier
+            ))
+        upstream[indices[item_identifier]].append(dependency_identifier)
+        downstream[indices[dependency_identifier]].append(item_identifier)
+    return upstream, downstream
+
+
+def _group_edge_array(edges, item_identifiers):
+    """
+    Groups an array of edges by item through NumPy, keeping the order of the edges for each item
+    :param edges: (ndarray) the indices of an item and of its upstream dependency for each edge
+    :param item_identifiers: (list) unique identifiers of all items
+    :return: (tuple) unique identifiers of the upstream & downstream connections of each item
+    """
+    import numpy
+    edges = numpy.asarray(edges, dtype=numpy.intp).reshape(-1, 2)
+    count = len(item_identifiers)
+    if len(edges) and (edges.min() < 0 or edges.max() >= count):
+        raise ValueError("The edges refer to items beyond the {0} given items.".format(count))
+
+    def group(items, dependencies):
+        # A stable sort keeps the edges of each item in their original order
+        order = numpy.argsort(items, kind='mergesort')
+        offsets = [0] + numpy.cumsum(numpy.bincount(items, minlength=count)).tolist()
+        connections = [item_identifiers[x] for x in dependencies[order].tolist()]
+        return [connections[offsets[x]:offsets[x + 1]] for x in range(count)]
+
+    return group(edges[:, 0], edges[:, 1]), group(edges[:, 1], edges[:, 0])